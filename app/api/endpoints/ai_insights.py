@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.services.ai_services import (
     analyze_symptoms,
     get_personalized_health_tips,
     detect_health_patterns,
     analyze_symptom_checker,
     generate_health_education,
-    generate_personalized_plan
+    generate_personalized_plan,
+    stream_symptom_analysis,
+    stream_health_tips,
+    stream_health_patterns,
+    stream_health_education
 )
+from app.api.endpoints.sse import sse_response
 from app.api.endpoints.dependencies import get_current_user
 from pydantic import BaseModel
 from typing import List
 from app.schemas.ai_mood_guide import CarePlanResponse
-from app.api.endpoints.dependencies import get_db
+from app.api.endpoints.dependencies import get_db, get_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.health_diary import get_mood_entries_with_time
 from app.services.ai_mood_guide import analyze_mood_patterns
@@ -27,25 +32,39 @@ class SymptomCheckerRequest(BaseModel):
 class HealthEducationRequest(BaseModel):
     topics: List[str]  # List of health topics the user is interested in
 
+# Endpoints below accept ?stream=true to receive the answer as server-sent events
+
 @router.post("/analyze-symptoms")
 async def analyze_symptoms_endpoint(
+    request: Request,
+    stream: bool = False,
     db_user=Depends(get_current_user)
 ):
     """Analyze user symptoms and provide AI-driven insights. Requires authentication."""
+    if stream:
+        return sse_response(request, stream_symptom_analysis(db_user.id))
     return await analyze_symptoms(db_user.id)
 
 @router.get("/health-tips")
 async def get_health_tips_endpoint(
+    request: Request,
+    stream: bool = False,
     db_user=Depends(get_current_user)
 ):
     """Fetch personalized health tips based on the user's health data. Requires authentication."""
+    if stream:
+        return sse_response(request, stream_health_tips(db_user.id))
     return await get_personalized_health_tips(db_user.id)
 
 @router.post("/pattern-recognition")
 async def detect_health_patterns_endpoint(
+    request: Request,
+    stream: bool = False,
     db_user=Depends(get_current_user)
 ):
     """Detect health patterns based on the user's symptom history. Requires authentication."""
+    if stream:
+        return sse_response(request, stream_health_patterns(db_user.id))
     return await detect_health_patterns(db_user.id)
 
 @router.post("/symptom-checker")
@@ -73,9 +92,13 @@ async def symptom_checker_endpoint(
 @router.post("/health-education")
 async def health_education_endpoint(
     request: HealthEducationRequest,
+    http_request: Request,
+    stream: bool = False,
     db_user=Depends(get_current_user)
 ):
     """Provides AI-powered personalized health education based on user-selected topics."""
+    if stream:
+        return sse_response(http_request, stream_health_education(db_user.id, request.topics))
     return await generate_health_education(db_user.id, request.topics)
 
 @router.get("/care-plan/{user_id}", response_model=CarePlanResponse)
@@ -84,7 +107,7 @@ async def get_care_plan(user_id: int, db: AsyncSession = Depends(get_db), curren
     return plan
 
 @router.get("/mood-analytics/{user_id}")
-async def mood_analytics(user_id: int, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)):
+async def mood_analytics(user_id: int, db: AsyncSession = Depends(get_read_db), current_user=Depends(get_current_user)):
     entries = await get_mood_entries_with_time(db, user_id)
     result = await analyze_mood_patterns(entries)
     return result
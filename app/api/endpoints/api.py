@@ -40,6 +40,7 @@ from app.api.endpoints import (
     community_groups,
     family,
     ehr_sync,
+    export,
     Registration_Login
 )
 
@@ -53,6 +54,7 @@ api_router.include_router(payment.router, prefix="/api/v1/payment", tags=["Payme
 api_router.include_router(roles.router, prefix="/api/v1/roles", tags=["Roles"])
 api_router.include_router(user.router, prefix="/api/v1/users", tags=["User Management"])
 api_router.include_router(health_diary.router, prefix="/api/v1/health-diary", tags=["Health Diary"])
+api_router.include_router(export.router, prefix="/api/v1/export", tags=["Export"])
 api_router.include_router(medications.router, prefix="/api/v1/medications", tags=["Medication"])
 api_router.include_router(ai_insights.router, prefix="/api/v1/ai", tags=["AI Insights"])
 api_router.include_router(reports.router, prefix="/api/v1/reports", tags=["Reports"])
@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.services.ai_chatbot import generate_health_advice
+from app.services.ai_chatbot import generate_health_advice, stream_health_advice
 from app.api.endpoints.dependencies import get_db,get_current_user
+from app.api.endpoints.sse import sse_response
 from app.schemas.chatbot import ChatbotRequest, ChatbotResponse
 
 router = APIRouter()
 
 @router.post("/chat", response_model=ChatbotResponse)
-async def chat_with_ai(request: ChatbotRequest, db: AsyncSession = Depends(get_db),db_user=Depends(get_current_user)):
-    """AI Chatbot Endpoint for Health Advice."""
+async def chat_with_ai(request: ChatbotRequest, http_request: Request, stream: bool = False, db: AsyncSession = Depends(get_db),db_user=Depends(get_current_user)):
+    """
+    AI Chatbot Endpoint for Health Advice.
+
+    With ``?stream=true`` the reply is sent as server-sent events
+    (``data: {"delta": ...}`` per chunk, then ``event: done``).
+    """
+    if stream:
+        return sse_response(http_request, await stream_health_advice(request.user_id, request.message, db))
     try:
         ai_response = await generate_health_advice(request.user_id, request.message, db)
         return {"response": ai_response}
@@ -8,7 +8,7 @@ from app.schemas.community import (
     CommunityLikeRequest, CommunityReportRequest
 )
 from app.db.models.community import CommunityPost, CommunityComment, CommunityLike, CommunityReport
-from app.api.endpoints.dependencies import get_db, get_current_user
+from app.api.endpoints.dependencies import get_db, get_read_db, get_current_user
 
 router = APIRouter()
 
@@ -30,7 +30,7 @@ async def create_post(request: CommunityPostRequest, db: Session = Depends(get_d
     return new_post
 
 @router.get("/posts", response_model=List[CommunityPostResponse])
-async def get_all_posts(db: Session = Depends(get_db), db_user=Depends(get_current_user)):
+async def get_all_posts(db: Session = Depends(get_read_db), db_user=Depends(get_current_user)):
     """
     Fetch all community posts.
     """
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.endpoints.dependencies import get_current_user, get_db
-from app.services.dashboard import build_user_dashboard
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.api.endpoints.dependencies import get_current_user
+from app.db.session import get_read_session_factory
+from app.services.dashboard import build_user_dashboard, get_dashboard_version
 from app.services.ai_services import detect_health_patterns
+from app.services.insight_cache import get_dashboard_insight
+import hashlib
+import json
 
 router = APIRouter()
 
 @router.get("/")
 async def get_dashboard_endpoint(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     db_user=Depends(get_current_user)
 ):
     """
@@ -18,10 +23,26 @@ async def get_dashboard_endpoint(
     - Upcoming appointments
     - Notifications
     - Subscription
-    - AI Insights
+    - AI Insights (null while the first analysis is still running)
+
+    The response carries an ETag; clients sending it back in If-None-Match
+    get a 304 when nothing has changed. The ETag comes from a one-query probe
+    of the sections plus the cached insight, so a 304 skips building the body.
     """
-    dashboard_data = await build_user_dashboard(db, db_user.id)
-    return dashboard_data
+    session_factory = await get_read_session_factory()
+    async with session_factory() as db:
+        version = await get_dashboard_version(db, db_user.id)
+    ai_insights = get_dashboard_insight(db_user.id, detect_health_patterns)
+
+    fingerprint = json.dumps(jsonable_encoder([version, ai_insights]), sort_keys=True, separators=(",", ":"))
+    etag = '"' + hashlib.sha256(fingerprint.encode()).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    dashboard_data = await build_user_dashboard(db_user.id, ai_insights, session_factory)
+    return JSONResponse(content=jsonable_encoder(dashboard_data), headers=headers)
 
 
 @router.post("/ai-insights")
@@ -1,52 +1,39 @@
-from fastapi import Depends, HTTPException, Security, status
+from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from jose import JWTError, ExpiredSignatureError
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.services.auth_service import verify_access_token
-from app.db.models.user import User
+from app.crud.user import get_auth_user
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 
 async def get_current_user(
-    token: str = Security(oauth2_scheme), db: AsyncSession = Depends(get_db)
+    request: Request,
+    token: str = Security(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Retrieve the current authenticated user from the database using async SQLAlchemy."""
-    try:
+    """
+    Retrieve the current authenticated user.
+
+    The token is decoded once by the auth middleware and its claims are kept on
+    ``request.state.token_claims``; the user row is served from the auth user cache.
+    """
+    payload = getattr(request.state, "token_claims", None)
+    if payload is None:
+        # Paths excluded from the middleware still decode here
         payload = await verify_access_token(token)
-        user_id = payload.get("user_id")
 
-        if not user_id or not isinstance(user_id, int):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-    except ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except JWTError:
+    user_id = payload.get("user_id")
+    if not user_id or not isinstance(user_id, int):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
+            detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Add selectinload for relationships you need (e.g., practitioner_relationships)
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.practitioner_relationships))  
-        .where(User.id == user_id)
-    )
-    user = result.scalars().first()
+    user = await get_auth_user(db, user_id)
 
     if not user:
         raise HTTPException(
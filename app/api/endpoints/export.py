@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.db.session import get_db, get_read_session_factory
+from app.api.endpoints.dependencies import get_current_user
+from app.services.health_export import export_ndjson, export_csv_zip
+
+router = APIRouter()
+
+EXPORT_FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson", "ndjson"),
+    "zip": (export_csv_zip, "application/zip", "zip"),
+}
+
+
+@router.get("/")
+async def export_health_record(
+    format: str = Query("ndjson", description="ndjson, or zip for a bundle of CSV files"),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Download the authenticated user's full health record: diary entries,
+    medications and logs, appointments, vaccinations, chronic monitoring
+    readings and EHR history. The file is streamed as it is read from the
+    database.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'zip'")
+    export, media_type, extension = EXPORT_FORMATS[format]
+    user_id = current_user.id
+    # The stream opens its own session; don't keep the request's connection for the download
+    await db.close()
+    session_factory = await get_read_session_factory()
+
+    async def body():
+        async with session_factory() as export_db:
+            async for chunk in export(export_db, user_id):
+                yield chunk
+
+    filename = f"health_record_{user_id}_{datetime.utcnow():%Y%m%d}.{extension}"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
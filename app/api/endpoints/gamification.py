@@ -9,7 +9,7 @@ from app.services.gamification_service import (
     process_gamification_rewards,
     get_leaderboard
 )
-from app.api.endpoints.dependencies import get_db, get_current_user
+from app.api.endpoints.dependencies import get_db, get_read_db, get_current_user
 
 router = APIRouter()
 
@@ -36,7 +36,7 @@ async def gamification_rewards(
 
 @router.get("/leaderboard", response_model=list[LeaderboardResponse])
 async def gamification_leaderboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     db_user=Depends(get_current_user)
 ):
     """
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
-from app.schemas.health_diary import HealthDiaryCreate, HealthDiaryResponse,HealthDiaryUpdate
-from app.crud.health_diary import create_health_diary, get_health_diary,update_health_diary
+from app.schemas.health_diary import HealthDiaryCreate, HealthDiaryResponse,HealthDiaryUpdate, HealthDiaryPage, HealthDiaryImportResult
+from app.crud.user import get_user
+from app.services.diary_import import import_health_diary
+from app.crud.health_diary import create_health_diary, get_health_diary_page,update_health_diary
 from app.api.endpoints.dependencies import get_current_user 
 
 router = APIRouter()
@@ -30,28 +33,72 @@ async def add_health_diary_entry(
     new_entry = await create_health_diary(db, entry) 
     return new_entry
 
-@router.get("/{user_id}", response_model=list[HealthDiaryResponse])
+@router.post("/{user_id}/import", response_model=HealthDiaryImportResult)
+async def import_health_diary_entries(
+    user_id: int,
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson or csv; defaults from Content-Type"),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Bulk-import health diary entries from the raw request body.
+
+    This is a **protected endpoint** that requires authentication.
+    Send NDJSON (one JSON object per line) or CSV with a header row
+    (`date,mood,symptoms,notes`; symptoms separated by `;`). The body is
+    processed as it streams in, valid rows are inserted in one transaction,
+    and invalid rows are reported by line number.
+
+    Args:
+        user_id (int): The ID of the user the entries belong to.
+        request (Request): The upload, read as a stream.
+        format (str, optional): `ndjson` or `csv`.
+        db (AsyncSession): Database session dependency.
+        current_user (User): The authenticated user.
+
+    Returns:
+        HealthDiaryImportResult: Counts of imported and rejected rows, with per-row errors.
+    """
+    content_type = request.headers.get("content-type", "")
+    fmt = format or ("csv" if "csv" in content_type else "ndjson")
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    if not await get_user(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return await import_health_diary(db, user_id, request.stream(), fmt)
+
+@router.get("/{user_id}", response_model=HealthDiaryPage)
 async def get_health_diary_entries(
     user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)  
 ):
     """
-    Retrieve all health diary entries for a specific user.
+    Retrieve health diary entries for a specific user, newest first.
 
     This is a **protected endpoint** that requires authentication.
-    Users can fetch all their logged health diary entries.
+    Results are paginated: pass the returned `next_cursor` back as `cursor`
+    to fetch the following page.
 
     Args:
         user_id (int): The ID of the user whose health diary entries should be retrieved.
+        limit (int): Maximum number of entries to return (1-100).
+        cursor (str, optional): Cursor from the previous page.
         db (AsyncSession): Database session dependency.
         current_user (User): The authenticated user.
 
     Returns:
-        list[HealthDiaryResponse]: A list of health diary entries. If no entries exist, an empty list is returned.
+        HealthDiaryPage: The entries on this page and the cursor for the next one (null on the last page).
     """
-    entries = await get_health_diary(db, user_id)
-    return entries if entries else []
+    try:
+        entries, next_cursor = await get_health_diary_page(db, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": entries, "next_cursor": next_cursor}
 
 @router.put("/update-entry/{entry_id}", response_model=HealthDiaryResponse)
 async def update_health_diary_entry(
@@ -1,23 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Optional
 
 from app.db.session import get_db
-from app.schemas.notification import NotificationCreate, NotificationResponse
+from app.schemas.notification import NotificationCreate, NotificationResponse, NotificationPage, NotificationReadRequest
 from app.crud.notification import (
     create_notification,
     get_notifications,
+    get_unread_count,
+    mark_notifications_read,
     delete_notification
 )
-from app.api.endpoints.dependencies import get_current_user  
+from app.api.endpoints.dependencies import get_current_user
+from app.api.endpoints.sse import push_response
+from app.core.config import settings
+from app.services.notification_pubsub import broker
 
 router = APIRouter()
 
 @router.post("/send", response_model=NotificationResponse)
 async def send_notification_endpoint(
-    notification: NotificationCreate, 
+    notification: NotificationCreate,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)  
+    current_user=Depends(get_current_user)
 ):
     """
     Send a notification.
@@ -27,18 +32,73 @@ async def send_notification_endpoint(
     if not new_notification:
         raise HTTPException(status_code=400, detail="Failed to send notification.")
 
-    return new_notification 
+    return new_notification
 
 
-@router.get("/", response_model=List[NotificationResponse])
+@router.get("/", response_model=NotificationPage)
 async def get_notifications_endpoint(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Get the authenticated user's notifications, newest first. Pass the returned
+    ``next_cursor`` to fetch the following page.
+    """
+    notifications, next_cursor = await get_notifications(db, current_user.id, limit=limit, cursor=cursor)
+    return {
+        "items": notifications,
+        "next_cursor": next_cursor,
+        "unread_count": await get_unread_count(db, current_user.id),
+    }
+
+
+@router.get("/stream")
+async def notification_stream(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Server-sent events stream of the authenticated user's new notifications,
+    as ``notification`` events, with periodic keepalive comments. Replaces
+    polling ``GET /notifications/``.
+    """
+    user_id = current_user.id
+    # Don't hold a pooled connection for the lifetime of the stream
+    await db.close()
+
+    async def events():
+        async with broker.subscribe(user_id) as subscription:
+            async for payload in subscription.events(settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS):
+                yield payload
+
+    return push_response(request, events(), event="notification")
+
+
+@router.get("/unread-count")
+async def get_unread_count_endpoint(
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Number of unread notifications for the authenticated user.
+    """
+    return {"unread_count": await get_unread_count(db, current_user.id)}
+
+
+@router.post("/read")
+async def mark_notifications_read_endpoint(
+    request: NotificationReadRequest,
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
     """
-    Get all notifications for the authenticated user.
+    Mark the given notifications, or all of them if no ids are given, as read.
     """
-    return await get_notifications(db, current_user.id)
+    updated = await mark_notifications_read(db, current_user.id, request.notification_ids)
+    return {"updated": updated, "unread_count": await get_unread_count(db, current_user.id)}
 
 
 @router.delete("/{notification_id}")
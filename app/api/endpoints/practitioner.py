@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from sqlalchemy.future import select
+from app.db.session import get_db, get_read_db
 from app.schemas.practitioner import PractitionerCreate, PractitionerResponse, PatientSummary
 from app.schemas.referral_system import ReferralCreate, ReferralResponse, ReferralUpdate
 from app.crud.practitioner import create_practitioner, get_practitioners
@@ -11,6 +12,7 @@ from typing import List
 from app.db.models.user import User
 from app.db.models.health_diary import HealthDiary
 from app.db.models.medication import Medication
+from app.db.models.practitioners import Practitioner
 from app.crud.analytics import get_provider_analytics
 from app.schemas.messaging import MessageCreate, MessageResponse
 from app.crud.messaging import create_message, get_messages_between_users
@@ -30,7 +32,7 @@ async def add_practitioner_endpoint(
 
 @router.get("/list", response_model=List[PractitionerResponse])
 async def list_practitioners(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
     practitioners = await get_practitioners(db)
@@ -75,17 +77,19 @@ async def practitioner_dashboard(
 
 @router.get("/analytics/overview")
 async def practitioner_analytics_overview(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
     if current_user.role != UserRoleEnum.PRACTITIONER:
         raise HTTPException(status_code=403, detail="Only practitioners can access analytics.")
 
-    await db.refresh(current_user, attribute_names=["practitioner_profile"])
-    if not current_user.practitioner_profile:
+    # current_user belongs to the primary session, so look the profile up on the read session
+    result = await db.execute(select(Practitioner.id).where(Practitioner.user_id == current_user.id))
+    practitioner_id = result.scalar()
+    if not practitioner_id:
       raise HTTPException(status_code=404, detail="Practitioner profile not found")
 
-    return await get_provider_analytics(db=db, practitioner_id=current_user.practitioner_profile.id)
+    return await get_provider_analytics(db=db, practitioner_id=practitioner_id)
 
 
 @router.post("/referrals/send", response_model=ReferralResponse)
@@ -1,34 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
-from app.services.report_service import generate_health_report
+from app.crud.report import create_report_job, get_report
+from app.schemas.report import ReportJobResponse
+from app.services.report_service import HEALTH_REPORT, find_cached_report
+from app.core.scheduler import render_report
 from app.api.endpoints.dependencies import get_current_user  
 from fastapi.responses import FileResponse
+import asyncio
+import logging
 import os
 
+logger = logging.getLogger("reports")
+
 router = APIRouter()
 
-@router.post("/generate")
+@router.post("/generate", response_model=ReportJobResponse, status_code=202)
 async def generate_report_endpoint(
+    response: Response,
     db_user=Depends(get_current_user),  
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Generate a PDF health report for the authenticated user.
+    Request a PDF health report for the authenticated user.
 
     - Requires authentication via access token.
-    - Returns the path to the generated report.
+    - If the diary hasn't changed since the last report, that report is
+      returned as `ready` (200).
+    - Otherwise rendering happens in the background (202); poll
+      `GET /reports/{report_id}` until the status is `ready`, then download it.
     """
-    report_path = await generate_health_report(db_user.id)  
+    cached = await find_cached_report(db, db_user.id)
+    if cached:
+        response.status_code = 200
+        return cached
 
-    if not report_path:
-        raise HTTPException(status_code=400, detail="Failed to generate report.")
+    report = await create_report_job(db, db_user.id, HEALTH_REPORT)
+    try:
+        # Publishing to the broker blocks; keep it off the event loop
+        await asyncio.to_thread(render_report.delay, report.id)
+    except Exception as e:
+        logger.error(f"Queueing report {report.id} failed: {e}")
+        report.status = "failed"
+        report.error = "Could not queue rendering"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="Report rendering is unavailable, try again later")
+    return report
 
-    return {"message": "Report generated successfully", "report_path": report_path}
+@router.get("/{report_id}", response_model=ReportJobResponse)
+async def report_status_endpoint(
+    report_id: int,
+    db_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Status of a requested report: `pending`, `running`, `ready` or `failed`.
+    """
+    report = await get_report(db, report_id, user_id=db_user.id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
 
 @router.get("/download/{report_id}")
 async def download_report_endpoint(
-    db_user=Depends(get_current_user)  
+    report_id: int,
+    db_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Download a generated PDF report.
@@ -36,9 +73,10 @@ async def download_report_endpoint(
     - Requires authentication via access token.
     - Returns the requested report as a downloadable file.
     """
-    report_path = f"reports/user_{db_user.id}_health_report.pdf"  
-
-    if not os.path.exists(report_path):
+    report = await get_report(db, report_id, user_id=db_user.id)
+    if not report:
         raise HTTPException(status_code=404, detail="Report not found")
+    if report.status != "ready" or not report.file_path or not os.path.exists(report.file_path):
+        raise HTTPException(status_code=409, detail=f"Report is not ready (status: {report.status})")
 
-    return FileResponse(report_path, filename=f"user_{db_user.id}_health_report.pdf", media_type='application/pdf')
+    return FileResponse(report.file_path, filename=f"health_report_{report.id}.pdf", media_type='application/pdf')
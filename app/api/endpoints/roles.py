@@ -4,6 +4,7 @@ from sqlalchemy.future import select
 from app.api.endpoints.dependencies import get_db, get_current_user
 from app.schemas.roles import RoleUpdateRequest, RoleResponse
 from app.db.models.user import User, UserRoleEnum
+from app.crud.user import invalidate_auth_user
 
 router = APIRouter()
 
@@ -38,5 +39,6 @@ async def update_user_role(
     user_to_update.role = request.new_role
     await db.commit()
     await db.refresh(user_to_update)
+    invalidate_auth_user(user_to_update.id)
     
     return {"user_id": user_to_update.id, "role": user_to_update.role}
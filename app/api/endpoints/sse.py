@@ -0,0 +1,56 @@
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+import json
+import logging
+
+logger = logging.getLogger("sse")
+
+
+async def _event_source(request: Request, chunks: AsyncIterator[str]):
+    """Frame text chunks as server-sent events, stopping early if the client goes away."""
+    try:
+        async for chunk in chunks:
+            if await request.is_disconnected():
+                logger.info(f"Client disconnected from {request.url.path}, cancelling stream")
+                return
+            yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    except Exception as e:
+        logger.error(f"Streaming error on {request.url.path}: {str(e)}")
+        yield f"event: error\ndata: {json.dumps({'detail': 'AI streaming failed.'})}\n\n"
+    finally:
+        # Closes the upstream completion stream as well
+        await chunks.aclose()
+
+
+def sse_response(request: Request, chunks: AsyncIterator[str]) -> StreamingResponse:
+    """Stream an async iterator of text chunks to the client as text/event-stream."""
+    return StreamingResponse(
+        _event_source(request, chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _push_source(request: Request, events: AsyncIterator[Optional[dict]], event: str):
+    """Frame pushed payloads as named events; ``None`` from ``events`` sends a keepalive."""
+    try:
+        async for payload in events:
+            if await request.is_disconnected():
+                return
+            if payload is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        await events.aclose()
+
+
+def push_response(request: Request, events: AsyncIterator[Optional[dict]], event: str) -> StreamingResponse:
+    """Long-lived text/event-stream of server-pushed payloads."""
+    return StreamingResponse(
+        _push_source(request, events, event),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.schemas.wearables import WearableDataRequest, WearableDataResponse
+from app.schemas.wearables import WearableDataRequest, WearableDataResponse, WearableSeriesResponse
 from app.services.wearable_service import (
     process_wearable_data,
     fetch_fitbit_data, fetch_google_fit_data,
     parse_fitbit_to_wearable_schema,
     parse_google_fit_to_wearable_schema
 )
+from app.services.wearable_store import METRICS, get_series, store_wearable_request
 from app.services.auth_service import get_user_oauth_token,save_or_update_oauth_token
 from app.api.endpoints.dependencies import get_db, get_current_user
 from fastapi.responses import RedirectResponse
@@ -15,9 +16,20 @@ import urllib.parse
 from app.core.config import settings
 from datetime import datetime,timedelta
 import base64
+import logging
 
 
 router = APIRouter()
+logger = logging.getLogger("wearables")
+
+
+async def _keep_readings(db: Session, user_id: int, request: WearableDataRequest):
+    """Store the readings for trends; a storage failure is logged and doesn't fail the analysis."""
+    try:
+        await store_wearable_request(db, user_id, request)
+    except Exception:
+        logger.exception(f"Failed to store wearable readings for user {user_id}")
+
 
 @router.post("/data", response_model=WearableDataResponse)
 async def wearable_data(
@@ -26,13 +38,15 @@ async def wearable_data(
     db_user=Depends(get_current_user)
 ):
     """
-    Processes and analyzes user-submitted wearable data directly.
+    Processes and analyzes user-submitted wearable data directly. The readings
+    are also kept for trends (see ``GET /wearables/series``).
     """
     try:
         analysis = await process_wearable_data(request, db)
-        return analysis
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    await _keep_readings(db, db_user.id, request)
+    return analysis
 
 
 @router.get("/google/fetch", response_model=WearableDataResponse)
@@ -51,6 +65,7 @@ async def fetch_google_fit_data_endpoint(
 
         raw_data = await fetch_google_fit_data(token_record.access_token)
         wearable_input = parse_google_fit_to_wearable_schema(raw_data)
+        # Not stored: the parser drops the aggregate buckets' timestamps, so these aren't evenly spaced readings
         return await process_wearable_data(wearable_input, db)
 
     except Exception as e:
@@ -73,12 +88,36 @@ async def fetch_fitbit_data_endpoint(
 
         raw_data = await fetch_fitbit_data(token_record.access_token)
         wearable_input = parse_fitbit_to_wearable_schema(raw_data)
+        # Not stored: the parsed values are heart-rate zone minimums and daily summaries, not timed readings
         return await process_wearable_data(wearable_input, db)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Fitbit fetch failed: {str(e)}")
 
 
+@router.get("/series", response_model=WearableSeriesResponse)
+async def wearable_series(
+    metric: str,
+    start: datetime,
+    end: datetime,
+    resolution: str = Query("auto", description="auto, raw, hour or day"),
+    db: Session = Depends(get_db),
+    db_user=Depends(get_current_user)
+):
+    """
+    Stored readings of one metric between ``start`` and ``end``, as raw points
+    or hourly/daily buckets (count, mean, min, max). ``auto`` uses raw points
+    for up to a day, hourly buckets for up to two weeks, daily beyond that.
+    """
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric; expected one of: {', '.join(METRICS)}")
+    if resolution not in ("auto", "raw", "hour", "day"):
+        raise HTTPException(status_code=400, detail="resolution must be 'auto', 'raw', 'hour' or 'day'")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    return await get_series(db, db_user.id, metric, start, end, resolution)
+
+
 GOOGLE_AUTH_BASE = "https://accounts.google.com/o/oauth2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 
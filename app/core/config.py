@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # General Application Config
@@ -13,13 +14,124 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    DATABASE_URL: Optional[str] = None  # Full URL override, e.g. for local SQLite
+
+    # Connection pool / engine tuning
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
+    DB_ECHO: bool = False
+
+    # Read replica for read-only endpoints (falls back to the primary when unset)
+    READ_REPLICA_DATABASE_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 2.0
 
     # Security Config
     ALGORITHM: str = "HS256"
-    TOKEN_URL: str = "/api/v1/auth/token"  
+    TOKEN_URL: str = "/api/v1/auth/token"
+
+    # Authenticated user cache. It is per worker process: a write invalidates only
+    # the worker that made it, so other workers can serve the old row (role,
+    # is_active, ...) for up to the TTL; keep it short.
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Dashboard AI insight cache: refreshed in the background once older than
+    # the refresh interval, dropped entirely after the max age
+    DASHBOARD_INSIGHT_REFRESH_SECONDS: int = 60 * 60
+    DASHBOARD_INSIGHT_MAX_AGE_SECONDS: int = 60 * 60 * 24
+    DASHBOARD_INSIGHT_CACHE_SIZE: int = 10000
+    DASHBOARD_MAX_SESSIONS: int = 2  # sessions one dashboard request holds at a time
 
     # AI Services
     OPENAI_API_KEY: str
+
+    # AI provider ("openai", or "local" for a deterministic offline stand-in)
+    AI_PROVIDER: str = "openai"
+    AI_MAX_CONNECTIONS: int = 100
+    AI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AI_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    AI_MAX_RETRIES: int = 3
+    AI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    AI_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    AI_DEFAULT_MODEL_CONCURRENCY: int = 32
+    AI_MODEL_CONCURRENCY: Dict[str, int] = {}  # per-model overrides, e.g. {"gpt-4": 8}
+    AI_LOCAL_LATENCY_MS: int = 0
+
+    # Outbound LLM budgets for the whole deployment; batch jobs may use AI_BATCH_BUDGET_SHARE of them.
+    # "redis" shares one budget across workers; "memory" gives each of
+    # AI_RATE_LIMIT_WORKERS processes (API and Celery) an equal share.
+    AI_RPM_LIMIT: int = 500
+    AI_TPM_LIMIT: int = 150000
+    AI_RATE_LIMIT_BACKEND: str = "memory"
+    AI_RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/3"
+    AI_RATE_LIMIT_WORKERS: int = 1
+    AI_BATCH_BUDGET_SHARE: float = 0.5
+    AI_MAX_QUEUED_REQUESTS: int = 500
+    AI_INTERACTIVE_QUEUE_TIMEOUT_SECONDS: float = 20.0
+    AI_ESTIMATED_COMPLETION_TOKENS: int = 300
+
+    # Celery batch jobs over all users
+    BATCH_PAGE_SIZE: int = 500
+    BATCH_CONCURRENCY: int = 10
+    BATCH_STALE_AFTER_SECONDS: int = 60 * 60  # an unfinished run idle this long is resumed
+
+    # Notification outbox delivery
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_MAX_ATTEMPTS: int = 6
+    OUTBOX_RETRY_BASE_SECONDS: int = 30
+    OUTBOX_RETRY_MAX_SECONDS: int = 60 * 60
+    OUTBOX_LEASE_SECONDS: int = 5 * 60  # a claimed message is retried if not settled by then
+    OUTBOX_POLL_SECONDS: int = 15
+
+    # Real-time notification push ("memory" per worker, or "redis" across workers)
+    NOTIFICATION_PUBSUB_BACKEND: str = "memory"
+    NOTIFICATION_PUBSUB_REDIS_URL: str = "redis://localhost:6379/2"
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: float = 15.0
+
+    # Bulk health diary import
+    DIARY_IMPORT_BATCH_SIZE: int = 1000
+    DIARY_IMPORT_MAX_ERRORS: int = 1000
+    DIARY_IMPORT_MAX_LINE_LENGTH: int = 64 * 1024  # characters; longer lines are rejected unread
+    DIARY_IMPORT_MAX_RECORD_LENGTH: int = 256 * 1024  # characters in a multi-line CSV record
+
+    # Streaming health record export
+    EXPORT_YIELD_PER: int = 500  # rows fetched per server-side cursor round trip
+    EXPORT_CHUNK_BYTES: int = 64 * 1024
+
+    # Report generation
+    REPORTS_DIR: str = "reports"
+    REPORT_RENDER_WORKERS: int = 0  # 0 = one per CPU core
+    REPORT_FLEET_CHUNK_SIZE: int = 100  # users whose diaries are loaded per query in fleet mode
+    REPORT_RUNNING_STALE_SECONDS: int = 60 * 60  # a report "running" this long was left by a crashed worker
+    REPORT_CHART_MAX_POINTS: int = 120  # longer histories are averaged into multi-day points
+    REPORT_MAX_DIARY_ROWS: int = 100  # most recent entries listed; the mood chart covers the rest
+
+    # Wearable analytics (windows are in minutes of readings)
+    WEARABLE_ROLLING_WINDOW_MINUTES: int = 15
+    WEARABLE_RESTING_WINDOW_MINUTES: int = 10
+    WEARABLE_ANOMALY_WINDOW_MINUTES: int = 60
+    WEARABLE_ANOMALY_Z: float = 4.0
+    WEARABLE_STORE_BATCH_SIZE: int = 500  # chunk / rollup rows per INSERT
+
+    # Incremental high-risk diary scan
+    HIGH_RISK_SCAN_PAGE_SIZE: int = 500
+    HIGH_RISK_SCAN_OVERLAP_IDS: int = 100  # re-checked below the watermark for late-committing inserts
+
+    # AI response cache ("memory" per worker, or "redis" shared across workers)
+    AI_CACHE_BACKEND: str = "memory"
+    AI_CACHE_REDIS_URL: str = "redis://localhost:6379/1"
+    AI_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    AI_CACHE_MAX_SIZE: int = 5000
+
+    # AI mood guide
+    MOOD_GUIDE_CONCURRENCY: int = 6
+    MOOD_GUIDE_STATIC_REFRESH_SECONDS: int = 60 * 60 * 6
     
     STRIPE_SECRET_KEY:str
     
@@ -44,11 +156,27 @@ class Settings(BaseSettings):
     EMAIL_PORT: int
     EMAIL_USERNAME: str
     EMAIL_PASSWORD: str
+    EMAIL_USE_TLS: bool = True  # STARTTLS; disable for a local debugging server
+    EMAIL_POOL_SIZE: int = 4
+    EMAIL_BATCH_SIZE: int = 50  # messages sent over one connection per send_many batch
+    EMAIL_TIMEOUT_SECONDS: float = 30.0
+    EMAIL_CONNECTION_MAX_AGE_SECONDS: int = 300
     SMS_API_KEY: str
+    SMS_API_URL: str = "https://sms-provider.com/api/send"
+    # >1 groups recipients of the same text into one {"phones": [...]} request; only
+    # raise it for a provider that accepts that shape (the default sends one "phone")
+    SMS_MAX_RECIPIENTS_PER_REQUEST: int = 1
+    SMS_MAX_CONNECTIONS: int = 20
+    SMS_CONCURRENCY: int = 10
+    SMS_TIMEOUT_SECONDS: float = 10.0
+    SMS_MAX_RETRIES: int = 3
+    SMS_RETRY_BASE_DELAY_SECONDS: float = 0.5
 
     # Construct SQLAlchemy Database URL properly
     @property
     def SQLALCHEMY_DATABASE_URL(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
     class Config:
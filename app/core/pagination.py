@@ -0,0 +1,22 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor for the sort key of the last row on a page."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Values passed to encode_cursor (datetimes come back as ISO strings); ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
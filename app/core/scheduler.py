@@ -1,13 +1,21 @@
 from celery import Celery
-from datetime import timedelta
+from datetime import datetime, timedelta
 import asyncio
-from app.services.notification_service import send_notification
-from app.services.report_service import generate_health_report
+import logging
+from app.services.notification_service import send_notification, deliver_outbox
+from app.services.report_service import generate_health_report, run_report_job, generate_reports_for_users
 from app.services.ai_services import analyze_symptoms
-from utils.send_sms import send_sms
-from utils.send_email import send_email
-from app.crud.health_diary import get_recent_entries
-from app.crud.user import get_active_users
+from app.services.ai_scheduler import batch_priority
+from app.services.ai_provider import close_provider
+from app.services.sms_service import close_sms_client
+from app.services.high_risk_scan import scan_high_risk_entries
+from app.services.notification_pubsub import broker as notification_broker
+from app.crud.user import get_active_user_ids_page
+from app.crud.job_checkpoint import get_checkpoint, start_run, advance_checkpoint
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+
+logger = logging.getLogger("scheduler")
 
 # Celery Configuration
 celery = Celery(
@@ -17,61 +25,192 @@ celery = Celery(
 )
 
 celery.conf.timezone = "UTC"
-
-CRITICAL_SYMPTOMS = {"chest pain", "shortness of breath", "fainting"}
-
+# Report rendering uses a process pool, which prefork children can't start; run
+# this queue on its own worker, e.g. `celery -A app.core.scheduler worker -Q reports -P threads`
+REPORTS_QUEUE = "reports"
+celery.conf.task_routes = {
+    "app.core.scheduler.render_report": {"queue": REPORTS_QUEUE},
+    "app.core.scheduler.generate_weekly_health_report": {"queue": REPORTS_QUEUE},
+}
 
 # ---------------- Celery Tasks ----------------
 
 @celery.task
 def send_medication_reminders(user_id: int):
     """Send scheduled medication reminders to users."""
-    asyncio.run(send_notification(user_id, "It's time to take your medication!"))
+    run_async(send_notification, user_id, "It's time to take your medication!")
 
 
 @celery.task
 def schedule_health_check_in():
     """Send AI-driven symptom check-in reminders to all users."""
-    users = asyncio.run(get_active_users())
-    for user in users:
-        asyncio.run(send_notification(user.id, "Remember to log your daily health check-in!"))
+    run_async(_start_user_batch_job, HEALTH_CHECK_IN_JOB)
+
+
+@celery.task
+def generate_weekly_reports():
+    """Generate weekly health reports for every active user."""
+    run_async(_start_user_batch_job, WEEKLY_REPORT_JOB)
 
 
 @celery.task
 def generate_weekly_health_report(user_id: int):
     """Generate and notify users of weekly health reports."""
-    report_path = asyncio.run(generate_health_report(user_id))
-    asyncio.run(send_notification(user_id, f"Your weekly health report is ready: {report_path}"))
+    run_async(_generate_and_announce_report, user_id)
+
+
+async def _generate_and_announce_report(user_id: int):
+    report = await generate_health_report(user_id)
+    if report and report.status == "ready":
+        await send_notification(user_id, f"Your weekly health report is ready (report #{report.id}).")
+
+
+@celery.task(acks_late=True)
+def render_report(report_id: int):
+    """Render a report requested through the reports API."""
+    run_async(run_report_job, report_id)
 
 
 @celery.task
 def analyze_user_health_patterns():
     """Run AI-driven health pattern analysis."""
-    users = asyncio.run(get_active_users())
-    for user in users:
-        asyncio.run(analyze_symptoms(user.id))
+    run_async(_start_user_batch_job, HEALTH_PATTERN_JOB)
+
+
+# ---------------- Chunked user batch jobs ----------------
+#
+# A run walks active users in id order, one page per process_user_batch task.
+# Each task handles its page on a single event loop with bounded concurrency,
+# advances the job checkpoint, then enqueues the next page. A crashed task is
+# redelivered (acks_late) and a stalled run is resumed from its checkpoint by
+# the next trigger.
+
+HEALTH_PATTERN_JOB = "health_pattern_analysis"
+HEALTH_CHECK_IN_JOB = "health_check_in"
+WEEKLY_REPORT_JOB = "weekly_health_reports"
+
+
+async def _analyze_symptoms_batch(user_id: int):
+    # Batch priority keeps this job behind interactive requests in the LLM scheduler
+    with batch_priority():
+        return await analyze_symptoms(user_id)
+
+
+async def _send_check_in(user_id: int):
+    # Keyed per day so a redelivered page does not remind anyone twice
+    dedup_key = f"check-in:{datetime.utcnow().date()}:{user_id}"
+    return await send_notification(user_id, "Remember to log your daily health check-in!", dedup_key=dedup_key)
+
+
+# Per-user handlers, run BATCH_CONCURRENCY at a time
+USER_BATCH_HANDLERS = {
+    HEALTH_PATTERN_JOB: _analyze_symptoms_batch,
+    HEALTH_CHECK_IN_JOB: _send_check_in,
+}
+
+# Handlers that take the whole page of user ids at once
+USER_PAGE_HANDLERS = {
+    WEEKLY_REPORT_JOB: generate_reports_for_users,
+}
+
+# Jobs whose pages must run on a specific queue
+USER_BATCH_QUEUES = {
+    WEEKLY_REPORT_JOB: REPORTS_QUEUE,
+}
+
+
+def _enqueue_user_page(job_name: str):
+    process_user_batch.apply_async((job_name,), queue=USER_BATCH_QUEUES.get(job_name, celery.conf.task_default_queue))
+
+
+def run_async(func, *args):
+    """
+    Run a coroutine on one fresh event loop, then finish pending notification
+    pushes and release the pooled DB and HTTP connections bound to that loop.
+    """
+    async def runner():
+        try:
+            return await func(*args)
+        finally:
+            await notification_broker.flush()
+            await close_provider()
+            await close_sms_client()
+            await engine.dispose()
+    return asyncio.run(runner())
+
+
+async def _start_user_batch_job(job_name: str):
+    async with SessionLocal() as db:
+        checkpoint = await get_checkpoint(db, job_name)
+        if checkpoint and not checkpoint.completed_at:
+            idle = (datetime.utcnow() - checkpoint.updated_at).total_seconds()
+            if idle < settings.BATCH_STALE_AFTER_SECONDS:
+                logger.info(f"{job_name}: run still in progress at user {checkpoint.last_id}, not restarting")
+                return
+            logger.warning(f"{job_name}: resuming stalled run after user {checkpoint.last_id}")
+        else:
+            await start_run(db, job_name)
+    _enqueue_user_page(job_name)
+
+
+@celery.task(acks_late=True, reject_on_worker_lost=True)
+def process_user_batch(job_name: str):
+    """Process one page of active users for a batch job, then enqueue the next page."""
+    if run_async(_process_user_page, job_name):
+        _enqueue_user_page(job_name)
+
+
+async def _run_per_user(job_name: str, user_ids):
+    handler = USER_BATCH_HANDLERS[job_name]
+    limiter = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def run_one(user_id: int):
+        async with limiter:
+            try:
+                await handler(user_id)
+            except Exception as e:
+                logger.error(f"{job_name}: user {user_id} failed: {e}")
+
+    await asyncio.gather(*(run_one(user_id) for user_id in user_ids))
+
+
+async def _process_user_page(job_name: str) -> bool:
+    """Returns True while there are more pages to process."""
+    async with SessionLocal() as db:
+        checkpoint = await get_checkpoint(db, job_name)
+        if not checkpoint or checkpoint.completed_at:
+            return False
+        start_id = checkpoint.last_id
+        user_ids = await get_active_user_ids_page(db, after_id=start_id, limit=settings.BATCH_PAGE_SIZE)
+
+    # The per-user work opens its own sessions; none is held across it
+    if job_name in USER_PAGE_HANDLERS:
+        await USER_PAGE_HANDLERS[job_name](list(user_ids))
+    else:
+        await _run_per_user(job_name, user_ids)
+
+    done = len(user_ids) < settings.BATCH_PAGE_SIZE
+    end_id = user_ids[-1] if user_ids else start_id
+    async with SessionLocal() as db:
+        advanced = await advance_checkpoint(db, job_name, start_id, end_id, completed=done)
+    if not advanced:
+        logger.warning(f"{job_name}: checkpoint moved past {start_id} by another worker, stopping this chain")
+        return False
+
+    logger.info(f"{job_name}: processed {len(user_ids)} users through id {end_id}")
+    return not done
 
 
 @celery.task
 def run_high_risk_check():
-    """Check health diary for critical symptoms or mood and send alerts."""
-    asyncio.run(_check_for_high_risk_users())
+    """Check new health diary entries for critical symptoms or mood and send alerts."""
+    run_async(scan_high_risk_entries)
 
 
-async def _check_for_high_risk_users():
-    recent_entries = await get_recent_entries(hours=24)
-
-    for entry in recent_entries:
-        flagged = any(symptom.lower() in CRITICAL_SYMPTOMS for symptom in entry.symptoms)
-        if flagged or entry.mood_score <= 2:
-            if entry.user.phone:
-                await send_sms(entry.user.phone, "High-risk symptom detected")
-            if entry.user.email:
-                await send_email(
-                    entry.user.email,
-                    "Urgent Check-In Required",
-                    "We've detected severe symptoms in your recent health diary entry."
-                )
+@celery.task
+def deliver_notification_outbox():
+    """Deliver queued email and SMS notifications."""
+    run_async(deliver_outbox)
 
 
 # ---------------- Celery Beat Schedule ----------------
@@ -82,9 +221,8 @@ celery.conf.beat_schedule = {
         "schedule": timedelta(days=1),
     },
     "weekly_report_generation": {
-        "task": "app.core.scheduler.generate_weekly_health_report",
+        "task": "app.core.scheduler.generate_weekly_reports",
         "schedule": timedelta(weeks=1),
-        "args": [1],  # Replace with dynamic user ID logic if needed
     },
     "ai_health_analysis": {
         "task": "app.core.scheduler.analyze_user_health_patterns",
@@ -94,6 +232,10 @@ celery.conf.beat_schedule = {
         "task": "app.core.scheduler.run_high_risk_check",
         "schedule": timedelta(minutes=30),
     },
+    "deliver_notification_outbox": {
+        "task": "app.core.scheduler.deliver_notification_outbox",
+        "schedule": timedelta(seconds=settings.OUTBOX_POLL_SECONDS),
+    },
 }
 
 # Optional CLI entrypoint
@@ -6,6 +6,12 @@ from app.schemas.health_diary import HealthDiaryCreate, HealthDiaryUpdate
 from datetime import datetime
 from datetime import datetime, timedelta
 from sqlalchemy.orm import selectinload
+from sqlalchemy import Text, cast, exists, func, or_, tuple_
+from app.core.pagination import decode_cursor, encode_cursor
+from typing import Optional
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.models.high_risk_alert import HighRiskAlert
+from app.services.insight_cache import invalidate_dashboard_insight
 
 
 async def create_health_diary(db: AsyncSession, diary: HealthDiaryCreate):
@@ -30,17 +36,47 @@ async def create_health_diary(db: AsyncSession, diary: HealthDiaryCreate):
     db.add(new_entry)
     await db.commit()
     await db.refresh(new_entry)
+    invalidate_dashboard_insight(new_entry.user_id)
     return new_entry
 
+def _newest_first(stmt):
+    return stmt.order_by(HealthDiary.date.desc(), HealthDiary.id.desc())
+
 async def get_health_diary(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10):
-    result = await db.execute(select(HealthDiary).filter(HealthDiary.user_id == user_id).offset(skip).limit(limit))
+    """A user's entries, newest first."""
+    result = await db.execute(_newest_first(select(HealthDiary).filter(HealthDiary.user_id == user_id)).offset(skip).limit(limit))
     entries = result.scalars().all()
     return entries if entries else [] 
 
 async def get_health_diaries(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10):
-    result = await db.execute(select(HealthDiary).filter(HealthDiary.user_id == user_id).offset(skip).limit(limit))
+    """A user's entries, newest first; reverse them for a chronological log."""
+    result = await db.execute(_newest_first(select(HealthDiary).filter(HealthDiary.user_id == user_id)).offset(skip).limit(limit))
     return result.scalars().all()
 
+async def get_health_diary_page(db: AsyncSession, user_id: int, limit: int = 20, cursor: Optional[str] = None):
+    """
+    One page of a user's diary, newest first, keyset-paginated on (date, id)
+    so deep pages cost the same as the first. Returns (entries, next_cursor);
+    next_cursor is None on the last page. Raises ValueError for a bad cursor.
+    """
+    stmt = select(HealthDiary).where(HealthDiary.user_id == user_id)
+    if cursor:
+        try:
+            entry_date, entry_id = decode_cursor(cursor)
+            entry_date = datetime.fromisoformat(entry_date)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        stmt = stmt.where(tuple_(HealthDiary.date, HealthDiary.id) < (entry_date, entry_id))
+
+    result = await db.execute(_newest_first(stmt).limit(limit + 1))
+    entries = result.scalars().all()
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1].date, entries[-1].id)
+    return entries, next_cursor
+
 async def delete_health_diary(db: AsyncSession, entry_id: int):
     entry = await get_health_diary(db, entry_id)
     if entry:
@@ -64,6 +100,7 @@ async def update_health_diary(db: AsyncSession, entry_id: int, diary_update: Hea
 
     await db.commit()
     await db.refresh(entry)
+    invalidate_dashboard_insight(entry.user_id)
     return entry
 
 async def get_recent_entries(db: AsyncSession, hours: int = 24):
@@ -77,6 +114,52 @@ async def get_recent_entries(db: AsyncSession, hours: int = 24):
     result = await db.execute(stmt)
     return result.scalars().all()
 
+async def get_max_entry_id(db: AsyncSession) -> int:
+    result = await db.execute(select(func.max(HealthDiary.id)))
+    return result.scalar() or 0
+
+
+async def get_unalerted_high_risk_entries(
+    db: AsyncSession,
+    after_id: int,
+    up_to_id: int,
+    critical_symptoms,
+    max_mood: int = 2,
+    limit: int = 500,
+):
+    """
+    Entries with ``after_id < id <= up_to_id`` that list a critical symptom
+    (case-insensitive) or have a mood of ``max_mood`` or lower, and have not
+    been alerted on yet. Ordered by id.
+    """
+    # Lowercase the JSON text, then test containment of each symptom as a JSON array element
+    lowered_symptoms = cast(func.lower(cast(HealthDiary.symptoms, Text)), JSONB)
+    already_alerted = exists().where(HighRiskAlert.diary_entry_id == HealthDiary.id)
+
+    stmt = (
+        select(HealthDiary)
+        .where(
+            HealthDiary.id > after_id,
+            HealthDiary.id <= up_to_id,
+            or_(
+                HealthDiary.mood <= max_mood,
+                *(lowered_symptoms.contains([symptom]) for symptom in critical_symptoms),
+            ),
+            ~already_alerted,
+        )
+        .options(selectinload(HealthDiary.user))
+        .order_by(HealthDiary.id)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+def add_high_risk_alert(db: AsyncSession, entry: HealthDiary):
+    """Mark an entry as alerted on; committed with the caller's transaction."""
+    db.add(HighRiskAlert(diary_entry_id=entry.id, user_id=entry.user_id))
+
+
 async def get_latest_entry(db: AsyncSession, user_id: int):
     stmt = (
         select(HealthDiary)
@@ -102,8 +185,6 @@ async def get_mood_entries_with_time(db: AsyncSession, user_id: int, days: int =
     result = await db.execute(stmt)
     return result.all()
 
-from sqlalchemy import func
-
 async def get_mood_counts(db: AsyncSession, user_id: int, days: int = 7):
     since = datetime.utcnow() - timedelta(days=days)
 
@@ -0,0 +1,42 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update
+from datetime import datetime
+from app.db.models.job_checkpoint import JobCheckpoint
+
+
+async def get_checkpoint(db: AsyncSession, name: str):
+    """Get the checkpoint row for a batch job, if it has ever run."""
+    return await db.get(JobCheckpoint, name, populate_existing=True)
+
+
+async def start_run(db: AsyncSession, name: str, last_id: int = 0):
+    """Reset a job's checkpoint to ``last_id`` (the beginning by default) for a new run."""
+    checkpoint = await get_checkpoint(db, name)
+    now = datetime.utcnow()
+    if not checkpoint:
+        checkpoint = JobCheckpoint(name=name)
+        db.add(checkpoint)
+    checkpoint.last_id = last_id
+    checkpoint.run_started_at = now
+    checkpoint.updated_at = now
+    checkpoint.completed_at = None
+    await db.commit()
+    return checkpoint
+
+
+async def advance_checkpoint(db: AsyncSession, name: str, from_id: int, to_id: int, completed: bool = False) -> bool:
+    """
+    Move the checkpoint from ``from_id`` to ``to_id``. Returns False if another
+    worker already moved it (compare-and-set), so duplicate chains stop.
+    """
+    now = datetime.utcnow()
+    values = {"last_id": to_id, "updated_at": now}
+    if completed:
+        values["completed_at"] = now
+    result = await db.execute(
+        update(JobCheckpoint)
+        .where(JobCheckpoint.name == name, JobCheckpoint.last_id == from_id)
+        .values(**values)
+    )
+    await db.commit()
+    return result.rowcount == 1
@@ -2,27 +2,50 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from app.db.models.notifications import Notification
-from app.db.models.user import User  
+from app.db.models.user import User
 from app.schemas.notification import NotificationCreate
+from app.core.pagination import decode_cursor, encode_cursor
+from app.services.notification_pubsub import publish_after_commit
 from datetime import datetime
+from typing import List, Optional
 from fastapi import HTTPException
-from sqlalchemy import delete
+from sqlalchemy import delete, tuple_, update
+
+
+async def _change_unread_count(db: AsyncSession, user_id: int, delta: int):
+    if delta:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(unread_notifications=User.unread_notifications + delta)
+        )
+
+
+async def add_notification(db: AsyncSession, user_id: int, message: str) -> Notification:
+    """
+    Add an unread notification and bump the user's unread counter, in the
+    caller's transaction. Open notification streams get it after commit.
+    """
+    db_notification = Notification(
+        user_id=user_id,
+        message=message,
+        sent_at=datetime.utcnow().replace(tzinfo=None)
+    )
+    db.add(db_notification)
+    await _change_unread_count(db, user_id, 1)
+    publish_after_commit(db, db_notification)
+    return db_notification
+
 
 async def create_notification(db: AsyncSession, notification: NotificationCreate):
-  
+
     result = await db.execute(select(User).filter(User.id == notification.user_id))
     user = result.scalars().first()
 
     if not user:
         raise HTTPException(status_code=400, detail=f"User with ID {notification.user_id} does not exist.")
 
-    db_notification = Notification(
-        user_id=notification.user_id,
-        message=notification.message,
-        sent_at=datetime.utcnow().replace(tzinfo=None)  
-    )
-
-    db.add(db_notification)
+    db_notification = await add_notification(db, notification.user_id, notification.message)
     try:
         await db.commit()
         await db.refresh(db_notification)
@@ -31,14 +54,62 @@ async def create_notification(db: AsyncSession, notification: NotificationCreate
         await db.rollback()
         raise HTTPException(status_code=400, detail="Error inserting notification. Possible constraint violation.")
 
-async def get_notifications(db: AsyncSession, user_id: int):
+async def get_notifications(db: AsyncSession, user_id: int, limit: int = 20, cursor: Optional[str] = None):
     """
-    Retrieve all notifications for a specific user.
+    One page of a user's notifications, newest first, keyset-paginated on
+    (sent_at, id). Returns (notifications, next_cursor); next_cursor is None on
+    the last page.
     """
+    stmt = select(Notification).where(Notification.user_id == user_id)
+    if cursor:
+        try:
+            sent_at, notification_id = decode_cursor(cursor)
+            sent_at = datetime.fromisoformat(sent_at)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(Notification.sent_at, Notification.id) < (sent_at, notification_id))
+
     result = await db.execute(
-        select(Notification).where(Notification.user_id == user_id)
+        stmt.order_by(Notification.sent_at.desc(), Notification.id.desc()).limit(limit + 1)
+    )
+    notifications = result.scalars().all()
+
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        last = notifications[-1]
+        next_cursor = encode_cursor(last.sent_at, last.id)
+    return notifications, next_cursor
+
+
+async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+    """The user's denormalized unread counter (a primary-key lookup)."""
+    result = await db.execute(select(User.unread_notifications).where(User.id == user_id))
+    return result.scalar() or 0
+
+
+async def get_notification_summary(db: AsyncSession, user_id: int, limit: int = 5):
+    """Latest notifications and the unread count, for the dashboard."""
+    notifications, _ = await get_notifications(db, user_id, limit=limit)
+    return {"unread_count": await get_unread_count(db, user_id), "latest": notifications}
+
+
+async def mark_notifications_read(db: AsyncSession, user_id: int, notification_ids: Optional[List[int]] = None) -> int:
+    """
+    Mark the given notifications (or all of them) as read and decrement the
+    unread counter by the number that actually changed. Returns that number.
+    """
+    stmt = (
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read == False)
+        .values(is_read=True)
     )
-    return result.scalars().all()
+    if notification_ids is not None:
+        stmt = stmt.where(Notification.id.in_(notification_ids))
+    result = await db.execute(stmt)
+    await _change_unread_count(db, user_id, -result.rowcount)
+    await db.commit()
+    return result.rowcount
 
 
 async def delete_notification(db: AsyncSession, notification_id: int, user_id: int):
@@ -56,6 +127,8 @@ async def delete_notification(db: AsyncSession, notification_id: int, user_id: i
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found or access denied")
 
+    if not notification.is_read:
+        await _change_unread_count(db, user_id, -1)
     await db.delete(notification)
     await db.commit()
 
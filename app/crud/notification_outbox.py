@@ -0,0 +1,54 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.db.models.notification_outbox import NotificationOutbox
+
+
+async def add_outbox_message(
+    db: AsyncSession,
+    dedup_key: str,
+    user_id: int,
+    channel: str,
+    recipient: str,
+    body: str,
+    subject: Optional[str] = None,
+) -> bool:
+    """
+    Queue one outbound message in the caller's transaction (no commit).
+    Returns False if a message with this dedup_key was already queued.
+    """
+    result = await db.execute(
+        insert(NotificationOutbox)
+        .values(
+            dedup_key=dedup_key,
+            user_id=user_id,
+            channel=channel,
+            recipient=recipient,
+            subject=subject,
+            body=body,
+        )
+        .on_conflict_do_nothing(index_elements=[NotificationOutbox.dedup_key])
+    )
+    return result.rowcount == 1
+
+
+async def claim_due_messages(db: AsyncSession, limit: int, lease_seconds: int) -> List[NotificationOutbox]:
+    """
+    Lock and lease up to ``limit`` due pending messages. Concurrent workers skip
+    each other's rows; a leased message becomes due again if its worker dies.
+    """
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(NotificationOutbox)
+        .where(NotificationOutbox.status == "pending", NotificationOutbox.next_attempt_at <= now)
+        .order_by(NotificationOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    messages = result.scalars().all()
+    for message in messages:
+        message.next_attempt_at = now + timedelta(seconds=lease_seconds)
+    await db.commit()
+    return messages
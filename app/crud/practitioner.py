@@ -2,7 +2,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from datetime import datetime
 from app.db.models.practitioners import Practitioner  
+from app.db.models.practitioner_patient import practitioner_patient
 from app.schemas.practitioner import PractitionerCreate, PractitionerResponse
+from app.crud.user import invalidate_auth_user
+
+async def _patient_ids(db: AsyncSession, practitioner_id: int):
+    result = await db.execute(
+        select(practitioner_patient.c.patient_id).where(practitioner_patient.c.practitioner_id == practitioner_id)
+    )
+    return result.scalars().all()
 
 async def create_practitioner(db: AsyncSession, practitioner: PractitionerCreate):
     """Create a new practitioner."""
@@ -40,6 +48,9 @@ async def update_practitioner(db: AsyncSession, practitioner_id: int, practition
             setattr(db_practitioner, key, value)
         await db.commit()
         await db.refresh(db_practitioner)
+        # Cached auth users carry their practitioner_relationships
+        for patient_id in await _patient_ids(db, practitioner_id):
+            invalidate_auth_user(patient_id)
     
     return db_practitioner
 
@@ -49,7 +60,10 @@ async def delete_practitioner(db: AsyncSession, practitioner_id: int):
     db_practitioner = result.scalars().first()
 
     if db_practitioner:
+        patient_ids = await _patient_ids(db, practitioner_id)
         await db.delete(db_practitioner)
         await db.commit()
+        for patient_id in patient_ids:
+            invalidate_auth_user(patient_id)
     
     return db_practitioner
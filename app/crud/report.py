@@ -1,25 +1,67 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db import models
+from sqlalchemy import update
+from app.db.models.reports import Report
 from app.schemas import report
 from datetime import datetime
 
 async def create_report(db: AsyncSession, report_data: report.ReportCreate):
     """Creates a new report asynchronously."""
-    db_report = models.Report(**report_data.dict(), created_at=datetime.utcnow())
+    db_report = Report(**report_data.dict(), generated_at=datetime.utcnow())
     db.add(db_report)
     await db.commit()  
     await db.refresh(db_report)  
     return db_report
 
+async def create_report_job(db: AsyncSession, user_id: int, kind: str):
+    """Create a pending report for a user; rendering happens later."""
+    db_report = Report(user_id=user_id, report_data=kind, status="pending", generated_at=datetime.utcnow())
+    db.add(db_report)
+    await db.commit()
+    await db.refresh(db_report)
+    return db_report
+
+async def get_report(db: AsyncSession, report_id: int, user_id: int = None):
+    """Fetch one report, optionally only if it belongs to ``user_id``."""
+    stmt = select(Report).filter(Report.id == report_id)
+    if user_id is not None:
+        stmt = stmt.filter(Report.user_id == user_id)
+    result = await db.execute(stmt)
+    return result.scalars().first()
+
+async def get_ready_report_by_digest(db: AsyncSession, user_id: int, kind: str, input_digest: str):
+    """Most recent finished report of this kind rendered from the same inputs."""
+    result = await db.execute(
+        select(Report)
+        .filter(
+            Report.user_id == user_id,
+            Report.report_data == kind,
+            Report.input_digest == input_digest,
+            Report.status == "ready",
+        )
+        .order_by(Report.id.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+async def fail_stale_running_reports(db: AsyncSession, created_before: datetime) -> int:
+    """Mark reports still "running" that were created before ``created_before`` as failed; returns how many."""
+    result = await db.execute(
+        update(Report)
+        .where(Report.status == "running", Report.generated_at < created_before)
+        .values(status="failed", error="Rendering interrupted", completed_at=datetime.utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
 async def get_reports_by_user(db: AsyncSession, user_id: int):
     """Fetch reports by user asynchronously."""
-    result = await db.execute(select(models.Report).filter(models.Report.user_id == user_id))
+    result = await db.execute(select(Report).filter(Report.user_id == user_id))
     return result.scalars().all()  
 
 async def update_report(db: AsyncSession, report_id: int, report_update: report.ReportUpdate):
     """Updates a report asynchronously."""
-    result = await db.execute(select(models.Report).filter(models.Report.id == report_id))
+    result = await db.execute(select(Report).filter(Report.id == report_id))
     db_report = result.scalars().first()
     
     if db_report:
@@ -31,7 +73,7 @@ async def update_report(db: AsyncSession, report_id: int, report_update: report.
 
 async def delete_report(db: AsyncSession, report_id: int):
     """Deletes a report asynchronously."""
-    result = await db.execute(select(models.Report).filter(models.Report.id == report_id))
+    result = await db.execute(select(Report).filter(Report.id == report_id))
     db_report = result.scalars().first()
     
     if db_report:
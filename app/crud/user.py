@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession 
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 from app.db.models.user import User, UserRoleEnum
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import hash_password  
@@ -9,11 +10,15 @@ from app.db.models.practitioners import Practitioner
 from app.db.models.caregiver import Caregiver
 from fastapi.concurrency import run_in_threadpool
 from app.db.models.mental_health import Professional
+from app.core.cache import TTLCache
 
 
 # Set Stripe API key
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+# Detached User rows for authenticated requests, keyed by user id
+_auth_user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
 from app.db.models.practitioners import Practitioner  
 
 async def create_user(db: AsyncSession, user: UserCreate):
@@ -44,7 +49,8 @@ async def create_user(db: AsyncSession, user: UserCreate):
         is_active=True,
         role=role_enum,
         subscription_id=user.subscription_id,
-        stripe_customer_id=stripe_customer.id
+        stripe_customer_id=stripe_customer.id,
+        phone=user.phone
     )
 
     db.add(new_user)
@@ -104,11 +110,50 @@ async def get_user(db: AsyncSession, user_id: int):
     return result.scalars().first()
 
 
+async def get_auth_user(db: AsyncSession, user_id: int):
+    """
+    Return the user behind an authenticated request.
+
+    The row (with practitioner_relationships) is loaded once and kept detached in
+    the cache; each request gets a copy merged into its own session without a SELECT.
+    """
+    user = _auth_user_cache.get(user_id)
+    if user is None:
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.practitioner_relationships))
+            .where(User.id == user_id)
+        )
+        user = result.scalars().first()
+        if not user:
+            return None
+        db.expunge(user)
+        _auth_user_cache.set(user_id, user)
+
+    return await db.merge(user, load=False)
+
+
+def invalidate_auth_user(user_id: int):
+    """Drop a cached auth user so the next request reloads it."""
+    _auth_user_cache.pop(user_id)
+
+
 async def get_active_users(db: AsyncSession):
     result = await db.execute(select(User).filter(User.is_active == True))
     return result.scalars().all() 
 
 
+async def get_active_user_ids_page(db: AsyncSession, after_id: int = 0, limit: int = 500):
+    """Keyset page of active user ids greater than ``after_id``, in id order."""
+    result = await db.execute(
+        select(User.id)
+        .where(User.is_active == True, User.id > after_id)
+        .order_by(User.id)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
 async def get_users(db: AsyncSession, skip: int = 0, limit: int = 10):
     result = await db.execute(select(User).offset(skip).limit(limit))
     return result.scalars().all()
@@ -141,6 +186,7 @@ async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate):
 
     await db.commit()
     await db.refresh(user)
+    invalidate_auth_user(user_id)
     return user
 
 
@@ -149,4 +195,5 @@ async def delete_user(db: AsyncSession, user_id: int):
     if user:
         await db.delete(user)
         await db.commit()
+        invalidate_auth_user(user_id)
     return user
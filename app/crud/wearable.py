@@ -0,0 +1,78 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func
+from datetime import date, datetime
+from typing import List, Set, Tuple
+from app.core.config import settings
+from app.db.models.wearable_series import WearableChunk
+
+
+async def add_chunks(db: AsyncSession, rows: List[dict]) -> Set[Tuple[int, datetime]]:
+    """
+    Append encoded chunks in the caller's transaction (no commit), in batches of
+    WEARABLE_STORE_BATCH_SIZE. Chunks already stored are skipped; returns the
+    (metric, start_at) keys that were actually inserted.
+    """
+    inserted = set()
+    for i in range(0, len(rows), settings.WEARABLE_STORE_BATCH_SIZE):
+        result = await db.execute(
+            insert(WearableChunk)
+            .values(rows[i:i + settings.WEARABLE_STORE_BATCH_SIZE])
+            .on_conflict_do_nothing()
+            .returning(WearableChunk.metric, WearableChunk.start_at)
+        )
+        inserted.update((metric, start_at) for metric, start_at in result.all())
+    return inserted
+
+
+async def add_to_rollups(db: AsyncSession, model, rows: List[dict]):
+    """
+    Merge per-bucket aggregates into a rollup table in the caller's transaction.
+    Rows must have distinct keys; they are written in key order so concurrent
+    uploads for the same user can't deadlock.
+    """
+    rows = sorted(rows, key=lambda row: (row["user_id"], row["metric"], row["bucket_start"]))
+    for i in range(0, len(rows), settings.WEARABLE_STORE_BATCH_SIZE):
+        stmt = insert(model).values(rows[i:i + settings.WEARABLE_STORE_BATCH_SIZE])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[model.user_id, model.metric, model.bucket_start],
+                set_={
+                    "reading_count": model.reading_count + stmt.excluded.reading_count,
+                    "total": model.total + stmt.excluded.total,
+                    "minimum": func.least(model.minimum, stmt.excluded.minimum),
+                    "maximum": func.greatest(model.maximum, stmt.excluded.maximum),
+                },
+            )
+        )
+
+
+async def get_rollups(db: AsyncSession, model, user_id: int, metric: int, start: datetime, end: datetime):
+    """Rollup rows with ``start <= bucket_start < end``, oldest first."""
+    result = await db.execute(
+        select(model)
+        .where(
+            model.user_id == user_id,
+            model.metric == metric,
+            model.bucket_start >= start,
+            model.bucket_start < end,
+        )
+        .order_by(model.bucket_start)
+    )
+    return result.scalars().all()
+
+
+async def get_chunks(db: AsyncSession, user_id: int, metric: int, first_day: date, last_day: date):
+    """Raw chunks for the days ``first_day..last_day``, oldest first."""
+    result = await db.execute(
+        select(WearableChunk)
+        .where(
+            WearableChunk.user_id == user_id,
+            WearableChunk.metric == metric,
+            WearableChunk.day >= first_day,
+            WearableChunk.day <= last_day,
+        )
+        .order_by(WearableChunk.start_at)
+    )
+    return result.scalars().all()
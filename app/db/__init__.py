@@ -1,5 +1,9 @@
-from app.db.session import engine
+# app.core's imports (services, crud) reach back into the models and the session;
+# load them in this order so importing app.db first (alembic's env.py,
+# `python -m app.db`) never meets a half-initialized module
 from app.db.base import Base
+import app.core
+from app.db.session import engine
 import asyncio
 
 async def init_db():
@@ -0,0 +1,4 @@
+import asyncio
+from app.db import init_db
+
+asyncio.run(init_db())
@@ -32,3 +32,7 @@ from app.db.models.referral_system import Referral
 from app.db.models.messaging import Message
 from app.db.models.oauth_token import UserOAuthToken
 from app.db.models.caregiver import Caregiver,CaregiverAssignment
+from app.db.models.job_checkpoint import JobCheckpoint
+from app.db.models.high_risk_alert import HighRiskAlert
+from app.db.models.notification_outbox import NotificationOutbox
+from app.db.models.wearable_series import WearableChunk, WearableHourlyRollup, WearableDailyRollup
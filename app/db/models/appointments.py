@@ -11,5 +11,6 @@ class Appointment(Base):
     doctor_name = Column(String, nullable=False)
     date = Column(DateTime, nullable=False)
     location = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # dashboard ETag probe
 
     user = relationship("User", back_populates="appointments")
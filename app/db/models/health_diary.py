@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.db.base import Base
@@ -13,5 +13,11 @@ class HealthDiary(Base):
     symptoms = Column(JSON, nullable=True)  # Now stores list of strings as JSON
     mood = Column(Integer, nullable=True)   # Mood as numeric score
     notes = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # dashboard ETag probe, report input digest
 
     user = relationship("User", back_populates="health_diary_entries")
+
+    __table_args__ = (
+        Index("ix_health_diary_user_date_id", "user_id", "date", "id"),
+        Index("ix_health_diary_date", "date"),
+    )
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from datetime import datetime
+from app.db.base import Base
+
+class HighRiskAlert(Base):
+    __tablename__ = "high_risk_alerts"
+
+    diary_entry_id = Column(Integer, ForeignKey("health_diary.id", ondelete="CASCADE"), primary_key=True)  # one alert per entry
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    alerted_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.db.base import Base
+
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+
+    name = Column(String, primary_key=True)  # e.g., "health_pattern_analysis"
+    last_id = Column(Integer, nullable=False, default=0)  # highest id fully processed in the current run
+    run_started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
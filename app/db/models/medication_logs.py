@@ -7,9 +7,10 @@ class MedicationLog(Base):
     __tablename__ = "medication_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     medication_id = Column(Integer, ForeignKey("medications.id"), nullable=False)
     taken_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # report input digest
 
     user = relationship("User")
     medication = relationship("Medication")
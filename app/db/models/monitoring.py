@@ -7,7 +7,7 @@ class ChronicMonitoring(Base):
     __tablename__ = "chronic_monitoring"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    patient_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    patient_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     condition = Column(String, nullable=False)  # e.g., "diabetes", "hypertension"
     blood_pressure = Column(JSON, nullable=True)  # List of systolic & diastolic readings
     blood_sugar = Column(JSON, nullable=True)  # List of glucose levels over time
@@ -15,5 +15,6 @@ class ChronicMonitoring(Base):
     weight = Column(JSON, nullable=True)  # List of weight readings
     medications = Column(JSON, nullable=True)  # List of prescribed medications
     recorded_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # report input digest
 
     patient = relationship("User", back_populates="chronic_monitoring")
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from datetime import datetime
+from app.db.base import Base
+
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    dedup_key = Column(String, unique=True, nullable=False)  # e.g., "check-in:2024-05-01:42:email"
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    channel = Column(String, nullable=False)  # "email" or "sms"
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=True)
+    body = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_notification_outbox_due", "status", "next_attempt_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -10,5 +10,10 @@ class Notification(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     message = Column(String, nullable=False)
     sent_at = Column(DateTime, default=lambda: datetime.utcnow().replace(tzinfo=None))  #  Fix: Ensure naive datetime
+    is_read = Column(Boolean, nullable=False, default=False)
 
     user = relationship("User", back_populates="notifications")  #  Fix: Improved relationship handling
+
+    __table_args__ = (
+        Index("ix_notifications_user_sent_id", "user_id", "sent_at", "id"),  # inbox keyset pagination
+    )
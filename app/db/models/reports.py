@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -8,8 +8,17 @@ class Report(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    report_data = Column(String, nullable=False)
+    report_data = Column(String, nullable=False)  # report kind, e.g., "health_report"
     generated_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String, nullable=False, default="pending")  # pending, running, ready, failed
+    file_path = Column(String, nullable=True)  # set once the rendered file is stored
+    error = Column(String, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    input_digest = Column(String(64), nullable=True)  # digest of the rendered inputs, for reuse
 
     
     user = relationship("User", lazy="selectin")
+
+    __table_args__ = (
+        Index("ix_reports_user_digest", "user_id", "input_digest"),
+    )
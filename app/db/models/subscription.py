@@ -28,6 +28,7 @@ class Subscription(Base):
     status = Column(String, default="active")  # e.g., active, past_due, canceled, incomplete
     start_date = Column(DateTime, default=datetime.utcnow)
     end_date = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # dashboard ETag probe
 
     users = relationship("User", back_populates="subscription")
     plan = relationship("SubscriptionPlan", back_populates="subscriptions")
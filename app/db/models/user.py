@@ -29,6 +29,8 @@ class User(Base):
     
     subscription_id = Column(Integer, ForeignKey("subscription_plans.id"), nullable=True)
     stripe_customer_id = Column(String, unique=True, nullable=True)  
+    phone = Column(String, nullable=True)  # SMS notifications go here when set
+    unread_notifications = Column(Integer, nullable=False, default=0, server_default="0")  # kept in step by crud.notification
 
     # Relationships  
     subscription = relationship("Subscription", back_populates="users")
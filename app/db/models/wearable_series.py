@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, SmallInteger, Float, Date, DateTime, LargeBinary, ForeignKey, DDL, event
+from datetime import datetime
+from app.db.base import Base
+
+# Fixed hash partitions, so there are no per-day partitions to create ahead of
+# time; keep in step with db/migrations/versions/0006_wearable_time_series.py
+CHUNK_PARTITIONS = 16
+
+class WearableChunk(Base):
+    """
+    Append-only run of evenly spaced readings of one metric for one user, within
+    one UTC day. ``data`` packs the readings as fixed-width integers, int16 or
+    int32 by metric (see app/services/wearable_store.py). Hash-partitioned on user_id.
+    """
+    __tablename__ = "wearable_chunks"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    metric = Column(SmallInteger, primary_key=True)
+    day = Column(Date, primary_key=True)
+    start_at = Column(DateTime, primary_key=True)  # time of the first reading; a re-sent run conflicts here
+    interval_seconds = Column(Integer, nullable=False)
+    reading_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = {"postgresql_partition_by": "HASH (user_id)"}
+
+
+# create_all (app/db/__init__.py) only creates the partitioned parent, which
+# rejects every insert until its partitions exist
+for remainder in range(CHUNK_PARTITIONS):
+    event.listen(
+        WearableChunk.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE wearable_chunks_p{remainder} PARTITION OF wearable_chunks "
+            f"FOR VALUES WITH (MODULUS {CHUNK_PARTITIONS}, REMAINDER {remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
+class WearableHourlyRollup(Base):
+    __tablename__ = "wearable_rollups_hourly"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    metric = Column(SmallInteger, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    reading_count = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    minimum = Column(Float, nullable=False)
+    maximum = Column(Float, nullable=False)
+
+
+class WearableDailyRollup(Base):
+    __tablename__ = "wearable_rollups_daily"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    metric = Column(SmallInteger, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    reading_count = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    minimum = Column(Float, nullable=False)
+    maximum = Column(Float, nullable=False)
@@ -8,8 +8,13 @@ from app.services.auth_service import verify_access_token
 from fastapi.security import OAuth2PasswordBearer
 from app.crud.subscription import save_sub_plan_to_db
 import stripe
-from app.db.session import engine  
+from app.db.session import engine, read_engine, get_pool_metrics
+from app.services.ai_mood_guide import keep_static_insights_fresh
+from app.services.email_service import smtp_pool
+from app.services.ai_provider import close_provider
+from app.services.sms_service import close_sms_client
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 from app.db.session import SessionLocal
 
@@ -46,8 +51,16 @@ async def lifespan(app: FastAPI):
         
     except Exception as e:
         logger.error(f"Startup error while syncing Stripe products: {e}")
+
+    static_insight_refresher = asyncio.create_task(keep_static_insights_fresh())
     yield
+    static_insight_refresher.cancel()
+    smtp_pool.close()
+    await close_provider()
+    await close_sms_client()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 # Single app instance with lifespan
 app = FastAPI(title=settings.APP_NAME, version="1.0", lifespan=lifespan)
@@ -93,7 +106,7 @@ async def check_authentication_middleware(request: Request, call_next):
         return JSONResponse(status_code=401, content={"detail": "Invalid token format"})
 
     try:
-        _ = await verify_access_token(token)
+        request.state.token_claims = await verify_access_token(token)
     except Exception as e:
         logger.warning(f"Invalid token for {path}: {str(e)}")
         return JSONResponse(status_code=401, content={"detail": "Invalid or expired token"})
@@ -106,3 +119,11 @@ app.include_router(api_router)
 @app.get("/")
 def root():
     return {"message": "Welcome to the Health Management Assistant API!"}
+
+@app.get("/metrics/db-pool", include_in_schema=False)
+def db_pool_metrics():
+    """Connection pool checkout and wait counters for this worker."""
+    metrics = {"primary": get_pool_metrics(engine)}
+    if read_engine is not engine:
+        metrics["replica"] = get_pool_metrics(read_engine)
+    return metrics
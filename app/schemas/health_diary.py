@@ -9,6 +9,17 @@ class HealthDiaryCreate(BaseModel):
     date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     user_id: int
 
+class HealthDiaryImportRow(BaseModel):
+    date: datetime
+    mood: int = Field(..., ge=1, le=5, description="Mood must be between 1 and 5")
+    symptoms: List[str] = []
+    notes: Optional[str] = None
+
+class HealthDiaryImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[dict]  # {"line": int, "error": str}, first DIARY_IMPORT_MAX_ERRORS only
+
 class HealthDiaryResponse(BaseModel):
     id: int
     user_id: int
@@ -20,6 +31,10 @@ class HealthDiaryResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class HealthDiaryPage(BaseModel):
+    items: List[HealthDiaryResponse]
+    next_cursor: Optional[str] = None
+
 class HealthDiaryUpdate(BaseModel):
     symptoms: Optional[List[str]] = None
     mood: Optional[int] = Field(None, ge=1, le=5)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class NotificationCreate(BaseModel):
     message: str
@@ -10,10 +10,19 @@ class NotificationResponse(BaseModel):
     user_id: int
     message: str
     sent_at: datetime
+    is_read: bool
 
     class Config:
         orm_mode = True
 
+class NotificationPage(BaseModel):
+    items: List[NotificationResponse]
+    next_cursor: Optional[str] = None
+    unread_count: int
+
+class NotificationReadRequest(BaseModel):
+    notification_ids: Optional[List[int]] = None  # None marks everything read
+
 class NotificationCreate(BaseModel):
     title: str
     message: str
@@ -1,9 +1,13 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class ReportCreate(BaseModel):
     report_data: str
 
+class ReportUpdate(BaseModel):
+    report_data: Optional[str] = None
+
 class ReportResponse(BaseModel):
     id: int
     user_id: int
@@ -12,3 +16,13 @@ class ReportResponse(BaseModel):
 
     class Config:
         from_attributes = True  
+
+class ReportJobResponse(BaseModel):
+    id: int
+    status: str
+    generated_at: datetime
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
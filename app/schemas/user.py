@@ -66,6 +66,7 @@ class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     role: Optional[UserRoleInput] = None  # Use input enum
     subscription_id: Optional[int] = None
+    phone: Optional[str] = None
 
     class Config:
         use_enum_values = True
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
+from datetime import datetime
 
 class WearableDataRequest(BaseModel):
     device_id: str
@@ -8,7 +9,24 @@ class WearableDataRequest(BaseModel):
     activity_levels: Optional[List[dict]] = None  # Steps, calories burned, etc.
     oxygen_saturation: Optional[List[float]] = None  # Blood oxygen levels
     temperature: Optional[List[float]] = None  # Body temperature readings
+    # heart_rate, oxygen_saturation, temperature and the activity_levels steps are evenly spaced readings
+    sample_interval_seconds: int = Field(60, ge=1, le=86400)
+    start_time: Optional[datetime] = None  # Time of the first reading, for per-day figures
 
 class WearableDataResponse(BaseModel):
     summary: str
     insights: Optional[List[str]] = None  # Key health insights based on the data
+    metrics: Optional[dict] = None  # Per-metric statistics from wearable_analytics
+
+class WearableSeriesPoint(BaseModel):
+    time: datetime
+    value: Optional[float] = None  # raw readings
+    count: Optional[int] = None  # hourly / daily buckets
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+class WearableSeriesResponse(BaseModel):
+    metric: str
+    resolution: str  # "raw", "hour" or "day"
+    points: List[WearableSeriesPoint]
@@ -1,6 +1,6 @@
 from app.services.auth_service import authenticate_user, create_access_token, verify_access_token
-from app.services.email_service import send_email
-from app.services.sms_service import send_sms
+from app.services.email_service import send_email, send_many
+from app.services.sms_service import send_sms, send_sms_many
 from app.services.ai_services import analyze_symptoms
 from app.services.report_service import generate_health_report
 from app.services.telehealth_service import start_telehealth_session
@@ -10,7 +10,9 @@ __all__ = [
     "create_access_token",
     "verify_access_token",
     "send_email",
+    "send_many",
     "send_sms",
+    "send_sms_many",
     "analyze_symptoms",
     "generate_health_report",
     "start_telehealth_session",
@@ -1,17 +1,11 @@
-import openai
-from app.core.config import settings
 from app.crud.user import get_user
+from app.services.ai_provider import get_provider
 from sqlalchemy.ext.asyncio import AsyncSession
 
-openai_client = openai.AsyncClient(api_key=settings.OPENAI_API_KEY)
+USER_NOT_FOUND = "User not found. Please ensure you are logged in."
 
-async def generate_health_advice(user_id: int, user_message: str, db: AsyncSession):
-    """Generate AI-powered health advice based on user input and history."""
-
-    user = await get_user(db, user_id)
-    if not user:
-        return "User not found. Please ensure you are logged in."
 
+def _health_advice_messages(user, user_message: str) -> list[dict]:
     prompt = f"""
 You are an AI health assistant providing general wellness guidance.
 
@@ -28,12 +22,35 @@ Otherwise, offer concise, relevant health advice based on the symptom.
 
 Avoid vague emotional advice. Do not assume mental health context unless clearly asked.
 """
+    return [{"role": "system", "content": prompt}]
+
+
+async def generate_health_advice(user_id: int, user_message: str, db: AsyncSession):
+    """Generate AI-powered health advice based on user input and history."""
 
+    user = await get_user(db, user_id)
+    if not user:
+        return USER_NOT_FOUND
 
-    response = await openai_client.chat.completions.create(
+    return await get_provider().complete(
+        _health_advice_messages(user, user_message),
         model="gpt-4",
-        messages=[{"role": "system", "content": prompt}],
         temperature=0.7
     )
 
-    return response.choices[0].message.content.strip()
+
+async def _single(message: str):
+    yield message
+
+
+async def stream_health_advice(user_id: int, user_message: str, db: AsyncSession):
+    """
+    Stream the same advice as generate_health_advice, token by token. The user is
+    loaded up front so the returned iterator no longer needs the request session.
+    """
+
+    user = await get_user(db, user_id)
+    if not user:
+        return _single(USER_NOT_FOUND)
+
+    return get_provider().stream(_health_advice_messages(user, user_message), model="gpt-4", temperature=0.7)
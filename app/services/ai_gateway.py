@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.ai_provider import get_provider
+
+logger = logging.getLogger("ai_gateway")
+
+DEFAULT_MODEL = "gpt-4o"
+
+
+class MemoryCacheStore:
+    """Per-process store with TTL expiry and LRU eviction."""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: int):
+        self._cache.set(key, value, ttl=ttl)
+
+
+class RedisCacheStore:
+    """Store shared by every worker; Redis handles expiry (and LRU under maxmemory-policy)."""
+
+    def __init__(self, url: str):
+        from redis import asyncio as aioredis
+        self._redis = aioredis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"AI cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, value: str, ttl: int):
+        try:
+            await self._redis.set(key, value, ex=ttl)
+        except Exception as e:
+            logger.warning(f"AI cache write failed: {e}")
+
+
+def _create_store():
+    if settings.AI_CACHE_BACKEND == "redis":
+        return RedisCacheStore(settings.AI_CACHE_REDIS_URL)
+    return MemoryCacheStore(maxsize=settings.AI_CACHE_MAX_SIZE, ttl=settings.AI_CACHE_TTL_SECONDS)
+
+
+store = _create_store()
+_in_flight: dict[str, asyncio.Task] = {}
+
+
+def cache_key(model: str, system_prompt: str, prompt: str) -> str:
+    """Content address of a completion request."""
+    payload = json.dumps([model, system_prompt, prompt], ensure_ascii=False)
+    return "ai:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def cached_completion(
+    prompt: str,
+    system_prompt: str,
+    model: str = DEFAULT_MODEL,
+    ttl: Optional[int] = None,
+    refresh: bool = False,
+) -> str:
+    """
+    Return the completion text for a (model, system prompt, prompt) triple.
+
+    Answers are cached by content hash, and identical prompts already in flight
+    share one upstream request. Errors propagate and are never cached.
+    ``refresh`` skips the cached answer and replaces it with a new one.
+    """
+    key = cache_key(model, system_prompt, prompt)
+
+    if not refresh:
+        cached = await store.get(key)
+        if cached is not None:
+            return cached
+
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_complete_and_store(key, prompt, system_prompt, model, ttl))
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _forget(key, done))
+
+    # Shield so one cancelled caller doesn't cancel the request for the others
+    return await asyncio.shield(task)
+
+
+def _forget(key: str, task: asyncio.Task):
+    _in_flight.pop(key, None)
+    if not task.cancelled():
+        # Mark the exception as retrieved in case every waiter was cancelled
+        task.exception()
+
+
+async def _complete_and_store(key: str, prompt: str, system_prompt: str, model: str, ttl: Optional[int]) -> str:
+    content = await get_provider().complete(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        model=model,
+    )
+    await store.set(key, content, ttl or settings.AI_CACHE_TTL_SECONDS)
+    return content
+
+
+async def stream_cached_completion(
+    prompt: str,
+    system_prompt: str,
+    model: str = DEFAULT_MODEL,
+    ttl: Optional[int] = None,
+):
+    """
+    Streaming counterpart of cached_completion. A cache hit is yielded in one
+    piece; a stream that runs to completion is stored for later callers.
+    """
+    key = cache_key(model, system_prompt, prompt)
+
+    cached = await store.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    async for delta in get_provider().stream(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        model=model,
+    ):
+        parts.append(delta)
+        yield delta
+
+    await store.set(key, "".join(parts).strip(), ttl or settings.AI_CACHE_TTL_SECONDS)
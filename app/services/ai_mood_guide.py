@@ -1,5 +1,6 @@
-from openai import AsyncOpenAI
 from app.core.config import settings
+from app.services.ai_gateway import cached_completion
+import asyncio
 import logging
 import json
 import random
@@ -7,105 +8,123 @@ from collections import Counter, defaultdict
 from datetime import datetime
 
 logger = logging.getLogger("ai_services")
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+# Prompts that don't depend on the user; answered ahead of time by refresh_static_insights
+STATIC_PROMPTS = {
+    "Mental Health Forecast": "Stress may persist. Use daily mindful breathing to stay calm.",
+    "Action Plan": (
+        "Provide brief daily tasks for moods: "
+
+        "Anxious: Breathe 5 mins, short walk."
+
+        "Tired: Nap 20 mins, hydrate/stretch."
+
+        "Motivated: Set goal, start a delayed task."
+    ),
+    "Mood Summary": "Summarize mood in one line.",
+    "Resilience Score": "Rate resilience 1–5 with reason, in 15 words max.",
+    "Mood Prediction": "Mood stability improves with sleep. Aim for 7–9 hours nightly.",
+    "Time Mood Trends": "Best habits for the day: Morning: hydrate, meditate, set goals. Afternoon: walk, eat, review. Evening: unplug, reflect, prep.",
+    "Self-Compassion Tip": "Self-compassion: treat yourself like a friend. Suggest 1 tip.",
+}
+AI_FAILURE = "AI processing failed."
+
+_static_insights: dict[str, dict] = {}
+
+
+async def refresh_static_insights():
+    """Recompute every user-independent insight in one concurrent batch."""
+    results = await asyncio.gather(*(
+        ai_request(prompt, category, ttl=settings.MOOD_GUIDE_STATIC_REFRESH_SECONDS, refresh=True)
+        for category, prompt in STATIC_PROMPTS.items()
+    ))
+    for result in results:
+        if result["insight"] != AI_FAILURE:
+            _static_insights[result["category"]] = result
+
+
+async def keep_static_insights_fresh():
+    """Background loop started with the app: refresh static insights on a fixed interval."""
+    while True:
+        await refresh_static_insights()
+        await asyncio.sleep(settings.MOOD_GUIDE_STATIC_REFRESH_SECONDS)
+
+
+async def static_insight(category: str):
+    """Precomputed insight for a static prompt, computed on demand before the first refresh."""
+    cached = _static_insights.get(category)
+    if cached:
+        return cached
+    return await ai_request(STATIC_PROMPTS[category], category, ttl=settings.MOOD_GUIDE_STATIC_REFRESH_SECONDS)
+
 
 async def analyze_mental_health(user_input):
     """AI-driven mental health analysis (concise and categorized)."""
-    insights = []
-    recommendations = []
+    # (request, counts as a recommendation) in response order
+    planned = []
 
     if user_input.mood_logs and user_input.health_data:
         prompt = f"Moods: {user_input.mood_logs}\nHealth: {user_input.health_data}. Briefly connect them in under 20 words."
-        response = await ai_request(prompt, "Mood-Health Link")
-        insights.append(response)
-        recommendations.append(response["insight"])
+        planned.append((ai_request(prompt, "Mood-Health Link"), True))
 
     if user_input.mood_board:
         prompt = f"Mood board: {user_input.mood_board}. Describe tone in one concise sentence."
-        response = await ai_request(prompt, "Mood Board Summary")
-        insights.append(response)
-        recommendations.append(response["insight"])
+        planned.append((ai_request(prompt, "Mood Board Summary"), True))
 
     if user_input.mood_logs and user_input.health_data:
-        prompt = "Stress may persist. Use daily mindful breathing to stay calm."
-        response = await ai_request(prompt, "Mental Health Forecast")
-        insights.append(response)
-        recommendations.append(response["insight"])
+        planned.append((static_insight("Mental Health Forecast"), True))
 
     if user_input.mood_logs:
-        prompt = (
-            "Provide brief daily tasks for moods: "
-
-            "Anxious: Breathe 5 mins, short walk."
-
-            "Tired: Nap 20 mins, hydrate/stretch."
-
-            "Motivated: Set goal, start a delayed task."
-        )
-        response = await ai_request(prompt, "Action Plan")
-        insights.append(response)
-        recommendations.append(response["insight"])
+        planned.append((static_insight("Action Plan"), True))
 
     if user_input.social_interactions:
         prompt = f"Social logs: {user_input.social_interactions}. Which interaction likely helped mood most? Answer in one line."
-        response = await ai_request(prompt, "Social Check-In")
-        insights.append(response)
-        recommendations.append(response["insight"])
+        planned.append((ai_request(prompt, "Social Check-In"), True))
 
     if user_input.goals_progress:
         prompt = f"Goal progress: {user_input.goals_progress}. Suggest a small improvement in one line."
-        response = await ai_request(prompt, "Goal Feedback")
-        insights.append(response)
-        recommendations.append(response["insight"])
+        planned.append((ai_request(prompt, "Goal Feedback"), True))
 
-    insights.append(await ai_request("Summarize mood in one line.", "Mood Summary"))
+    planned.append((static_insight("Mood Summary"), False))
 
     if user_input.mood_logs:
         feeling = random.choice(user_input.mood_logs)
         prompt = f"Feeling {feeling}. Suggest one media/content to lift mood."
-        response = await ai_request(prompt, "Support Content")
-        insights.append(response)
-        recommendations.append(response["insight"])
+        planned.append((ai_request(prompt, "Support Content"), True))
 
-    response = await ai_request("Rate resilience 1–5 with reason, in 15 words max.", "Resilience Score")
-    insights.append(response)
-    recommendations.append(response["insight"])
+    for category in ("Resilience Score", "Mood Prediction", "Time Mood Trends", "Self-Compassion Tip"):
+        planned.append((static_insight(category), True))
 
-    response = await ai_request("Mood stability improves with sleep. Aim for 7–9 hours nightly.", "Mood Prediction")
-    insights.append(response)
-    recommendations.append(response["insight"])
+    limiter = asyncio.Semaphore(settings.MOOD_GUIDE_CONCURRENCY)
 
-    response = await ai_request(
-        "Best habits for the day: Morning: hydrate, meditate, set goals. Afternoon: walk, eat, review. Evening: unplug, reflect, prep.",
-        "Time Mood Trends"
-    )
-    insights.append(response)
-    recommendations.append(response["insight"])
+    async def bounded(request):
+        async with limiter:
+            return await request
 
-    response = await ai_request("Self-compassion: treat yourself like a friend. Suggest 1 tip.", "Self-Compassion Tip")
-    insights.append(response)
-    recommendations.append(response["insight"])
+    insights = await asyncio.gather(*(bounded(request) for request, _ in planned))
+    recommendations = [
+        insight["insight"] for insight, (_, is_recommendation) in zip(insights, planned) if is_recommendation
+    ]
 
     return {
         "user_id": user_input.user_id,
-        "insights": insights,
+        "insights": list(insights),
         "recommendations": recommendations
     }
 
-async def ai_request(prompt: str, category: str):
+async def ai_request(prompt: str, category: str, ttl: int = None, refresh: bool = False):
     """Send simplified prompt to OpenAI."""
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a concise mental health AI. Respond briefly and to the point. No emojis."},
-                {"role": "user", "content": prompt}
-            ]
+        insight = await cached_completion(
+            prompt,
+            "You are a concise mental health AI. Respond briefly and to the point. No emojis.",
+            ttl=ttl,
+            refresh=refresh
         )
-        return {"category": category, "insight": response.choices[0].message.content.strip()}
+        return {"category": category, "insight": insight}
     except Exception as e:
         logger.error(f"AI error in {category}: {str(e)}")
-        return {"category": category, "insight": "AI processing failed."}
+        return {"category": category, "insight": AI_FAILURE}
 
 async def get_time_of_day(hour: int) -> str:
     if 5 <= hour < 12:
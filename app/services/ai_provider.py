@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import weakref
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+import httpx
+import openai
+from openai import AsyncOpenAI
+from app.core.config import settings
+from app.services.ai_scheduler import scheduler, estimate_tokens
+
+logger = logging.getLogger("ai_provider")
+
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    cap = min(settings.AI_RETRY_MAX_DELAY_SECONDS, settings.AI_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+class AIProvider(ABC):
+    """Chat completion backend shared by every AI service."""
+
+    async def _admit(self, messages: list[dict]) -> int:
+        """Wait for rate-limit budget (see ai_scheduler); returns the token estimate charged."""
+        estimated_tokens = estimate_tokens(messages)
+        await scheduler.acquire(estimated_tokens)
+        return estimated_tokens
+
+    @abstractmethod
+    async def complete(self, messages: list[dict], model: str, **params) -> str:
+        """The completion's text."""
+
+    @abstractmethod
+    def stream(self, messages: list[dict], model: str, **params) -> AsyncIterator[str]:
+        """Yield the completion's content deltas."""
+
+    async def close(self):
+        """Release what the provider holds for the running event loop, before it closes."""
+
+
+class _LoopState:
+    """Client and per-model limits for one event loop (Celery tasks run their own loops)."""
+
+    def __init__(self):
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,  # retries are handled here, with jitter
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.AI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.AI_MAX_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(
+                    settings.AI_REQUEST_TIMEOUT_SECONDS,
+                    connect=settings.AI_CONNECT_TIMEOUT_SECONDS,
+                ),
+            ),
+        )
+        self.limits: dict[str, asyncio.Semaphore] = {}
+
+    def limit(self, model: str) -> asyncio.Semaphore:
+        if model not in self.limits:
+            size = settings.AI_MODEL_CONCURRENCY.get(model, settings.AI_DEFAULT_MODEL_CONCURRENCY)
+            self.limits[model] = asyncio.Semaphore(size)
+        return self.limits[model]
+
+
+class OpenAIProvider(AIProvider):
+    """OpenAI over one pooled HTTP client, with per-model concurrency limits and retries."""
+
+    def __init__(self):
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        return state
+
+    async def close(self):
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.close()
+
+    async def complete(self, messages: list[dict], model: str, **params) -> str:
+        state = self._state()
+        for attempt in range(settings.AI_MAX_RETRIES + 1):
+            # Budget first, so a queued request never sits on a model slot
+            estimated_tokens = await self._admit(messages)
+            try:
+                async with state.limit(model):
+                    response = await state.client.chat.completions.create(
+                        model=model, messages=messages, **params
+                    )
+                await scheduler.reconcile(estimated_tokens, response.usage.total_tokens if response.usage else 0)
+                return response.choices[0].message.content.strip()
+            except RETRYABLE_ERRORS as e:
+                if attempt == settings.AI_MAX_RETRIES:
+                    raise
+                delay = retry_delay(attempt)
+                logger.warning(f"{model} request failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def stream(self, messages: list[dict], model: str, **params) -> AsyncIterator[str]:
+        """Yield content deltas. Retries only happen before the first delta is sent."""
+        state = self._state()
+        limit = state.limit(model)
+        for attempt in range(settings.AI_MAX_RETRIES + 1):
+            estimated_tokens = await self._admit(messages)
+            await limit.acquire()
+            try:
+                upstream = await state.client.chat.completions.create(
+                    model=model, messages=messages, stream=True, **params
+                )
+                break
+            except RETRYABLE_ERRORS as e:
+                limit.release()
+                if attempt == settings.AI_MAX_RETRIES:
+                    raise
+                delay = retry_delay(attempt)
+                logger.warning(f"{model} stream failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            except BaseException:
+                limit.release()
+                raise
+
+        streamed_chars = 0
+        try:
+            async for chunk in upstream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    streamed_chars += len(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+        finally:
+            limit.release()
+            await upstream.close()
+            prompt_tokens = estimated_tokens - settings.AI_ESTIMATED_COMPLETION_TOKENS
+            await scheduler.reconcile(estimated_tokens, prompt_tokens + streamed_chars // 4)
+
+
+class LocalProvider(AIProvider):
+    """
+    Deterministic stand-in for load tests: no network, the same messages always
+    produce the same answer. Prompts asking for JSON get a JSON object.
+    """
+
+    def _answer(self, messages: list[dict], model: str) -> str:
+        digest = hashlib.sha256(json.dumps([model, messages], sort_keys=True).encode()).hexdigest()[:12]
+        if "json" in messages[-1]["content"].lower():
+            return json.dumps({
+                "conditions": ["stand-in condition"],
+                "urgency_level": "low",
+                "next_steps": ["stand-in next step"],
+                "emergency_type": "unknown",
+                "action": "Stand-in action.",
+                "id": digest,
+            })
+        return f"Stand-in {model} response {digest}."
+
+    async def complete(self, messages: list[dict], model: str, **params) -> str:
+        await self._admit(messages)
+        if settings.AI_LOCAL_LATENCY_MS:
+            await asyncio.sleep(settings.AI_LOCAL_LATENCY_MS / 1000)
+        return self._answer(messages, model)
+
+    async def stream(self, messages: list[dict], model: str, **params) -> AsyncIterator[str]:
+        await self._admit(messages)
+        words = self._answer(messages, model).split(" ")
+        for i, word in enumerate(words):
+            if settings.AI_LOCAL_LATENCY_MS:
+                await asyncio.sleep(settings.AI_LOCAL_LATENCY_MS / 1000 / len(words))
+            yield word if i == 0 else " " + word
+
+
+_provider: AIProvider = None
+
+
+def get_provider() -> AIProvider:
+    """The process-wide provider selected by AI_PROVIDER."""
+    global _provider
+    if _provider is None:
+        _provider = LocalProvider() if settings.AI_PROVIDER == "local" else OpenAIProvider()
+    return _provider
+
+
+async def close_provider():
+    """Close the provider's HTTP client for the running event loop, if one was opened."""
+    if _provider is not None:
+        await _provider.close()
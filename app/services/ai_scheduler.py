@@ -0,0 +1,280 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from contextlib import contextmanager
+from enum import IntEnum
+from app.core.config import settings
+
+logger = logging.getLogger("ai_scheduler")
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class AIOverloadedError(Exception):
+    """Raised when an LLM request is shed instead of queued."""
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar("ai_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def batch_priority():
+    """Mark LLM calls made inside this block (and tasks it spawns) as batch traffic."""
+    token = _priority.set(Priority.BATCH)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Rough prompt size (~4 characters per token) plus the expected completion."""
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // 4 + settings.AI_ESTIMATED_COMPLETION_TOKENS
+
+
+class TokenBucket:
+    """Refills continuously at ``per_minute``; holds at most one minute of budget."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken while leaving ``reserve`` behind."""
+        self._refill()
+        # A request bigger than the whole bucket is let through once it is full
+        needed = min(amount + reserve, self.capacity) - self.tokens
+        return max(needed / self.rate, 0.0)
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= amount  # may go negative; later requests wait off the debt
+
+
+class LocalBudget:
+    """
+    Request and token buckets in this process. Each of AI_RATE_LIMIT_WORKERS
+    processes gets an equal share of the limits, so together they stay within them.
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    async def take(self, estimated_tokens: int, reserve: float) -> float:
+        """
+        Take one request and ``estimated_tokens`` if both buckets would keep
+        ``reserve`` (a share of capacity) behind; otherwise take nothing and
+        return the seconds to wait before trying again.
+        """
+        wait = max(
+            self.requests.wait_time(1, reserve * self.requests.capacity),
+            self.tokens.wait_time(estimated_tokens, reserve * self.tokens.capacity),
+        )
+        if wait <= 0:
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+        return wait
+
+    async def adjust(self, tokens: int):
+        self.tokens.consume(tokens)
+
+
+# Same refill/take arithmetic as TokenBucket, on hashes shared by every worker.
+# KEYS: request bucket, token bucket. ARGV: rpm, tpm, tokens to take, reserve share.
+_TAKE_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local amounts = {1, tonumber(ARGV[3])}
+local levels, wait = {}, 0
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[i])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    levels[i] = math.min(capacity, tokens + (now - updated) * capacity / 60)
+    local needed = math.min(amounts[i] + tonumber(ARGV[4]) * capacity, capacity) - levels[i]
+    wait = math.max(wait, needed * 60 / capacity)
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i = 1, 2 do
+    redis.call('HSET', KEYS[i], 'tokens', tostring(levels[i] - amounts[i]), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[i], 120)
+end
+return '0'
+"""
+
+# KEYS: token bucket. ARGV: tpm, tokens to take (negative gives them back).
+_ADJUST_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+local level = math.min(capacity, tokens + (now - updated) * capacity / 60)
+redis.call('HSET', KEYS[1], 'tokens', tostring(level - tonumber(ARGV[2])), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], 120)
+return 0
+"""
+
+
+class RedisBudget:
+    """
+    Request and token buckets kept in Redis, so the limits hold across every
+    API and Celery worker. Taking from both buckets is one atomic script. If
+    Redis can't be reached, the process falls back to its LocalBudget share.
+    """
+
+    def __init__(self, url: str, rpm: float, tpm: float, fallback: LocalBudget, prefix: str = "ai_budget:"):
+        self._url = url
+        self.rpm = float(rpm)
+        self.tpm = float(tpm)
+        self.fallback = fallback
+        self._keys = [f"{prefix}requests", f"{prefix}tokens"]
+        self._clients = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        from redis import asyncio as aioredis
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = aioredis.from_url(self._url, decode_responses=True)
+        return client
+
+    async def take(self, estimated_tokens: int, reserve: float) -> float:
+        try:
+            wait = await self._client().eval(
+                _TAKE_SCRIPT, 2, *self._keys, self.rpm, self.tpm, estimated_tokens, reserve
+            )
+            return float(wait)
+        except Exception as e:
+            logger.warning(f"Shared LLM budget unavailable, using this worker's share: {e}")
+            return await self.fallback.take(estimated_tokens, reserve)
+
+    async def adjust(self, tokens: int):
+        try:
+            await self._client().eval(_ADJUST_SCRIPT, 1, self._keys[1], self.tpm, tokens)
+        except Exception as e:
+            logger.warning(f"Shared LLM budget unavailable, using this worker's share: {e}")
+            await self.fallback.adjust(tokens)
+
+
+class LLMScheduler:
+    """
+    Admission control for outbound LLM calls: requests-per-minute and
+    tokens-per-minute budgets (``budget``, a LocalBudget or RedisBudget),
+    interactive requests served ahead of batch ones, and load shed once this
+    process's queue is full. Batch traffic may only spend AI_BATCH_BUDGET_SHARE
+    of each budget so interactive calls keep headroom.
+    """
+
+    def __init__(self, budget, batch_share: float, max_queued: int):
+        self.budget = budget
+        self.batch_share = batch_share
+        self.max_queued = max_queued
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._wakeup: asyncio.Event = None
+        self._dispatcher: asyncio.Task = None
+        self._loop = None
+
+    def _ensure_dispatcher(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # New event loop (e.g. a fresh Celery task): queued state from the old one is gone
+            self._loop = loop
+            self._waiters = []
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def acquire(self, estimated_tokens: int):
+        """Wait for budget for one request; raises AIOverloadedError if it is shed."""
+        priority = _priority.get()
+        self._ensure_dispatcher()
+
+        if len(self._waiters) >= self.max_queued:
+            raise AIOverloadedError("LLM request queue is full")
+
+        future = self._loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), estimated_tokens, future))
+        self._wakeup.set()
+
+        timeout = settings.AI_INTERACTIVE_QUEUE_TIMEOUT_SECONDS if priority == Priority.INTERACTIVE else None
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise AIOverloadedError("Timed out waiting for LLM capacity")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    async def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token budget once the real usage is known."""
+        if actual_tokens:
+            await self.budget.adjust(actual_tokens - estimated_tokens)
+
+    async def _dispatch(self):
+        while True:
+            while self._waiters and self._waiters[0][3].done():
+                heapq.heappop(self._waiters)  # cancelled or timed out
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            waiter = self._waiters[0]
+            priority, _, estimated_tokens, future = waiter
+            reserve = 1.0 - self.batch_share if priority == Priority.BATCH else 0.0
+            wait = await self.budget.take(estimated_tokens, reserve)
+            if wait > 0:
+                # Re-check early if something new (possibly higher priority) arrives
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # The heap may have changed while a shared budget was consulted
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+            if not future.done():
+                future.set_result(None)
+
+
+def _create_budget():
+    workers = max(settings.AI_RATE_LIMIT_WORKERS, 1)
+    local = LocalBudget(settings.AI_RPM_LIMIT / workers, settings.AI_TPM_LIMIT / workers)
+    if settings.AI_RATE_LIMIT_BACKEND == "redis":
+        return RedisBudget(settings.AI_RATE_LIMIT_REDIS_URL, settings.AI_RPM_LIMIT, settings.AI_TPM_LIMIT, local)
+    return local
+
+
+scheduler = LLMScheduler(
+    budget=_create_budget(),
+    batch_share=settings.AI_BATCH_BUDGET_SHARE,
+    max_queued=settings.AI_MAX_QUEUED_REQUESTS,
+)
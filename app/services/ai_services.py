@@ -1,7 +1,5 @@
-import openai
-from openai import AsyncOpenAI
-from app.core.config import settings
 from app.db.session import SessionLocal
+from app.services.ai_gateway import cached_completion, stream_cached_completion
 from app.crud.health_diary import get_health_diaries, get_latest_entry
 from app.crud.medication import get_medications, get_today_medications
 import logging
@@ -11,32 +9,23 @@ from typing import Dict
 from datetime import datetime, timedelta
 
 logger = logging.getLogger("ai_services")
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
-async def analyze_symptoms(user_id: int):
+# Prompt builders return (prompt, system prompt), or a plain message when there's nothing to analyze
+
+async def _symptom_analysis_request(user_id: int):
     async with SessionLocal() as db:
         health_entries = await get_health_diaries(db, user_id)
 
     if not health_entries:
         return "No recent health entries found."
 
-    symptom_text = ", ".join(entry.symptoms for entry in health_entries[-5:])
+    # Newest first; the five most recent, oldest of them first
+    recent = reversed(health_entries[:5])
+    symptom_text = ", ".join(symptom for entry in recent for symptom in entry.symptoms or [])
     prompt = f"User reported symptoms: {symptom_text}. Give a brief, direct insight."
+    return prompt, "You are a concise medical AI assistant."
 
-    try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a concise medical AI assistant."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        logger.error(f"Symptom analysis error: {str(e)}")
-        return "Error in symptom analysis."
-
-async def get_personalized_health_tips(user_id: int):
+async def _health_tips_request(user_id: int):
     async with SessionLocal() as db:
         medications = await get_medications(db, user_id)
 
@@ -45,43 +34,80 @@ async def get_personalized_health_tips(user_id: int):
 
     med_text = ", ".join(f"{med.name} ({med.dosage})" for med in medications)
     prompt = f"User is taking: {med_text}. Give short, relevant daily health tips."
+    return prompt, "You give short health tips."
 
-    try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You give short health tips."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        logger.error(f"Health tips error: {str(e)}")
-        return "Error generating health tips."
-
-async def detect_health_patterns(user_id: int):
+async def _health_patterns_request(user_id: int):
     async with SessionLocal() as db:
         entries = await get_health_diaries(db, user_id)
 
     if not entries or len(entries) < 2:
         return "Not enough data."
 
+    entries = entries[::-1]  # chronological
     symptoms_log = ", ".join(f"{e.date}: {e.symptoms}" for e in entries)
     prompt = f"Symptoms log: {symptoms_log}. Briefly mention any detected pattern."
+    return prompt, "You detect patterns in symptom logs."
+
+async def _health_education_request(topics: list):
+    if not topics:
+        return "No topics provided."
+
+    prompt = f"Give short, practical education tips about: {', '.join(topics)}."
+    return prompt, "You give clear health education summaries."
+
+async def _stream(request):
+    """Yield a built request's completion as it streams (a plain message is yielded as-is)."""
+    if isinstance(request, str):
+        yield request
+        return
+    async for delta in stream_cached_completion(*request):
+        yield delta
+
+async def analyze_symptoms(user_id: int):
+    request = await _symptom_analysis_request(user_id)
+    if isinstance(request, str):
+        return request
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You detect patterns in symptom logs."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message.content.strip()
+        return await cached_completion(*request)
+    except Exception as e:
+        logger.error(f"Symptom analysis error: {str(e)}")
+        return "Error in symptom analysis."
+
+async def stream_symptom_analysis(user_id: int):
+    async for delta in _stream(await _symptom_analysis_request(user_id)):
+        yield delta
+
+async def get_personalized_health_tips(user_id: int):
+    request = await _health_tips_request(user_id)
+    if isinstance(request, str):
+        return request
+
+    try:
+        return await cached_completion(*request)
+    except Exception as e:
+        logger.error(f"Health tips error: {str(e)}")
+        return "Error generating health tips."
+
+async def stream_health_tips(user_id: int):
+    async for delta in _stream(await _health_tips_request(user_id)):
+        yield delta
+
+async def detect_health_patterns(user_id: int):
+    request = await _health_patterns_request(user_id)
+    if isinstance(request, str):
+        return request
+
+    try:
+        return await cached_completion(*request)
     except Exception as e:
         logger.error(f"Pattern detection error: {str(e)}")
         return "Pattern analysis error."
 
+async def stream_health_patterns(user_id: int):
+    async for delta in _stream(await _health_patterns_request(user_id)):
+        yield delta
+
 async def analyze_symptom_checker(user_id: int, symptoms: list):
     if not symptoms:
         return {"error": "No symptoms provided."}
@@ -89,50 +115,33 @@ async def analyze_symptom_checker(user_id: int, symptoms: list):
     prompt = f"Symptoms: {', '.join(symptoms)}. Return JSON with possible conditions, urgency (low/moderate/high/emergency), and next steps."
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a triage AI assistant."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        text = re.sub(r"```json|```", "", response.choices[0].message.content.strip())
+        content = await cached_completion(prompt, "You are a triage AI assistant.")
+        text = re.sub(r"```json|```", "", content)
         return json.loads(text)
     except Exception as e:
         logger.error(f"Symptom checker error: {str(e)}")
         return {"error": "Symptom checker failed."}
 
 async def generate_health_education(user_id: int, topics: list):
-    if not topics:
-        return "No topics provided."
-
-    prompt = f"Give short, practical education tips about: {', '.join(topics)}."
+    request = await _health_education_request(topics)
+    if isinstance(request, str):
+        return request
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You give clear health education summaries."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message.content.strip()
+        return await cached_completion(*request)
     except Exception as e:
         logger.error(f"Education generation error: {str(e)}")
         return "Education generation failed."
 
+async def stream_health_education(user_id: int, topics: list):
+    async for delta in _stream(await _health_education_request(topics)):
+        yield delta
+
 async def analyze_test_results(test_type: str, test_results: Dict) -> str:
     prompt = f"Test: {test_type}. Results: {json.dumps(test_results)}. Give a short insight and next step."
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You provide short, relevant diagnostic insights."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message.content.strip()
+        return await cached_completion(prompt, "You provide short, relevant diagnostic insights.")
     except Exception as e:
         logger.error(f"Test analysis error: {str(e)}")
         return "Test analysis failed."
@@ -176,14 +185,8 @@ async def analyze_chronic_health_data(condition, blood_pressure, blood_sugar, he
     prompt = f"User with {condition}. BP: {bp}, Sugar: {sugar}, HR: {hr}, Weight: {wt}, Meds: {meds}. Give short bullet-point insights."
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You summarize chronic health data simply."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        insights = response.choices[0].message.content.strip().split("\n")
+        content = await cached_completion(prompt, "You summarize chronic health data simply.")
+        insights = content.split("\n")
         return [i.strip("-• ").strip() for i in insights if i.strip()]
     except Exception as e:
         logger.error(f"Chronic data analysis error: {str(e)}")
@@ -193,14 +196,8 @@ async def classify_emergency_type(description: str) -> tuple[str, str]:
     prompt = f"Classify: '{description}'. Type: mental health / medical / domestic violence / unknown. Give 1-line action. Return JSON."
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an emergency classifier AI."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        raw = re.sub(r"```json|```", "", response.choices[0].message.content.strip())
+        content = await cached_completion(prompt, "You are an emergency classifier AI.")
+        raw = re.sub(r"```json|```", "", content)
         data = json.loads(raw)
         return data.get("emergency_type", "unknown"), data.get("action", "Stay calm and contact emergency services.")
     except Exception as e:
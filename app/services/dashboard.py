@@ -1,18 +1,73 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models.health_diary import HealthDiary
+from app.db.models.medication import Medication
+from app.db.models.appointments import Appointment
+from app.db.models.notifications import Notification
+from app.db.models.subscription import Subscription
+from app.db.models.user import User
 from app.crud.health_diary import get_latest_entry
 from app.crud.medication import get_today_medications as get_pending_medications
 from app.crud.appointment import get_upcoming_appointments
-from app.crud.notification import get_notifications
-from app.services.ai_services import detect_health_patterns
+from app.crud.notification import get_notification_summary
 from app.crud.subscription import get_user_subscription_status
 
-async def build_user_dashboard(db: AsyncSession, user_id: int):
-    mood_entry = await get_latest_entry(db, user_id)
-    medications = await get_pending_medications(db, user_id)
-    appointments = await get_upcoming_appointments(db, user_id)
-    alerts = await get_notifications(db, user_id)
-    ai_insights = await detect_health_patterns(user_id)
-    subscription = await get_user_subscription_status(db, user_id)
+
+async def get_dashboard_version(db, user_id: int) -> tuple:
+    """
+    Cheap fingerprint of the dashboard's DB sections: row count and latest
+    updated_at (or id) per section, with the same filters as the section
+    queries, read in one round trip. It changes whenever a section would.
+    """
+    now = datetime.utcnow()
+    today = now.date()
+    sections = (
+        (HealthDiary, HealthDiary.updated_at, (HealthDiary.user_id == user_id,)),
+        (Medication, Medication.updated_at, (
+            Medication.user_id == user_id,
+            Medication.start_date <= today,
+            (Medication.end_date == None) | (Medication.end_date >= today),
+        )),
+        (Appointment, Appointment.updated_at, (Appointment.user_id == user_id, Appointment.date >= now)),
+        (Notification, Notification.id, (Notification.user_id == user_id,)),
+        (Subscription, Subscription.updated_at, (Subscription.user_id == user_id,)),
+    )
+    probes = []
+    for model, latest, where in sections:
+        probes.append(select(func.count()).select_from(model).where(*where).scalar_subquery())
+        probes.append(select(func.max(latest)).where(*where).scalar_subquery())
+    # Marking notifications read changes no row count, only this counter
+    probes.append(select(User.unread_notifications).where(User.id == user_id).scalar_subquery())
+
+    result = await db.execute(select(*probes))
+    return tuple(result.one())
+
+
+async def _fetch_section(session_factory, limit: asyncio.Semaphore, fetch, user_id: int):
+    """Run one dashboard query on its own session, at most ``limit`` at a time."""
+    async with limit:
+        async with session_factory() as db:
+            return await fetch(db, user_id)
+
+
+async def build_user_dashboard(user_id: int, ai_insights=None, session_factory=SessionLocal):
+    """
+    Assemble the dashboard. DB sections are fetched concurrently on their own
+    sessions, at most DASHBOARD_MAX_SESSIONS at a time so one request can't
+    drain the pool; ``ai_insights`` comes from the insight cache.
+    """
+    limit = asyncio.Semaphore(settings.DASHBOARD_MAX_SESSIONS)
+    mood_entry, medications, appointments, alerts, subscription = await asyncio.gather(
+        _fetch_section(session_factory, limit, get_latest_entry, user_id),
+        _fetch_section(session_factory, limit, get_pending_medications, user_id),
+        _fetch_section(session_factory, limit, get_upcoming_appointments, user_id),
+        _fetch_section(session_factory, limit, get_notification_summary, user_id),
+        _fetch_section(session_factory, limit, get_user_subscription_status, user_id),
+    )
 
     return {
         "latest_mood": mood_entry,
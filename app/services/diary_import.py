@@ -0,0 +1,193 @@
+import codecs
+import csv
+import json
+import logging
+from datetime import timezone
+from typing import AsyncIterator, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.health_diary import HealthDiary
+from app.schemas.health_diary import HealthDiaryImportRow
+from app.services.insight_cache import invalidate_dashboard_insight
+
+logger = logging.getLogger("diary_import")
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Decode an upload incrementally into lines; only the current partial line is
+    buffered. A line longer than DIARY_IMPORT_MAX_LINE_LENGTH is yielded as None
+    and the rest of it is skipped, so the buffer stays bounded.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    limit = settings.DIARY_IMPORT_MAX_LINE_LENGTH
+    pending, skipping = "", False
+    async for chunk in chunks:
+        *complete, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in complete:
+            if skipping:
+                skipping = False  # the end of an oversized line, already reported
+                continue
+            yield None if len(line) > limit else line.rstrip("\r")
+        if len(pending) > limit:
+            if not skipping:
+                yield None
+            pending, skipping = "", True
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        yield None if len(pending) > limit else pending.rstrip("\r")
+
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]):
+    """Yield (line number, dict or error message) for each non-blank line."""
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if line is None:
+            yield line_no, "Line too long"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"Invalid JSON: {e.msg}"
+            continue
+        yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def _csv_symptoms(value: str):
+    value = (value or "").strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [s.strip() for s in value.split(";") if s.strip()]
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]):
+    """
+    Yield (line number, dict or error message) per CSV record. The header row
+    names the columns (date, mood, symptoms, notes); symptoms are ';'-separated
+    or a JSON list. Records over DIARY_IMPORT_MAX_RECORD_LENGTH are rejected
+    and skipped without being buffered.
+    """
+    header = None
+    record_lines, length, quotes, start_line, line_no = [], 0, 0, 0, 0
+    skipping = False  # inside a record already rejected as too long
+    async for line in _lines(chunks):
+        line_no += 1
+        if line is None:
+            # Its quotes are unknown, so whatever record it belonged to is dropped
+            if not skipping:
+                yield start_line if record_lines else line_no, "Line too long"
+            if header is None:
+                return
+            record_lines, length, quotes, skipping = [], 0, 0, False
+            continue
+        if not record_lines and not skipping:
+            start_line = line_no
+        length += len(line) + 1
+        quotes += line.count('"')
+        if skipping or length > settings.DIARY_IMPORT_MAX_RECORD_LENGTH:
+            if not skipping:
+                yield start_line, "Record too long"
+                if header is None:
+                    return
+                record_lines, skipping = [], True
+            if quotes % 2 == 0:
+                length, quotes, skipping = 0, 0, False  # the end of the oversized record
+            continue
+        record_lines.append(line)
+        if quotes % 2:
+            continue  # a quoted field spans lines; wait for the rest of the record
+        text = "\n".join(record_lines)
+        record_lines, length, quotes = [], 0, 0
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [column.strip().lower() for column in values]
+            missing = {"date", "mood"} - set(header)
+            if missing:
+                yield start_line, f"Missing CSV columns: {', '.join(sorted(missing))}"
+                return
+            continue
+        if len(values) != len(header):
+            yield start_line, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+
+        record = dict(zip(header, values))
+        try:
+            record["symptoms"] = _csv_symptoms(record.get("symptoms"))
+        except json.JSONDecodeError:
+            yield start_line, "Invalid symptoms list"
+            continue
+        record["notes"] = record.get("notes") or None
+        yield start_line, record
+
+    if record_lines:
+        yield start_line, "Unterminated quoted field"
+
+
+async def import_health_diary(
+    db: AsyncSession,
+    user_id: int,
+    chunks: AsyncIterator[bytes],
+    fmt: str = "ndjson",
+) -> dict:
+    """
+    Stream an NDJSON or CSV upload into ``user_id``'s health diary.
+
+    Rows are validated as they arrive and inserted in multi-row batches of
+    DIARY_IMPORT_BATCH_SIZE, all in one transaction committed at the end.
+    Invalid rows are skipped and reported (the first DIARY_IMPORT_MAX_ERRORS
+    of them); memory use does not grow with the size of the upload.
+    """
+    records = _csv_records(chunks) if fmt == "csv" else _ndjson_records(chunks)
+    batch, imported, failed, errors = [], 0, 0, []
+
+    def reject(line_no: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.DIARY_IMPORT_MAX_ERRORS:
+            errors.append({"line": line_no, "error": message})
+
+    try:
+        async for line_no, record in records:
+            if isinstance(record, str):
+                reject(line_no, record)
+                continue
+            try:
+                row = HealthDiaryImportRow(**record)
+            except ValidationError as e:
+                reject(line_no, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                continue
+
+            entry_date = row.date
+            if entry_date.tzinfo is not None:
+                entry_date = entry_date.astimezone(timezone.utc).replace(tzinfo=None)
+            batch.append({
+                "user_id": user_id,
+                "date": entry_date,
+                "symptoms": row.symptoms,
+                "mood": row.mood,
+                "notes": row.notes,
+            })
+            if len(batch) >= settings.DIARY_IMPORT_BATCH_SIZE:
+                await db.execute(insert(HealthDiary), batch)
+                imported += len(batch)
+                batch = []
+
+        if batch:
+            await db.execute(insert(HealthDiary), batch)
+            imported += len(batch)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    if imported:
+        invalidate_dashboard_insight(user_id)
+    logger.info(f"Imported {imported} diary entries for user {user_id}, {failed} rejected")
+    return {"imported": imported, "failed": failed, "errors": errors}
@@ -1,27 +1,143 @@
+import asyncio
+import queue
 import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Iterable, List, Tuple
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger("email_service")
 
+
+def _build_message(recipient: str, subject: str, body: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg['From'] = settings.EMAIL_USERNAME
+    msg['To'] = recipient
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+class _PooledConnection:
+    def __init__(self):
+        self.smtp = smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT, timeout=settings.EMAIL_TIMEOUT_SECONDS)
+        if settings.EMAIL_USE_TLS:
+            self.smtp.starttls()
+        if settings.EMAIL_PASSWORD:
+            self.smtp.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
+        self.opened_at = time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.opened_at > settings.EMAIL_CONNECTION_MAX_AGE_SECONDS
+
+    def close(self):
+        try:
+            self.smtp.quit()
+        except smtplib.SMTPException:
+            self.smtp.close()
+        except OSError:
+            pass
+
+
+class SMTPPool:
+    """
+    Authenticated SMTP connections reused across messages. All socket work runs
+    on a dedicated thread pool, one connection per thread at a time, so the
+    event loop never blocks on SMTP.
+    """
+
+    def __init__(self, size: int):
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="smtp")
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return _PooledConnection()
+            if not conn.expired:
+                return conn
+            conn.close()
+
+    def _send_batch(self, messages: List[MIMEMultipart]) -> List[bool]:
+        """Send messages back to back over one connection (runs in a worker thread)."""
+        results = []
+        conn = None
+        for msg in messages:
+            for attempt in range(2):
+                try:
+                    if conn is None:
+                        conn = self._checkout()
+                    conn.smtp.sendmail(settings.EMAIL_USERNAME, msg['To'], msg.as_string())
+                    results.append(True)
+                    break
+                except (smtplib.SMTPServerDisconnected, OSError) as e:
+                    # Stale or dropped connection: reconnect once for this message
+                    if conn is not None:
+                        conn.close()
+                        conn = None
+                    if attempt == 1:
+                        logger.error(f"Failed to send email to {msg['To']}: {e}")
+                        results.append(False)
+                except smtplib.SMTPException as e:
+                    # Rejected message; the connection is still usable
+                    logger.error(f"Failed to send email to {msg['To']}: {e}")
+                    results.append(False)
+                    break
+        if conn is not None:
+            self._idle.put(conn)
+        return results
+
+    async def send_batch(self, messages: List[MIMEMultipart]) -> List[bool]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._send_batch, messages)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+smtp_pool = SMTPPool(settings.EMAIL_POOL_SIZE)
+
+
 async def send_email(recipient: str, subject: str, body: str):
     """Send an email notification to a user."""
     try:
-        msg = MIMEMultipart()
-        msg['From'] = settings.EMAIL_USERNAME
-        msg['To'] = recipient
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'plain'))
-
-        server = smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT)
-        server.starttls()
-        server.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
-        server.sendmail(settings.EMAIL_USERNAME, recipient, msg.as_string())
-        server.quit()
-        logger.info(f"Email sent successfully to {recipient}")
-        return await True
+        [sent] = await smtp_pool.send_batch([_build_message(recipient, subject, body)])
     except Exception as e:
         logger.error(f"Failed to send email to {recipient}: {e}")
-        return await False
+        return False
+    if sent:
+        logger.info(f"Email sent successfully to {recipient}")
+    return sent
+
+
+async def send_many(messages: Iterable[Tuple[str, str, str]]) -> List[bool]:
+    """
+    Send many (recipient, subject, body) emails. Messages are split into
+    batches of EMAIL_BATCH_SIZE, each sent over one pooled connection, with up
+    to EMAIL_POOL_SIZE batches in flight. Returns one result per message, in order.
+    """
+    built = [_build_message(*message) for message in messages]
+    batches = [built[i:i + settings.EMAIL_BATCH_SIZE] for i in range(0, len(built), settings.EMAIL_BATCH_SIZE)]
+
+    async def run(batch):
+        try:
+            return await smtp_pool.send_batch(batch)
+        except Exception as e:
+            # Could not connect at all; fail the whole batch
+            logger.error(f"Failed to send {len(batch)} emails: {e}")
+            return [False] * len(batch)
+
+    results = await asyncio.gather(*(run(batch) for batch in batches))
+    sent = [ok for batch_results in results for ok in batch_results]
+    logger.info(f"Sent {sum(sent)} of {len(sent)} emails")
+    return sent
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+import logging
+import zipfile
+from datetime import date, datetime
+from typing import AsyncIterator
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.db.models.appointments import Appointment
+from app.db.models.ehr_sync import EHRRecord
+from app.db.models.health_diary import HealthDiary
+from app.db.models.medication import Medication
+from app.db.models.medication_logs import MedicationLog
+from app.db.models.monitoring import ChronicMonitoring
+from app.db.models.vaccination import VaccinationRecord
+
+logger = logging.getLogger("health_export")
+
+# (section name, model, owning user column, ordering column)
+EXPORT_SECTIONS = [
+    ("health_diary", HealthDiary, HealthDiary.user_id, HealthDiary.id),
+    ("medications", Medication, Medication.user_id, Medication.id),
+    ("medication_logs", MedicationLog, MedicationLog.user_id, MedicationLog.id),
+    ("appointments", Appointment, Appointment.user_id, Appointment.id),
+    ("vaccination_records", VaccinationRecord, VaccinationRecord.user_id, VaccinationRecord.id),
+    ("chronic_monitoring", ChronicMonitoring, ChronicMonitoring.patient_id, ChronicMonitoring.id),
+    ("ehr_history", EHRRecord, EHRRecord.user_id, EHRRecord.id),
+]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _as_dict(row, columns) -> dict:
+    return {column: getattr(row, column) for column in columns}
+
+
+async def _section_rows(db, model, owner_column, order_column, user_id: int):
+    """Stream one section through a server-side cursor, EXPORT_YIELD_PER rows at a time."""
+    result = await db.stream_scalars(
+        select(model)
+        .where(owner_column == user_id)
+        .order_by(order_column)
+        .execution_options(yield_per=settings.EXPORT_YIELD_PER)
+    )
+    async for row in result:
+        yield row
+
+
+async def export_ndjson(db, user_id: int) -> AsyncIterator[bytes]:
+    """One ``{"section": ..., "record": {...}}`` JSON object per line, section by section."""
+    for section, model, owner_column, order_column in EXPORT_SECTIONS:
+        columns = [c.key for c in model.__table__.columns]
+        lines = []
+        async for row in _section_rows(db, model, owner_column, order_column, user_id):
+            lines.append(json.dumps({"section": section, "record": _as_dict(row, columns)}, default=_json_default))
+            if len(lines) >= settings.EXPORT_YIELD_PER:
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, non-seekable sink for ZipFile; the caller drains it as it fills."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _csv_cell(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def export_csv_zip(db, user_id: int) -> AsyncIterator[bytes]:
+    """A zip of one CSV file per section, compressed and sent as rows are read."""
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for section, model, owner_column, order_column in EXPORT_SECTIONS:
+            columns = [c.key for c in model.__table__.columns]
+            with archive.open(f"{section}.csv", mode="w", force_zip64=True) as member:
+                text = io.StringIO()
+                writer = csv.writer(text)
+                writer.writerow(columns)
+                async for row in _section_rows(db, model, owner_column, order_column, user_id):
+                    writer.writerow([_csv_cell(getattr(row, column)) for column in columns])
+                    if text.tell() >= settings.EXPORT_CHUNK_BYTES:
+                        member.write(text.getvalue().encode())
+                        text.seek(0)
+                        text.truncate()
+                        compressed = sink.drain()
+                        if compressed:
+                            yield compressed
+                member.write(text.getvalue().encode())
+            yield sink.drain()
+    # Central directory, written when the archive closes
+    yield sink.drain()
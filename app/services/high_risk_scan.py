@@ -0,0 +1,66 @@
+import logging
+from app.core.config import settings
+from app.crud.health_diary import get_max_entry_id, get_unalerted_high_risk_entries, add_high_risk_alert
+from app.crud.job_checkpoint import get_checkpoint, start_run, advance_checkpoint
+from app.db.session import SessionLocal
+from app.services.notification_service import enqueue_notification
+
+logger = logging.getLogger("high_risk_scan")
+
+HIGH_RISK_SCAN_JOB = "high_risk_scan"
+CRITICAL_SYMPTOMS = {"chest pain", "shortness of breath", "fainting"}
+HIGH_RISK_MOOD = 2  # mood at or below this is treated as high risk
+
+
+async def scan_high_risk_entries() -> int:
+    """
+    Alert on high-risk diary entries added since the last scan.
+
+    The job checkpoint holds a high-water mark on HealthDiary.id. Each run
+    checks entries up to the current max id, re-checking a small overlap below
+    the mark for rows that committed late; high_risk_alerts keeps any entry
+    from being alerted on twice. The first run only sets the mark, so existing
+    history is never alerted on. Returns the number of alerts queued.
+    """
+    alerted = 0
+    async with SessionLocal() as db:
+        up_to_id = await get_max_entry_id(db)
+        checkpoint = await get_checkpoint(db, HIGH_RISK_SCAN_JOB)
+        if not checkpoint:
+            await start_run(db, HIGH_RISK_SCAN_JOB, last_id=up_to_id)
+            logger.info(f"High-risk scan watermark seeded at id {up_to_id}")
+            return 0
+        watermark = checkpoint.last_id
+        after_id = max(watermark - settings.HIGH_RISK_SCAN_OVERLAP_IDS, 0)
+
+        while True:
+            entries = await get_unalerted_high_risk_entries(
+                db,
+                after_id=after_id,
+                up_to_id=up_to_id,
+                critical_symptoms=CRITICAL_SYMPTOMS,
+                max_mood=HIGH_RISK_MOOD,
+                limit=settings.HIGH_RISK_SCAN_PAGE_SIZE,
+            )
+            for entry in entries:
+                # The alert record and its queued notification commit together
+                add_high_risk_alert(db, entry)
+                await enqueue_notification(
+                    db,
+                    entry.user,
+                    "We've detected severe symptoms in your recent health diary entry.",
+                    subject="Urgent Check-In Required",
+                    dedup_key=f"high-risk:{entry.id}",
+                )
+                alerted += 1
+            await db.commit()
+            if len(entries) < settings.HIGH_RISK_SCAN_PAGE_SIZE:
+                break
+            after_id = entries[-1].id
+
+        if up_to_id > watermark and not await advance_checkpoint(db, HIGH_RISK_SCAN_JOB, watermark, up_to_id):
+            logger.warning(f"High-risk scan watermark moved past {watermark} by another run")
+
+    logger.info(f"High-risk scan checked entries through id {up_to_id}, queued {alerted} alerts")
+    return alerted
+
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger("insight_cache")
+
+# Per-user AI insight for the dashboard: {"value": ..., "fresh_until": monotonic seconds}
+_insight_cache = TTLCache(
+    maxsize=settings.DASHBOARD_INSIGHT_CACHE_SIZE,
+    ttl=settings.DASHBOARD_INSIGHT_MAX_AGE_SECONDS,
+)
+_refreshing: dict[int, asyncio.Task] = {}
+_invalidated: set[int] = set()
+
+
+def get_dashboard_insight(user_id: int, compute: Callable[[int], Awaitable]):
+    """
+    Return the cached AI insight for a user without waiting on the model.
+
+    A missing or stale entry schedules a background refresh via ``compute``;
+    callers get ``None`` until the first refresh for the user completes.
+    """
+    entry = _insight_cache.get(user_id)
+    if entry is None or entry["fresh_until"] <= time.monotonic():
+        _schedule_refresh(user_id, compute)
+    return entry["value"] if entry else None
+
+
+def invalidate_dashboard_insight(user_id: int):
+    """Drop a user's cached insight, e.g. after a new health diary entry."""
+    _insight_cache.pop(user_id)
+    if user_id in _refreshing:
+        # The running refresh read the diary before this write; don't store its result
+        _invalidated.add(user_id)
+
+
+def _schedule_refresh(user_id: int, compute: Callable[[int], Awaitable]):
+    if user_id in _refreshing:
+        return
+    _refreshing[user_id] = asyncio.create_task(_refresh(user_id, compute))
+
+
+async def _refresh(user_id: int, compute: Callable[[int], Awaitable]):
+    try:
+        value = await compute(user_id)
+        if user_id not in _invalidated:
+            _insight_cache.set(user_id, {
+                "value": value,
+                "fresh_until": time.monotonic() + settings.DASHBOARD_INSIGHT_REFRESH_SECONDS,
+            })
+    except Exception as e:
+        logger.error(f"Dashboard insight refresh failed for user {user_id}: {e}")
+    finally:
+        _invalidated.discard(user_id)
+        _refreshing.pop(user_id, None)
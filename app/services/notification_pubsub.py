@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+logger = logging.getLogger("notification_pubsub")
+
+CHANNEL_PREFIX = "notifications:"
+
+
+class _Subscription:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+
+    def put(self, payload: dict):
+        if self.queue.full():
+            # Slow client: drop the oldest; it can page the inbox to catch up
+            self.queue.get_nowait()
+        self.queue.put_nowait(payload)
+
+    async def events(self, heartbeat: float) -> AsyncIterator[Optional[dict]]:
+        """Yield published payloads, or None after ``heartbeat`` idle seconds."""
+        while True:
+            try:
+                yield await asyncio.wait_for(self.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class NotificationBroker:
+    """
+    Per-user fan-out of new notifications to open streams in this process.
+    publish() delivers straight to local subscribers.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[int, set] = defaultdict(set)
+
+    def _deliver(self, user_id: int, payload: dict):
+        for subscription in list(self._subscribers.get(user_id, ())):
+            subscription.put(payload)
+
+    def publish(self, user_id: int, payload: dict):
+        self._deliver(user_id, payload)
+
+    async def flush(self):
+        """Wait for publishes still in flight (used before an event loop closes)."""
+
+    async def _ensure_listening(self):
+        pass
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        await self._ensure_listening()
+        subscription = _Subscription()
+        self._subscribers[user_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers[user_id].discard(subscription)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+
+class RedisNotificationBroker(NotificationBroker):
+    """
+    Fan-out across workers: publish() goes through Redis, and each process
+    runs one pattern subscription that delivers to its local subscribers.
+    Publishing works from any event loop (API workers and Celery tasks alike).
+    """
+
+    def __init__(self, url: str):
+        super().__init__()
+        self._url = url
+        self._clients = weakref.WeakKeyDictionary()
+        self._pending: set[asyncio.Task] = set()
+        self._listener: asyncio.Task = None
+
+    def _client(self):
+        from redis import asyncio as aioredis
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = aioredis.from_url(self._url, decode_responses=True)
+        return client
+
+    def publish(self, user_id: int, payload: dict):
+        try:
+            client = self._client()
+        except RuntimeError:
+            logger.warning(f"No running event loop; notification for user {user_id} not pushed")
+            return
+        task = asyncio.get_running_loop().create_task(self._publish(client, user_id, payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _publish(self, client, user_id: int, payload: dict):
+        try:
+            await client.publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(payload))
+        except Exception as e:
+            logger.warning(f"Notification publish failed for user {user_id}: {e}")
+
+    async def flush(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _ensure_listening(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self._client().pubsub()
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    user_id = int(message["channel"][len(CHANNEL_PREFIX):])
+                    self._deliver(user_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification subscription dropped, reconnecting: {e}")
+                await asyncio.sleep(1)
+
+
+def _create_broker() -> NotificationBroker:
+    if settings.NOTIFICATION_PUBSUB_BACKEND == "redis":
+        return RedisNotificationBroker(settings.NOTIFICATION_PUBSUB_REDIS_URL)
+    return NotificationBroker()
+
+
+broker = _create_broker()
+
+
+def notification_payload(notification) -> dict:
+    return {
+        "id": notification.id,
+        "user_id": notification.user_id,
+        "message": notification.message,
+        "sent_at": notification.sent_at.isoformat() if notification.sent_at else None,
+        "is_read": notification.is_read,
+    }
+
+
+def publish_after_commit(db, notification):
+    """Push ``notification`` to the user's open streams once ``db`` commits."""
+    db.sync_session.info.setdefault("new_notifications", []).append(notification)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    for notification in session.info.pop("new_notifications", []):
+        broker.publish(notification.user_id, notification_payload(notification))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("new_notifications", None)
@@ -1,31 +1,113 @@
+import asyncio
 import logging
-from app.services.email_service import send_email
-from app.services.sms_service import send_sms
-from app.db.session import SessionLocal
-from app.crud.notification import create_notification
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud.notification import add_notification
+from app.crud.notification_outbox import add_outbox_message, claim_due_messages
 from app.db.models.user import User
+from app.db.session import SessionLocal
+from app.services.email_service import send_many
+from app.services.sms_service import send_sms_many
 
 logger = logging.getLogger("notification_service")
 
-async def send_notification(user_id: int, message: str):
+DEFAULT_SUBJECT = "Health Notification"
+
+
+async def enqueue_notification(
+    db: AsyncSession,
+    user: User,
+    message: str,
+    subject: str = DEFAULT_SUBJECT,
+    dedup_key: Optional[str] = None,
+):
+    """
+    Record an in-app notification and queue its email/SMS delivery in the
+    caller's transaction; nothing is sent until the caller commits.
+
+    Pass a ``dedup_key`` for notifications that may be produced more than once
+    (e.g. by a retried job) so each channel is delivered only once.
+    """
+    dedup_key = dedup_key or uuid.uuid4().hex
+    if not await add_outbox_message(db, f"{dedup_key}:email", user.id, "email", user.email, message, subject=subject):
+        return  # already produced once
+    await add_notification(db, user.id, message)
+    if user.phone:
+        await add_outbox_message(db, f"{dedup_key}:sms", user.id, "sms", user.phone, message)
+
+
+async def send_notification(user_id: int, message: str, dedup_key: Optional[str] = None):
     """Send a notification via email and SMS."""
-    db = SessionLocal()
-    
-    # Fetch user contact details
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        logger.error(f"User {user_id} not found.")
-        return await False
-
-    email_sent = send_email(user.email, "Health Notification", message)
-    sms_sent = send_sms(user.phone, message)
-
-    # Save notification in the database
-    create_notification(db, user_id, message)
-
-    if email_sent or sms_sent:
-        logger.info(f"Notification sent to user {user_id}")
-        return await True
-    else:
-        logger.error(f"Failed to send notification to user {user_id}")
-        return await False
+    async with SessionLocal() as db:
+        user = await db.get(User, user_id)
+        if not user:
+            logger.error(f"User {user_id} not found.")
+            return False
+
+        await enqueue_notification(db, user, message, dedup_key=dedup_key)
+        await db.commit()
+
+    logger.info(f"Notification queued for user {user_id}")
+    return True
+
+
+# ---------------- Outbox delivery ----------------
+
+def _retry_delay(attempts: int) -> float:
+    cap = min(settings.OUTBOX_RETRY_MAX_SECONDS, settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1)))
+    return random.uniform(cap / 2, cap)
+
+
+async def _send_channel(channel: str, messages) -> list:
+    if not messages:
+        return []
+    try:
+        if channel == "email":
+            return await send_many([(m.recipient, m.subject or DEFAULT_SUBJECT, m.body) for m in messages])
+        return await send_sms_many([(m.recipient, m.body) for m in messages])
+    except Exception as e:
+        logger.error(f"{channel} delivery failed: {e}")
+        return [False] * len(messages)
+
+
+async def deliver_outbox() -> int:
+    """
+    Drain due outbox messages in batches of OUTBOX_BATCH_SIZE until none are
+    left. Email and SMS go out concurrently, each through its own pooled
+    transport; failures are retried with backoff up to OUTBOX_MAX_ATTEMPTS.
+    Returns the number of messages sent.
+    """
+    delivered = 0
+    async with SessionLocal() as db:
+        while True:
+            batch = await claim_due_messages(db, settings.OUTBOX_BATCH_SIZE, settings.OUTBOX_LEASE_SECONDS)
+            if not batch:
+                return delivered
+
+            emails = [m for m in batch if m.channel == "email"]
+            texts = [m for m in batch if m.channel == "sms"]
+            email_results, sms_results = await asyncio.gather(
+                _send_channel("email", emails),
+                _send_channel("sms", texts),
+            )
+
+            now = datetime.utcnow()
+            for message, sent in zip(emails + texts, email_results + sms_results):
+                message.attempts += 1
+                if sent:
+                    message.status = "sent"
+                    message.sent_at = now
+                    delivered += 1
+                elif message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    message.status = "failed"
+                    message.last_error = f"{message.channel} delivery failed after {message.attempts} attempts"
+                    logger.error(f"Giving up on outbox message {message.id} to user {message.user_id}")
+                else:
+                    message.next_attempt_at = now + timedelta(seconds=_retry_delay(message.attempts))
+                    message.last_error = f"{message.channel} delivery failed"
+            await db.commit()
+            logger.info(f"Outbox batch: {sum(email_results + sms_results)} of {len(batch)} delivered")
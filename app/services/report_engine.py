@@ -0,0 +1,382 @@
+"""
+PDF report engine.
+
+A report template is a list of sections (charts and tables) compiled once per
+process into absolute page geometry, so rendering a report only pours data
+into an already laid-out template. Aggregates behind the charts and tables are
+computed with NumPy over whole columns, not row by row. Reports use the PDF
+core fonts, which every viewer ships, so there are no font files to parse or
+embed per document.
+"""
+import re
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+import numpy as np
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from app.core.config import settings
+
+PAGE_WIDTH = 210  # A4, mm
+MARGIN = 12
+FONT = "helvetica"
+ROW_HEIGHT = 7
+
+
+@dataclass
+class ReportInputs:
+    """Everything a health report is rendered from; picklable for the render pool."""
+    user_id: int
+    generated_at: datetime
+    diary: list = field(default_factory=list)  # (date, mood, symptoms), oldest first
+    medications: list = field(default_factory=list)  # (id, name, dosage, frequency, start_date, end_date)
+    medication_logs: list = field(default_factory=list)  # (medication_id, taken_at)
+    vitals: list = field(default_factory=list)  # (recorded_at, blood_pressure, blood_sugar, heart_rate, weight), oldest first
+
+
+# ---------------- Aggregates ----------------
+
+def mood_trend(dates, moods, max_points: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Average mood per bucket of days, with buckets widened so there are at most
+    ``max_points`` of them. Returns (bucket start days, averages, days per bucket).
+    """
+    days = np.array(dates, dtype="datetime64[D]")
+    values = np.array(moods, dtype=float)  # None -> nan
+    known = ~np.isnan(values)
+    days, values = days[known], values[known]
+    if not days.size:
+        return days, values, 1
+
+    first = days.min()
+    offsets = (days - first).astype(np.int64)
+    bucket_days = max(1, -(-(int(offsets.max()) + 1) // max_points))
+    buckets = offsets // bucket_days
+    counts = np.bincount(buckets)
+    sums = np.bincount(buckets, weights=values)
+    present = np.flatnonzero(counts)
+    return first + present * bucket_days, sums[present] / counts[present], bucket_days
+
+
+_DOSE_WORDS = {"once": 1, "twice": 2, "thrice": 3, "three times": 3, "four times": 4}
+
+
+def doses_per_day(frequency: str) -> float:
+    """Expected doses per day from a free-text frequency like "twice daily" or "every 8 hours"."""
+    text = (frequency or "").lower()
+    hours = re.search(r"every\s+(\d+(?:\.\d+)?)\s*h", text)
+    if hours and float(hours.group(1)) > 0:
+        return 24 / float(hours.group(1))
+    times = re.search(r"(\d+)\s*(?:x|times)", text)
+    count = int(times.group(1)) if times else next((n for word, n in _DOSE_WORDS.items() if word in text), 1)
+    if "week" in text:
+        return count / 7
+    if "month" in text:
+        return count / 30
+    return count
+
+
+def medication_adherence(medications: list, logs: list, until: datetime) -> list:
+    """
+    (name, dosage, expected doses, logged doses, adherence %) per medication,
+    counting logs that fall inside each medication's start..end window.
+    Adherence is nan where no dose was due yet.
+    """
+    if not medications:
+        return []
+    ids = np.array([m[0] for m in medications], dtype=np.int64)
+    starts = np.array([m[4] for m in medications], dtype="datetime64[s]")
+    ends = np.array([m[5] or until for m in medications], dtype="datetime64[s]")
+    ends = np.minimum(ends, np.datetime64(until, "s"))
+    active_days = np.maximum((ends - starts) / np.timedelta64(1, "D"), 0)
+    expected = np.floor(active_days * np.array([doses_per_day(m[3]) for m in medications]))
+
+    taken = np.zeros(len(ids), dtype=np.int64)
+    if logs:
+        log_ids = np.array([log[0] for log in logs], dtype=np.int64)
+        log_times = np.array([log[1] for log in logs], dtype="datetime64[s]")
+        order = np.argsort(ids)
+        positions = np.minimum(np.searchsorted(ids, log_ids, sorter=order), len(ids) - 1)
+        index = order[positions]
+        counted = (ids[index] == log_ids) & (log_times >= starts[index]) & (log_times <= ends[index])
+        taken = np.bincount(index[counted], minlength=len(ids))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adherence = np.where(expected > 0, np.minimum(taken / expected, 1.0) * 100, np.nan)
+    return [
+        (m[1], m[2], int(e), int(t), float(a))
+        for m, e, t, a in zip(medications, expected, taken, adherence)
+    ]
+
+
+# (label, unit, index into a vitals row, key inside each reading or None)
+VITAL_METRICS = (
+    ("Systolic BP", "mmHg", 1, "systolic"),
+    ("Diastolic BP", "mmHg", 1, "diastolic"),
+    ("Blood sugar", "mg/dL", 2, None),
+    ("Heart rate", "bpm", 3, None),
+    ("Weight", "kg", 4, None),
+)
+
+
+def vital_summary(vitals: list) -> list:
+    """(label, unit, readings, latest, mean, min, max) per metric that has readings."""
+    summary = []
+    for label, unit, column, key in VITAL_METRICS:
+        readings = [row[column] or () for row in vitals]
+        if key:
+            readings = [[reading.get(key) for reading in row] for row in readings]
+        values = np.fromiter((v for row in readings for v in row if v is not None), dtype=float)
+        if values.size:
+            summary.append((label, unit, values.size, values[-1], values.mean(), values.min(), values.max()))
+    return summary
+
+
+# ---------------- Template sections ----------------
+
+def _text(value) -> str:
+    """Core fonts are Latin-1; replace anything outside it rather than fail the report."""
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+
+def _fit(pdf: FPDF, text: str, width: float) -> str:
+    """Cells don't wrap; cut text that would overflow its column."""
+    if pdf.get_string_width(text) <= width - 2:
+        return text
+    while text and pdf.get_string_width(text + "...") > width - 2:
+        text = text[:-1]
+    return text + "..."
+
+
+def _heading(pdf: FPDF, title: str):
+    pdf.ln(4)
+    pdf.set_font(FONT, "B", 13)
+    pdf.cell(0, 9, _text(title), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font(FONT, "", 10)
+
+
+def _note(pdf: FPDF, text: str):
+    pdf.set_font(FONT, "I", 10)
+    pdf.cell(0, ROW_HEIGHT, _text(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font(FONT, "", 10)
+
+
+@dataclass(frozen=True)
+class Column:
+    header: str
+    share: float  # fraction of the content width
+    align: str = "L"
+
+
+@dataclass(frozen=True)
+class Table:
+    title: str
+    columns: Tuple[Column, ...]
+    rows: Callable[[ReportInputs], List[tuple]]  # formatted cell strings
+    empty: str
+    widths: Tuple[float, ...] = ()
+
+    def compile(self, width: float) -> "Table":
+        return replace(self, widths=tuple(round(column.share * width, 2) for column in self.columns))
+
+    def _header_row(self, pdf: FPDF):
+        pdf.set_font(FONT, "B", 10)
+        pdf.set_fill_color(230, 236, 245)
+        for column, width in zip(self.columns, self.widths):
+            pdf.cell(width, ROW_HEIGHT, column.header, border=1, align=column.align, fill=True)
+        pdf.ln(ROW_HEIGHT)
+        pdf.set_font(FONT, "", 10)
+
+    def draw(self, pdf: FPDF, inputs: ReportInputs):
+        _heading(pdf, self.title)
+        rows = self.rows(inputs)
+        if not rows:
+            _note(pdf, self.empty)
+            return
+        self._header_row(pdf)
+        for row in rows:
+            if pdf.get_y() + ROW_HEIGHT > pdf.page_break_trigger:
+                pdf.add_page()
+                self._header_row(pdf)
+            for value, column, width in zip(row, self.columns, self.widths):
+                pdf.cell(width, ROW_HEIGHT, _fit(pdf, _text(value), width), border=1, align=column.align)
+            pdf.ln(ROW_HEIGHT)
+
+
+@dataclass(frozen=True)
+class LineChart:
+    title: str
+    series: Callable[[ReportInputs], Tuple[np.ndarray, np.ndarray, int]]  # (days, values, days per point)
+    y_range: Tuple[float, float]
+    y_ticks: Tuple[float, ...]
+    height: float
+    empty: str
+    # Resolved by compile()
+    left: float = 0.0
+    width: float = 0.0
+
+    def compile(self, width: float) -> "LineChart":
+        axis_labels = 8
+        return replace(self, left=MARGIN + axis_labels, width=width - axis_labels)
+
+    def draw(self, pdf: FPDF, inputs: ReportInputs):
+        _heading(pdf, self.title)
+        days, values, bucket_days = self.series(inputs)
+        if not values.size:
+            _note(pdf, self.empty)
+            return
+        if pdf.get_y() + self.height + 12 > pdf.page_break_trigger:
+            pdf.add_page()
+
+        top = pdf.get_y() + 2
+        low, high = self.y_range
+        scale = self.height / (high - low)
+        pdf.set_font(FONT, "", 8)
+        pdf.set_draw_color(210, 210, 210)
+        pdf.set_line_width(0.2)
+        for tick in self.y_ticks:
+            y = top + self.height - (tick - low) * scale
+            pdf.line(self.left, y, self.left + self.width, y)
+            pdf.text(MARGIN, y + 1, f"{tick:g}")
+
+        span = max(int((days[-1] - days[0]).astype(np.int64)), 1)
+        xs = self.left + (days - days[0]).astype(np.int64) / span * self.width
+        ys = top + self.height - (np.clip(values, low, high) - low) * scale
+        pdf.set_draw_color(40, 90, 160)
+        pdf.set_line_width(0.6)
+        if values.size == 1:
+            pdf.circle(x=xs[0], y=ys[0], radius=0.8, style="D")
+        else:
+            pdf.polyline(list(zip(xs.tolist(), ys.tolist())))
+        pdf.set_draw_color(0, 0, 0)
+        pdf.set_line_width(0.2)
+
+        label_y = top + self.height + 5
+        pdf.text(self.left, label_y, str(days[0]))
+        last = str(days[-1])
+        pdf.text(self.left + self.width - pdf.get_string_width(last), label_y, last)
+        per = "day" if bucket_days == 1 else f"{bucket_days} days"
+        pdf.set_y(label_y + 1)
+        _note(pdf, f"Average per {per}")
+
+
+class ReportTemplate:
+    """A titled list of sections, laid out for the page once when the template is built."""
+
+    def __init__(self, title: str, sections: list):
+        self.title = title
+        self.sections = [section.compile(PAGE_WIDTH - 2 * MARGIN) for section in sections]
+
+    def build(self, inputs: ReportInputs) -> FPDF:
+        pdf = FPDF(format="A4")
+        pdf.set_margins(MARGIN, MARGIN, MARGIN)
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        pdf.set_font(FONT, "B", 16)
+        pdf.cell(0, 10, _text(f"{self.title} for User {inputs.user_id}"), align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font(FONT, "", 9)
+        pdf.cell(0, 6, f"Generated {inputs.generated_at:%Y-%m-%d %H:%M} UTC", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        for section in self.sections:
+            section.draw(pdf, inputs)
+        return pdf
+
+
+# ---------------- Health report ----------------
+
+def _mood_series(inputs: ReportInputs):
+    return mood_trend(
+        [row[0] for row in inputs.diary],
+        [row[1] for row in inputs.diary],
+        settings.REPORT_CHART_MAX_POINTS,
+    )
+
+
+def _adherence_rows(inputs: ReportInputs) -> list:
+    return [
+        (name, dosage, expected, taken, "-" if np.isnan(adherence) else f"{adherence:.0f}%")
+        for name, dosage, expected, taken, adherence in medication_adherence(
+            inputs.medications, inputs.medication_logs, inputs.generated_at
+        )
+    ]
+
+
+def _vitals_rows(inputs: ReportInputs) -> list:
+    return [
+        (label, unit, count, f"{latest:.1f}", f"{mean:.1f}", f"{low:.1f}", f"{high:.1f}")
+        for label, unit, count, latest, mean, low, high in vital_summary(inputs.vitals)
+    ]
+
+
+def _diary_rows(inputs: ReportInputs) -> list:
+    recent = inputs.diary[-settings.REPORT_MAX_DIARY_ROWS:]
+    return [
+        (
+            f"{entry_date:%Y-%m-%d}" if entry_date else "-",
+            "-" if mood is None else mood,
+            ", ".join(map(str, symptoms or [])) or "-",
+        )
+        for entry_date, mood, symptoms in reversed(recent)
+    ]
+
+
+def _health_report() -> ReportTemplate:
+    return ReportTemplate("Health Report", [
+        LineChart(
+            "Mood trend",
+            series=_mood_series,
+            y_range=(1, 5),
+            y_ticks=(1, 2, 3, 4, 5),
+            height=50,
+            empty="No mood scores recorded.",
+        ),
+        Table(
+            "Medication adherence",
+            columns=(
+                Column("Medication", 0.34),
+                Column("Dosage", 0.2),
+                Column("Expected", 0.15, "R"),
+                Column("Logged", 0.15, "R"),
+                Column("Adherence", 0.16, "R"),
+            ),
+            rows=_adherence_rows,
+            empty="No medications on record.",
+        ),
+        Table(
+            "Vitals",
+            columns=(
+                Column("Metric", 0.22),
+                Column("Unit", 0.12),
+                Column("Readings", 0.14, "R"),
+                Column("Latest", 0.13, "R"),
+                Column("Mean", 0.13, "R"),
+                Column("Min", 0.13, "R"),
+                Column("Max", 0.13, "R"),
+            ),
+            rows=_vitals_rows,
+            empty="No vitals recorded.",
+        ),
+        Table(
+            "Recent diary entries",
+            columns=(
+                Column("Date", 0.18),
+                Column("Mood", 0.1, "C"),
+                Column("Symptoms", 0.72),
+            ),
+            rows=_diary_rows,
+            empty="No diary entries.",
+        ),
+    ])
+
+
+TEMPLATES = {
+    "health_report": _health_report,
+}
+
+
+@lru_cache(maxsize=None)
+def get_template(kind: str) -> ReportTemplate:
+    """The compiled template for a report kind, built once per process."""
+    return TEMPLATES[kind]()
@@ -1,84 +1,320 @@
-from fpdf import FPDF
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.crud.report import create_report_job, fail_stale_running_reports, get_report, get_ready_report_by_digest
+from app.db.models.health_diary import HealthDiary
+from app.db.models.medication import Medication
+from app.db.models.medication_logs import MedicationLog
+from app.db.models.monitoring import ChronicMonitoring
+from app.db.models.reports import Report
+from app.db.models.user import User
 from app.db.session import SessionLocal
-from app.crud.health_diary import get_health_diary
+from app.services.notification_service import enqueue_notification
+from app.services.report_engine import ReportInputs, get_template
+import hashlib
 import logging
 import os
-import asyncio  # Required for async file handling
+import time
+import asyncio
 
 logger = logging.getLogger("report_service")
 
-async def generate_health_report(user_id: int):
-    """Generate a PDF health report for the user asynchronously."""
-    
-    async with SessionLocal() as db:
-        health_entries = await get_health_diary(db, user_id)  # Await async function
+HEALTH_REPORT = "health_report"
+# Bump whenever the rendered output changes, so cached reports are re-rendered
+REPORT_TEMPLATE_VERSION = "2"
 
-    if not health_entries:
-        return None  
+_render_pool: ProcessPoolExecutor = None
 
-    # Function to generate PDF (runs in a separate thread to avoid blocking)
-    def create_pdf():
-        pdf = FPDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 10, txt=f"Health Report for User {user_id}", ln=True, align='C')
 
-        for entry in health_entries:
-            pdf.cell(200, 10, txt=f"{entry.date}: {entry.symptoms}", ln=True)
+def get_render_pool() -> ProcessPoolExecutor:
+    """Process pool for PDF rendering, created on first use in this process."""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(max_workers=settings.REPORT_RENDER_WORKERS or os.cpu_count())
+    return _render_pool
 
-        os.makedirs("reports", exist_ok=True)
-        report_path = f"reports/user_{user_id}_health_report.pdf"
-        pdf.output(report_path)
-        return report_path
 
-    # Run PDF generation in an executor to avoid blocking
-    loop = asyncio.get_running_loop()
-    report_path = await loop.run_in_executor(None, create_pdf)
-    
-    logger.info(f"Health report generated: {report_path}")
+def report_file_path(user_id: int, report_id: int) -> str:
+    """Where a report's PDF is stored: one file per report, grouped by user."""
+    return os.path.join(settings.REPORTS_DIR, str(user_id), f"{report_id}.pdf")
 
-    return report_path
-from fpdf import FPDF
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import SessionLocal
-from app.crud.health_diary import get_health_diary
-import logging
-import os
-import asyncio  # Required for async file handling
 
-logger = logging.getLogger("report_service")
+@contextmanager
+def atomic_output(path: str):
+    """Yield a temp path to write to; it is renamed to ``path`` only on success."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def render_health_report(path: str, inputs: ReportInputs) -> str:
+    """Render a health report to ``path``. Runs in a render pool process."""
+    pdf = get_template(HEALTH_REPORT).build(inputs)
+    with atomic_output(path) as tmp_path:
+        pdf.output(tmp_path)
+    return path
+
+
+# Tables a health report is rendered from, with each one's owning user column
+REPORT_SOURCES = (
+    (HealthDiary, HealthDiary.user_id),
+    (Medication, Medication.user_id),
+    (MedicationLog, MedicationLog.user_id),
+    (ChronicMonitoring, ChronicMonitoring.patient_id),
+)
+
+
+def report_digest(user_id: int, markers) -> str:
+    """
+    Identity of a report's inputs. ``markers`` holds the highest row id, row
+    count and latest updated_at of each source table: the id and count change
+    when rows are added or removed, updated_at when one is edited in place.
+    """
+    key = f"{user_id}:{markers}:{REPORT_TEMPLATE_VERSION}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+async def report_digests(db: AsyncSession, user_ids: list) -> dict:
+    """Input digest per user, for the users that have anything to report."""
+    markers = {user_id: [] for user_id in user_ids}
+    for model, owner in REPORT_SOURCES:
+        result = await db.execute(
+            select(owner, func.max(model.id), func.count(model.id), func.max(model.updated_at))
+            .where(owner.in_(user_ids))
+            .group_by(owner)
+        )
+        found = {user_id: tuple(row) for user_id, *row in result.all()}
+        for user_id in user_ids:
+            markers[user_id].append(found.get(user_id, (0, 0, None)))
+    return {
+        user_id: report_digest(user_id, tuple(user_markers))
+        for user_id, user_markers in markers.items()
+        if any(count for _, count, _ in user_markers)
+    }
+
+
+async def load_report_inputs(db: AsyncSession, user_ids: list) -> dict:
+    """ReportInputs per user, loaded with one query per source table."""
+    now = datetime.utcnow()
+    inputs = {user_id: ReportInputs(user_id=user_id, generated_at=now) for user_id in user_ids}
+
+    result = await db.execute(
+        select(HealthDiary.user_id, HealthDiary.date, HealthDiary.mood, HealthDiary.symptoms)
+        .where(HealthDiary.user_id.in_(user_ids))
+        .order_by(HealthDiary.user_id, HealthDiary.date, HealthDiary.id)
+    )
+    for user_id, *row in result.all():
+        inputs[user_id].diary.append(tuple(row))
+
+    result = await db.execute(
+        select(
+            Medication.user_id, Medication.id, Medication.name, Medication.dosage,
+            Medication.frequency, Medication.start_date, Medication.end_date,
+        )
+        .where(Medication.user_id.in_(user_ids))
+        .order_by(Medication.user_id, Medication.id)
+    )
+    for user_id, *row in result.all():
+        inputs[user_id].medications.append(tuple(row))
+
+    result = await db.execute(
+        select(MedicationLog.user_id, MedicationLog.medication_id, MedicationLog.taken_at)
+        .where(MedicationLog.user_id.in_(user_ids))
+    )
+    for user_id, *row in result.all():
+        inputs[user_id].medication_logs.append(tuple(row))
+
+    result = await db.execute(
+        select(
+            ChronicMonitoring.patient_id, ChronicMonitoring.recorded_at, ChronicMonitoring.blood_pressure,
+            ChronicMonitoring.blood_sugar, ChronicMonitoring.heart_rate, ChronicMonitoring.weight,
+        )
+        .where(ChronicMonitoring.patient_id.in_(user_ids))
+        .order_by(ChronicMonitoring.patient_id, ChronicMonitoring.recorded_at, ChronicMonitoring.id)
+    )
+    for user_id, *row in result.all():
+        inputs[user_id].vitals.append(tuple(row))
+    return inputs
+
+
+async def find_cached_report(db: AsyncSession, user_id: int):
+    """A ready report whose stored PDF was rendered from the user's current data, if any."""
+    digest = (await report_digests(db, [user_id])).get(user_id)
+    if not digest:
+        return None
+    report = await get_ready_report_by_digest(db, user_id, HEALTH_REPORT, digest)
+    if report and report.file_path and os.path.exists(report.file_path):
+        return report
+    return None
+
+
+async def run_report_job(report_id: int):
+    """Render a pending report in the process pool and record the outcome on its row."""
+    async with SessionLocal() as db:
+        report = await get_report(db, report_id)
+        if not report or report.status not in ("pending", "running"):
+            return report
+        report.status = "running"
+        await db.commit()
+
+        # Digest taken before loading, so a concurrent write only makes it stale
+        digest = (await report_digests(db, [report.user_id])).get(report.user_id)
+        if not digest:
+            report.status = "failed"
+            report.error = "No health data to report"
+            await db.commit()
+            return report
+
+        cached = await get_ready_report_by_digest(db, report.user_id, HEALTH_REPORT, digest)
+        if cached and cached.file_path and os.path.exists(cached.file_path):
+            path = cached.file_path
+        else:
+            path = report_file_path(report.user_id, report.id)
+            inputs = (await load_report_inputs(db, [report.user_id]))[report.user_id]
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(get_render_pool(), render_health_report, path, inputs)
+            except Exception as e:
+                logger.error(f"Rendering report {report.id} failed: {e}")
+                report.status = "failed"
+                report.error = "Rendering failed"
+                await db.commit()
+                return report
+            logger.info(f"Health report generated: {path}")
+
+        report.status = "ready"
+        report.file_path = path
+        report.input_digest = digest
+        report.completed_at = datetime.utcnow()
+        await db.commit()
+        return report
+
 
 async def generate_health_report(user_id: int):
-    """Generate a PDF health report for the user asynchronously."""
-    
+    """
+    Health report for the user's current data: the stored one if nothing has
+    changed since it was rendered, otherwise a newly rendered one. Returns the
+    Report row.
+    """
     async with SessionLocal() as db:
-        health_entries = await get_health_diary(db, user_id)  # Await async function
+        cached = await find_cached_report(db, user_id)
+        if cached:
+            logger.info(f"Reusing health report {cached.id} for user {user_id}")
+            return cached
+        report = await create_report_job(db, user_id, HEALTH_REPORT)
+    return await run_report_job(report.id)
 
-    if not health_entries:
-        return None  
 
-    # Function to generate PDF (runs in a separate thread to avoid blocking)
-    def create_pdf():
-        pdf = FPDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 10, txt=f"Health Report for User {user_id}", ln=True, align='C')
+# ---------------- Fleet generation ----------------
+
+async def generate_reports_for_users(user_ids: list) -> dict:
+    """
+    Weekly reports for a page of users, REPORT_FLEET_CHUNK_SIZE users at a time.
+    Each chunk digests its users' inputs with grouped queries, reuses reports
+    whose inputs are unchanged, loads the rest with one query per source table
+    and renders them concurrently in the render pool. Users get a notification
+    for each newly rendered report. Reports left "running" for longer than
+    REPORT_RUNNING_STALE_SECONDS by a crashed worker are marked failed first.
+    Returns counters for the page.
+    """
+    totals = {"users": len(user_ids), "rendered": 0, "reused": 0, "skipped": 0, "failed": 0}
+    started = time.perf_counter()
+    async with SessionLocal() as db:
+        reclaimed = await fail_stale_running_reports(
+            db, datetime.utcnow() - timedelta(seconds=settings.REPORT_RUNNING_STALE_SECONDS)
+        )
+    if reclaimed:
+        logger.warning(f"Marked {reclaimed} reports left running by a crashed worker as failed")
+    size = settings.REPORT_FLEET_CHUNK_SIZE
+    for i in range(0, len(user_ids), size):
+        for key, value in (await _generate_chunk(user_ids[i:i + size])).items():
+            totals[key] += value
 
-        for entry in health_entries:
-            pdf.cell(200, 10, txt=f"{entry.date}: {entry.symptoms}", ln=True)
+    elapsed = time.perf_counter() - started
+    totals["seconds"] = round(elapsed, 3)
+    totals["reports_per_second"] = round(totals["rendered"] / elapsed, 2) if elapsed else 0.0
+    logger.info(f"Weekly reports: {totals}")
+    return totals
 
-        os.makedirs("reports", exist_ok=True)
-        report_path = f"reports/user_{user_id}_health_report.pdf"
-        pdf.output(report_path)
-        return report_path
 
-    # Run PDF generation in an executor to avoid blocking
+async def _generate_chunk(user_ids: list) -> dict:
+    counts = {"rendered": 0, "reused": 0, "skipped": 0, "failed": 0}
+    async with SessionLocal() as db:
+        digests = await report_digests(db, user_ids)
+        counts["skipped"] = len(user_ids) - len(digests)
+        result = await db.execute(
+            select(Report.user_id, Report.input_digest, Report.file_path).where(
+                Report.user_id.in_(list(digests)),
+                Report.input_digest.in_(list(digests.values())),
+                Report.report_data == HEALTH_REPORT,
+                Report.status == "ready",
+            )
+        )
+        for user_id, digest, file_path in result.all():
+            if digests.get(user_id) == digest and file_path and os.path.exists(file_path):
+                del digests[user_id]
+                counts["reused"] += 1
+        if not digests:
+            return counts
+
+        reports = {
+            user_id: Report(user_id=user_id, report_data=HEALTH_REPORT, status="running", input_digest=digest)
+            for user_id, digest in digests.items()
+        }
+        db.add_all(reports.values())
+        await db.commit()
+        report_ids = {user_id: report.id for user_id, report in reports.items()}
+        inputs = await load_report_inputs(db, list(reports))
+
+    # No session (or pooled connection) is held while the chunk renders
     loop = asyncio.get_running_loop()
-    report_path = await loop.run_in_executor(None, create_pdf)
-    
-    logger.info(f"Health report generated: {report_path}")
+    pool = get_render_pool()
+    user_order = list(report_ids)
+    outcomes = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool, render_health_report, report_file_path(user_id, report_ids[user_id]), inputs[user_id]
+            )
+            for user_id in user_order
+        ),
+        return_exceptions=True,
+    )
 
-    return report_path
+    async with SessionLocal() as db:
+        reports = {
+            report.user_id: report
+            for report in (await db.execute(select(Report).where(Report.id.in_(list(report_ids.values()))))).scalars()
+        }
+        users = {user.id: user for user in (await db.execute(select(User).where(User.id.in_(user_order)))).scalars()}
+        now = datetime.utcnow()
+        for user_id, outcome in zip(user_order, outcomes):
+            report = reports[user_id]
+            if isinstance(outcome, Exception):
+                logger.error(f"Rendering report {report.id} failed: {outcome}")
+                report.status = "failed"
+                report.error = "Rendering failed"
+                counts["failed"] += 1
+                continue
+            report.status = "ready"
+            report.file_path = outcome
+            report.completed_at = now
+            counts["rendered"] += 1
+            if user_id in users:
+                await enqueue_notification(
+                    db,
+                    users[user_id],
+                    f"Your weekly health report is ready (report #{report.id}).",
+                    subject="Your weekly health report",
+                    dedup_key=f"weekly-report:{report.id}",
+                )
+        await db.commit()
+    return counts
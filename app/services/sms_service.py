@@ -1,21 +1,106 @@
-import requests
+import asyncio
+import random
+import weakref
+from collections import defaultdict
+from typing import Iterable, List, Tuple
+import httpx
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger("sms_service")
 
+
+class _LoopClient:
+    """Keep-alive HTTP client and concurrency limit for one event loop."""
+
+    def __init__(self):
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.SMS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SMS_MAX_CONNECTIONS,
+            ),
+            timeout=settings.SMS_TIMEOUT_SECONDS,
+        )
+        self.limit = asyncio.Semaphore(settings.SMS_CONCURRENCY)
+
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClient]" = weakref.WeakKeyDictionary()
+
+
+def _client() -> _LoopClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = _LoopClient()
+    return client
+
+
+async def close_sms_client():
+    """Close the HTTP client opened for the running event loop, if any (before the loop closes)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.http.aclose()
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+async def _post(payload: dict) -> bool:
+    """POST one request to the provider, retrying transient failures with jittered backoff."""
+    client = _client()
+    for attempt in range(settings.SMS_MAX_RETRIES + 1):
+        try:
+            async with client.limit:
+                response = await client.http.post(settings.SMS_API_URL, json={"api_key": settings.SMS_API_KEY, **payload})
+                response.raise_for_status()
+            return True
+        except httpx.HTTPError as e:
+            if attempt == settings.SMS_MAX_RETRIES or not _retryable(e):
+                logger.error(f"SMS request failed: {e}")
+                return False
+            await asyncio.sleep(random.uniform(0, settings.SMS_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)))
+
+
 async def send_sms(phone_number: str, message: str):
     """Send an SMS notification to a user."""
-    try:
-        payload = {
-            "api_key": settings.SMS_API_KEY,
-            "phone": phone_number,
-            "message": message,
-        }
-        response = requests.post("https://sms-provider.com/api/send", json=payload)
-        response.raise_for_status()
+    sent = await _post({"phone": phone_number, "message": message})
+    if sent:
         logger.info(f"SMS sent successfully to {phone_number}")
-        return await True
-    except requests.RequestException as e:
-        logger.error(f"Failed to send SMS to {phone_number}: {e}")
-        return await False
+    return sent
+
+
+async def send_sms_many(messages: Iterable[Tuple[str, str]]) -> List[bool]:
+    """
+    Send many (phone_number, message) SMS. With SMS_MAX_RECIPIENTS_PER_REQUEST
+    above 1, recipients of the same text are grouped into multi-recipient
+    requests of up to that many; the default 1 sends one request per message.
+    Returns one result per message, in order.
+    """
+    messages = list(messages)
+    by_text = defaultdict(list)
+    for index, (phone_number, message) in enumerate(messages):
+        by_text[message].append(index)
+
+    size = settings.SMS_MAX_RECIPIENTS_PER_REQUEST
+    groups = [
+        (message, indexes[i:i + size])
+        for message, indexes in by_text.items()
+        for i in range(0, len(indexes), size)
+    ]
+
+    async def run(message: str, indexes: List[int]) -> bool:
+        if len(indexes) == 1:
+            return await _post({"phone": messages[indexes[0]][0], "message": message})
+        return await _post({"phones": [messages[i][0] for i in indexes], "message": message})
+
+    outcomes = await asyncio.gather(*(run(message, indexes) for message, indexes in groups))
+
+    results = [False] * len(messages)
+    for (_, indexes), sent in zip(groups, outcomes):
+        for i in indexes:
+            results[i] = sent
+    logger.info(f"Sent {sum(results)} of {len(results)} SMS in {len(groups)} requests")
+    return results
@@ -1,10 +1,8 @@
 from app.schemas.therapy import TherapyGuidanceRequest, TherapyGuidanceResponse
-from openai import AsyncOpenAI
-from app.core.config import settings
+from app.services.ai_gateway import cached_completion
 import logging
 
 logger = logging.getLogger("ai_services")
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
 async def get_therapy_guidance(request: TherapyGuidanceRequest, db) -> TherapyGuidanceResponse:
     """
@@ -21,14 +19,7 @@ async def get_therapy_guidance(request: TherapyGuidanceRequest, db) -> TherapyGu
     """
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a licensed mental and physical health therapist."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        ai_response = response.choices[0].message.content.strip()
+        ai_response = await cached_completion(prompt, "You are a licensed mental and physical health therapist.")
 
         # Split response into list and description
         lines = ai_response.split("\n")
@@ -0,0 +1,232 @@
+"""
+Vectorized analytics over wearable series.
+
+Heart rate, SpO2 and temperature arrive as evenly spaced readings (typically
+one a minute over several days). They are packed into one contiguous float64
+matrix, one row per metric padded with nan, so rolling means, percentiles and
+anomaly z-scores are computed for all metrics at once with cumulative sums
+instead of per-reading Python loops.
+"""
+import warnings
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+SERIES = ("heart_rate", "oxygen_saturation", "temperature")
+PERCENTILES = (5, 25, 50, 75, 95)
+AWAKE_STAGES = {"awake", "wake", "out_of_bed"}
+SECONDS_PER_DAY = 86400
+
+
+def _number(value, digits: int = 2):
+    """JSON-friendly float: rounded, with nan as None."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def pack_series(series: Sequence[Optional[Sequence[float]]]) -> np.ndarray:
+    """One contiguous (metrics, samples) float64 matrix, short or missing series padded with nan."""
+    length = max((len(values) for values in series if values), default=0)
+    matrix = np.full((len(series), length), np.nan)
+    for row, values in enumerate(series):
+        if values:
+            matrix[row, :len(values)] = values
+    return matrix
+
+
+def prefix_sums(matrix: np.ndarray):
+    """
+    Running sums of each row's values, squares and valid-reading counts, with a
+    leading zero column; every rolling window is then two slices apart. Rows
+    are centred first so the sum of squares keeps its precision.
+    """
+    valid = ~np.isnan(matrix)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-nan rows
+        centre = np.nanmean(matrix, axis=1, keepdims=True)
+    centred = np.where(valid, matrix - centre, 0.0)
+    zeros = np.zeros((matrix.shape[0], 1))
+    return (
+        centre,
+        np.concatenate([zeros, np.cumsum(centred, axis=1)], axis=1),
+        np.concatenate([zeros, np.cumsum(centred * centred, axis=1)], axis=1),
+        np.concatenate([zeros, np.cumsum(valid, axis=1, dtype=np.float64)], axis=1),
+    )
+
+
+def _trailing(running: np.ndarray, window: int) -> np.ndarray:
+    """Per-position sums over the last ``window`` readings, from running sums with a leading zero column."""
+    totals = running[:, 1:].copy()
+    totals[:, window:] -= running[:, 1:running.shape[1] - window]
+    return totals
+
+
+def window_stats(prefix, window: int):
+    """Trailing mean and standard deviation over ``window`` readings, ignoring nan."""
+    centre, sums, squares, counts = prefix
+    n = _trailing(counts, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = _trailing(sums, window)
+        mean /= n
+        variance = _trailing(squares, window)
+        variance /= n
+        variance -= mean * mean
+    std = np.sqrt(np.maximum(variance, 0.0, out=variance), out=variance)
+    mean[n == 0] = np.nan
+    std[n < 2] = np.nan
+    mean += centre
+    return mean, std
+
+
+def latest_window_mean(prefix, ends: np.ndarray, window: int) -> np.ndarray:
+    """Mean of each row's last ``window`` readings up to its ``ends`` position (a reading count)."""
+    centre, sums, _, counts = prefix
+    rows = np.arange(len(ends))
+    starts = np.maximum(ends - window, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (sums[rows, ends] - sums[rows, starts]) / (counts[rows, ends] - counts[rows, starts])
+    return mean + centre[:, 0]
+
+
+def rolling_stats(matrix: np.ndarray, window: int):
+    """Trailing mean and standard deviation of every row, O(n) regardless of the window."""
+    return window_stats(prefix_sums(matrix), window)
+
+
+def anomaly_zscores(matrix: np.ndarray, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+    """Each reading's z-score against the trailing window stats ending just before it (nan where undefined)."""
+    z = np.full(matrix.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z[:, 1:] = (matrix[:, 1:] - mean[:, :-1]) / std[:, :-1]
+    z[np.isinf(z)] = np.nan
+    return z
+
+
+def row_percentile(rows: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated percentile of each row ignoring nan, without nanpercentile's per-row fallback."""
+    ordered = np.sort(rows, axis=1)  # nan sorts last
+    counts = np.count_nonzero(~np.isnan(rows), axis=1)
+    position = q / 100 * np.maximum(counts - 1, 0)
+    low = np.floor(position).astype(np.intp)
+    high = np.minimum(low + 1, np.maximum(counts - 1, 0))
+    lower = np.take_along_axis(ordered, low[:, np.newaxis], axis=1)[:, 0]
+    upper = np.take_along_axis(ordered, high[:, np.newaxis], axis=1)[:, 0]
+    result = lower + (upper - lower) * (position - low)
+    result[counts == 0] = np.nan
+    return result
+
+
+def by_day(values: np.ndarray, interval_seconds: int, start_time: Optional[datetime]) -> np.ndarray:
+    """Reshape an evenly spaced series into (days, samples per day), padding partial days with nan."""
+    per_day = max(SECONDS_PER_DAY // interval_seconds, 1)
+    lead = 0
+    if start_time is not None:
+        since_midnight = start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+        lead = since_midnight // interval_seconds
+    days = -(-(lead + values.size) // per_day)
+    grid = np.full(days * per_day, np.nan)
+    grid[lead:lead + values.size] = values
+    return grid.reshape(days, per_day)
+
+
+def sleep_efficiency(sleep_patterns: Optional[List[dict]]):
+    """(minutes asleep, minutes in bed, asleep / in bed) from sleep stage durations."""
+    stages = [stage for stage in sleep_patterns or [] if isinstance(stage, dict)]
+    if not stages:
+        return 0.0, 0.0, np.nan
+    durations = np.fromiter((stage.get("duration") or 0 for stage in stages), dtype=float, count=len(stages))
+    awake = np.fromiter(
+        (str(stage.get("stage", "")).lower() in AWAKE_STAGES for stage in stages), dtype=bool, count=len(stages)
+    )
+    in_bed = durations.sum()
+    asleep = durations[~awake].sum()
+    return asleep, in_bed, asleep / in_bed if in_bed else np.nan
+
+
+def analyze_wearable_series(
+    heart_rate=None,
+    oxygen_saturation=None,
+    temperature=None,
+    steps=None,
+    sleep_patterns=None,
+    interval_seconds: int = 60,
+    start_time: Optional[datetime] = None,
+) -> dict:
+    """
+    Summary statistics, rolling means, anomaly counts, resting heart rate, an
+    HRV proxy, step totals and sleep efficiency for one upload. Series are
+    evenly spaced ``interval_seconds`` apart, the first at ``start_time``.
+    """
+    samples_per_minute = max(60 // interval_seconds, 1)
+    matrix = pack_series([heart_rate, oxygen_saturation, temperature])
+    metrics = {}
+
+    if matrix.size:
+        prefix = prefix_sums(matrix)
+        counts = prefix[3][:, -1].astype(np.intp)
+        means = prefix[0][:, 0]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # metrics with no readings
+            lows = np.nanmin(matrix, axis=1)
+            highs = np.nanmax(matrix, axis=1)
+        latest = latest_window_mean(prefix, counts, settings.WEARABLE_ROLLING_WINDOW_MINUTES * samples_per_minute)
+        z = anomaly_zscores(matrix, *window_stats(prefix, settings.WEARABLE_ANOMALY_WINDOW_MINUTES * samples_per_minute))
+        abs_z = np.abs(z, out=z)
+        anomalies = np.count_nonzero(abs_z > settings.WEARABLE_ANOMALY_Z, axis=1)  # nan compares False
+
+        for row, name in enumerate(SERIES):
+            if not counts[row]:
+                continue
+            # Padding is only ever at the end, so a row's readings are one contiguous slice
+            readings = matrix[row, :counts[row]]
+            metrics[name] = {
+                "readings": int(counts[row]),
+                "mean": _number(means[row]),
+                "min": _number(lows[row]),
+                "max": _number(highs[row]),
+                "percentiles": dict(zip(
+                    (f"p{p}" for p in PERCENTILES),
+                    (_number(value) for value in np.percentile(readings, PERCENTILES)),
+                )),
+                "rolling_mean_latest": _number(latest[row]),
+                "anomalies": int(anomalies[row]),
+                "max_abs_z": _number(np.fmax.reduce(abs_z[row]) if abs_z.shape[1] else np.nan),
+            }
+
+        if "heart_rate" in metrics:
+            hr = matrix[0, :counts[0]]
+            # Resting: low percentile of the short rolling mean, overall and per calendar day
+            hr_prefix = tuple(part[:1] for part in prefix)
+            resting, _ = window_stats(hr_prefix, settings.WEARABLE_RESTING_WINDOW_MINUTES * samples_per_minute)
+            resting = resting[0, :counts[0]]
+            daily = by_day(resting, interval_seconds, start_time)
+            metrics["heart_rate"]["resting"] = _number(np.percentile(resting, 5))
+            metrics["heart_rate"]["resting_by_day"] = [_number(value) for value in row_percentile(daily, 5)]
+
+            # Beat-to-beat intervals aren't available, so RR is estimated from each reading
+            rr = 60000.0 / hr[hr > 0]
+            if rr.size > 1:
+                metrics["heart_rate"]["hrv_proxy"] = {
+                    "rmssd_ms": _number(np.sqrt(np.mean(np.diff(rr) ** 2))),
+                    "sdnn_ms": _number(rr.std()),
+                }
+
+    if steps:
+        step_counts = np.asarray(steps, dtype=float)
+        metrics["steps"] = {
+            "total": int(step_counts.sum()),
+            "active_intervals": int(np.count_nonzero(step_counts)),
+            "max": int(step_counts.max()),
+        }
+
+    asleep, in_bed, efficiency = sleep_efficiency(sleep_patterns)
+    if in_bed:
+        metrics["sleep"] = {
+            "minutes_asleep": _number(asleep, 1),
+            "minutes_in_bed": _number(in_bed, 1),
+            "efficiency": _number(efficiency, 3),
+        }
+    return metrics
@@ -1,49 +1,71 @@
+import asyncio
 from sqlalchemy.orm import Session
 from app.schemas.wearables import WearableDataRequest, WearableDataResponse
+from app.services.wearable_analytics import analyze_wearable_series
+
+def activity_steps(request: WearableDataRequest) -> list:
+    """Step counts per interval from the activity_levels entries."""
+    return [activity.get('steps') or 0 for activity in request.activity_levels or [] if isinstance(activity, dict)]
 
 async def process_wearable_data(request: WearableDataRequest, db: Session) -> WearableDataResponse:
     """
     Processes wearable device data and generates health insights.
     """
+    steps = activity_steps(request)
+    # Minute-level series over several days are hundreds of thousands of points; keep them off the event loop
+    loop = asyncio.get_running_loop()
+    metrics = await loop.run_in_executor(
+        None,
+        lambda: analyze_wearable_series(
+            heart_rate=request.heart_rate,
+            oxygen_saturation=request.oxygen_saturation,
+            temperature=request.temperature,
+            steps=steps,
+            sleep_patterns=request.sleep_patterns,
+            interval_seconds=request.sample_interval_seconds,
+            start_time=request.start_time,
+        ),
+    )
     insights = []
-    
+
     # Analyze heart rate data
-    if request.heart_rate:
-        avg_hr = sum(request.heart_rate) / len(request.heart_rate)
-        if avg_hr > 100:
+    heart_rate = metrics.get("heart_rate")
+    if heart_rate:
+        if heart_rate["mean"] > 100:
             insights.append("Your average heart rate is elevated. Consider stress management techniques.")
-        elif avg_hr < 60:
+        elif heart_rate["mean"] < 60:
             insights.append("Your heart rate is lower than usual. Ensure proper hydration and activity.")
-    
+        if heart_rate["anomalies"]:
+            insights.append(f"{heart_rate['anomalies']} unusual heart rate readings were detected compared to the preceding hour.")
+
     # Analyze sleep patterns
-    if request.sleep_patterns:
-        total_sleep = sum(stage.get('duration', 0) for stage in request.sleep_patterns if isinstance(stage, dict))
-        if total_sleep < 6 * 60:  # Less than 6 hours
+    sleep = metrics.get("sleep")
+    if sleep:
+        if sleep["minutes_asleep"] < 6 * 60:  # Less than 6 hours
             insights.append("You are not getting enough sleep. Aim for at least 7-8 hours per night.")
-    
+        if sleep["efficiency"] is not None and sleep["efficiency"] < 0.85:
+            insights.append("You spend a lot of time awake in bed. A consistent sleep schedule can improve sleep efficiency.")
+
     # Analyze activity levels
-    if request.activity_levels:
-        total_steps = sum(activity.get('steps', 0) for activity in request.activity_levels if isinstance(activity, dict))
-        if total_steps < 5000:
-            insights.append("Your step count is low. Try increasing daily activity for better cardiovascular health.")
-    
+    if steps and metrics["steps"]["total"] < 5000:
+        insights.append("Your step count is low. Try increasing daily activity for better cardiovascular health.")
+
     # Analyze oxygen saturation
-    if request.oxygen_saturation:
-        avg_spo2 = sum(request.oxygen_saturation) / len(request.oxygen_saturation)
-        if avg_spo2 < 95:
-            insights.append("Your oxygen levels are slightly low. Consider deep breathing exercises.")
-    
+    spo2 = metrics.get("oxygen_saturation")
+    if spo2 and spo2["mean"] < 95:
+        insights.append("Your oxygen levels are slightly low. Consider deep breathing exercises.")
+
     # Analyze body temperature
-    if request.temperature:
-        avg_temp = sum(request.temperature) / len(request.temperature)
-        if avg_temp > 37.5:
-            insights.append("Your body temperature is elevated. Monitor for fever symptoms.")
-    
+    temperature = metrics.get("temperature")
+    if temperature and temperature["mean"] > 37.5:
+        insights.append("Your body temperature is elevated. Monitor for fever symptoms.")
+
     summary = "Wearable data analysis completed. " + ("Insights generated." if insights else "No critical issues detected.")
-    
+
     return WearableDataResponse(
         summary=summary,
-        insights=insights
+        insights=insights,
+        metrics=metrics
     )
 
 
@@ -0,0 +1,247 @@
+"""
+Time-series storage for wearable readings.
+
+Uploads are split into one chunk per metric and UTC day and appended to
+``wearable_chunks``. Each chunk packs its readings as little-endian int16s
+(int32 for step counts, which can exceed 32767 per interval), scaled per
+metric to a fixed resolution. The same transaction folds the new
+readings into the hourly and daily rollup tables, so range queries over
+weeks or months read pre-aggregated buckets instead of raw points.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.wearable import add_chunks, add_to_rollups, get_chunks, get_rollups
+from app.db.models.wearable_series import WearableDailyRollup, WearableHourlyRollup
+from app.schemas.wearables import WearableDataRequest
+from app.services.wearable_service import activity_steps
+
+logger = logging.getLogger("wearable_store")
+
+INT16 = np.dtype("<i2")
+INT32 = np.dtype("<i4")
+
+# name: (id stored in the metric column, scale, encoding); a reading is stored as round(value * scale)
+METRICS = {
+    "heart_rate": (1, 1, INT16),  # bpm
+    "oxygen_saturation": (2, 10, INT16),  # %, 0.1 resolution
+    "temperature": (3, 100, INT16),  # degrees C, 0.01 resolution
+    "steps": (4, 1, INT32),  # per interval, up to a day
+}
+EPOCH = datetime(1970, 1, 1)
+HOUR = 3600
+DAY = 86400
+
+# (rollup table, bucket width in seconds)
+ROLLUPS = ((WearableHourlyRollup, HOUR), (WearableDailyRollup, DAY))
+
+# Longest range served from raw chunks / hourly buckets when resolution="auto"
+AUTO_RAW_MAX = timedelta(days=1)
+AUTO_HOURLY_MAX = timedelta(days=14)
+
+
+def encode_values(values: np.ndarray, scale: int, encoding: np.dtype = INT16) -> bytes:
+    """
+    Fixed-width encoding: scaled, rounded and clipped to ``encoding``; nan is
+    stored as its minimum value, which no reading takes.
+    """
+    missing = np.iinfo(encoding).min
+    scaled = np.clip(np.rint(values * scale), missing + 1, np.iinfo(encoding).max)
+    return np.where(np.isnan(values), missing, scaled).astype(encoding).tobytes()
+
+
+def decode_values(data: bytes, scale: int, encoding: np.dtype = INT16) -> np.ndarray:
+    raw = np.frombuffer(data, dtype=encoding)
+    values = raw / scale
+    values[raw == np.iinfo(encoding).min] = np.nan
+    return values
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _seconds(moment: datetime) -> int:
+    return int((moment - EPOCH).total_seconds())
+
+
+def bucket_aggregates(start_at: datetime, interval_seconds: int, values: np.ndarray, bucket_seconds: int):
+    """
+    (bucket start, count, total, min, max) for every bucket of ``bucket_seconds``
+    the readings fall in, ignoring gaps; one reduceat per aggregate.
+    """
+    buckets = (_seconds(start_at) + np.arange(values.size) * interval_seconds) // bucket_seconds
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    valid = ~np.isnan(values)
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    totals = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    lows = np.minimum.reduceat(np.where(valid, values, np.inf), starts)
+    highs = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+    keep = counts > 0
+    return [
+        (EPOCH + timedelta(seconds=int(bucket) * bucket_seconds), int(count), float(total), float(low), float(high))
+        for bucket, count, total, low, high in zip(
+            buckets[starts][keep], counts[keep], totals[keep], lows[keep], highs[keep]
+        )
+    ]
+
+
+def split_by_day(start_at: datetime, interval_seconds: int, values: np.ndarray):
+    """Yield (day, first reading time, readings) for each UTC day the series covers."""
+    offsets = np.arange(values.size) * interval_seconds
+    days = (_seconds(start_at) + offsets) // DAY
+    for part in np.split(np.arange(values.size), np.flatnonzero(np.diff(days)) + 1):
+        first = start_at + timedelta(seconds=int(offsets[part[0]]))
+        yield first.date(), first, values[part[0]:part[-1] + 1]
+
+
+async def store_series(
+    db: AsyncSession,
+    user_id: int,
+    series: Dict[str, Sequence[float]],
+    start_at: datetime,
+    interval_seconds: int,
+) -> int:
+    """
+    Append evenly spaced readings per metric, the first at ``start_at`` (naive
+    UTC), and fold them into the rollups. Re-sending a run that starts at the
+    same time is a no-op. Commits; returns the number of readings stored.
+    """
+    chunks, pending = [], {}
+    for name, readings in series.items():
+        if not readings or name not in METRICS:
+            continue
+        metric, scale, encoding = METRICS[name]
+        values = np.asarray(readings, dtype=float)
+        # Roll up what will be read back, i.e. after quantization
+        values = decode_values(encode_values(values, scale, encoding), scale, encoding)
+        for day, first, part in split_by_day(start_at, interval_seconds, values):
+            chunks.append({
+                "user_id": user_id,
+                "metric": metric,
+                "day": day,
+                "start_at": first,
+                "interval_seconds": interval_seconds,
+                "reading_count": part.size,
+                "data": encode_values(part, scale, encoding),
+            })
+            pending[(metric, first)] = part
+    if not chunks:
+        return 0
+
+    try:
+        inserted = await add_chunks(db, chunks)
+        for model, bucket_seconds in ROLLUPS:
+            merged = {}
+            for (metric, first), part in pending.items():
+                if (metric, first) not in inserted:
+                    continue
+                for bucket_start, count, total, low, high in bucket_aggregates(first, interval_seconds, part, bucket_seconds):
+                    key = (metric, bucket_start)
+                    if key in merged:
+                        row = merged[key]
+                        row["reading_count"] += count
+                        row["total"] += total
+                        row["minimum"] = min(row["minimum"], low)
+                        row["maximum"] = max(row["maximum"], high)
+                    else:
+                        merged[key] = {
+                            "user_id": user_id,
+                            "metric": metric,
+                            "bucket_start": bucket_start,
+                            "reading_count": count,
+                            "total": total,
+                            "minimum": low,
+                            "maximum": high,
+                        }
+            if merged:
+                await add_to_rollups(db, model, list(merged.values()))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    stored = sum(pending[key].size for key in inserted)
+    logger.info(f"Stored {stored} wearable readings for user {user_id} ({len(inserted)}/{len(chunks)} new chunks)")
+    return stored
+
+
+async def store_wearable_request(db: AsyncSession, user_id: int, request: WearableDataRequest) -> int:
+    """
+    Store the evenly spaced series of a ``/wearables/data`` upload. Without a
+    start_time the readings are taken to end at the current interval.
+    """
+    series = {
+        "heart_rate": request.heart_rate,
+        "oxygen_saturation": request.oxygen_saturation,
+        "temperature": request.temperature,
+        "steps": activity_steps(request),
+    }
+    length = max((len(values) for values in series.values() if values), default=0)
+    if not length:
+        return 0
+
+    interval = request.sample_interval_seconds
+    start_at = request.start_time
+    if start_at is None:
+        now = _seconds(datetime.utcnow())
+        start_at = EPOCH + timedelta(seconds=now - now % interval - (length - 1) * interval)
+    else:
+        start_at = _naive_utc(start_at)
+    return await store_series(db, user_id, series, start_at, interval)
+
+
+def _resolution(start: datetime, end: datetime, resolution: str) -> str:
+    if resolution != "auto":
+        return resolution
+    if end - start <= AUTO_RAW_MAX:
+        return "raw"
+    return "hour" if end - start <= AUTO_HOURLY_MAX else "day"
+
+
+async def get_series(
+    db: AsyncSession,
+    user_id: int,
+    metric: str,
+    start: datetime,
+    end: datetime,
+    resolution: str = "auto",
+) -> dict:
+    """
+    Readings of ``metric`` in ``[start, end)``: raw points, or hourly/daily
+    buckets read from the rollups. "auto" picks by the length of the range.
+    """
+    metric_id, scale, encoding = METRICS[metric]
+    start, end = _naive_utc(start), _naive_utc(end)
+    resolution = _resolution(start, end, resolution)
+    points = []
+
+    if resolution == "raw":
+        for chunk in await get_chunks(db, user_id, metric_id, start.date(), end.date()):
+            values = decode_values(chunk.data, scale, encoding)
+            offsets = np.arange(values.size) * chunk.interval_seconds
+            first = _seconds(chunk.start_at)
+            keep = (~np.isnan(values)) & (first + offsets >= _seconds(start)) & (first + offsets < _seconds(end))
+            points.extend(
+                {"time": chunk.start_at + timedelta(seconds=int(offset)), "value": float(value)}
+                for offset, value in zip(offsets[keep], values[keep])
+            )
+    else:
+        model, bucket_seconds = ROLLUPS[0] if resolution == "hour" else ROLLUPS[1]
+        # Include the bucket that ``start`` falls in
+        first_bucket = EPOCH + timedelta(seconds=_seconds(start) - _seconds(start) % bucket_seconds)
+        for row in await get_rollups(db, model, user_id, metric_id, first_bucket, end):
+            points.append({
+                "time": row.bucket_start,
+                "count": row.reading_count,
+                "mean": row.total / row.reading_count,
+                "min": row.minimum,
+                "max": row.maximum,
+            })
+    return {"metric": metric, "resolution": resolution, "points": points}
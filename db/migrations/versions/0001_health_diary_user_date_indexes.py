@@ -0,0 +1,42 @@
+"""health diary (user_id, date, id) and (date) indexes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; don't lock writes on a large table
+    with op.get_context().autocommit_block():
+        # Per-user lookups ordered or bounded by date, and diary keyset pagination
+        op.create_index(
+            "ix_health_diary_user_date_id",
+            "health_diary",
+            ["user_id", "date", "id"],
+            postgresql_concurrently=True,
+        )
+        # Cross-user time-window scans (get_recent_entries)
+        op.create_index(
+            "ix_health_diary_date",
+            "health_diary",
+            ["date"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_health_diary_date", table_name="health_diary", postgresql_concurrently=True)
+        op.drop_index("ix_health_diary_user_date_id", table_name="health_diary", postgresql_concurrently=True)
@@ -0,0 +1,33 @@
+"""checkpoints for resumable batch jobs
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_checkpoints",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("last_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("run_started_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_checkpoints")
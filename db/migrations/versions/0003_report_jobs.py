@@ -0,0 +1,34 @@
+"""report job status and per-report file path
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows predate report jobs; treat them as finished
+    op.add_column("reports", sa.Column("status", sa.String(), nullable=False, server_default="ready"))
+    op.alter_column("reports", "status", server_default=None)
+    op.add_column("reports", sa.Column("file_path", sa.String(), nullable=True))
+    op.add_column("reports", sa.Column("error", sa.String(), nullable=True))
+    op.add_column("reports", sa.Column("completed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("reports", "completed_at")
+    op.drop_column("reports", "error")
+    op.drop_column("reports", "file_path")
+    op.drop_column("reports", "status")
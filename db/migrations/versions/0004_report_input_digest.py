@@ -0,0 +1,28 @@
+"""report input digest for reusing unchanged reports
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("reports", sa.Column("input_digest", sa.String(length=64), nullable=True))
+    op.create_index("ix_reports_user_digest", "reports", ["user_id", "input_digest"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reports_user_digest", table_name="reports")
+    op.drop_column("reports", "input_digest")
@@ -0,0 +1,37 @@
+"""user indexes on the tables health reports are built from
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, owning user column): report digests and inputs are looked up per user
+INDEXES = (
+    ("ix_medications_user_id", "medications", "user_id"),
+    ("ix_medication_logs_user_id", "medication_logs", "user_id"),
+    ("ix_chronic_monitoring_patient_id", "chronic_monitoring", "patient_id"),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; don't lock writes on live tables
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(name, table, [column], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,62 @@
+"""wearable reading chunks (hash-partitioned by user) with hourly and daily rollups
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fixed hash partitions, so there are no per-day partitions to create ahead of
+# time; app/db/models/wearable_series.py creates the same set under create_all
+CHUNK_PARTITIONS = 16
+ROLLUP_TABLES = ("wearable_rollups_hourly", "wearable_rollups_daily")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wearable_chunks",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("metric", sa.SmallInteger(), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("start_at", sa.DateTime(), primary_key=True),
+        sa.Column("interval_seconds", sa.Integer(), nullable=False),
+        sa.Column("reading_count", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        postgresql_partition_by="HASH (user_id)",
+    )
+    for remainder in range(CHUNK_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE wearable_chunks_p{remainder} PARTITION OF wearable_chunks "
+            f"FOR VALUES WITH (MODULUS {CHUNK_PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    for table in ROLLUP_TABLES:
+        op.create_table(
+            table,
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("metric", sa.SmallInteger(), primary_key=True),
+            sa.Column("bucket_start", sa.DateTime(), primary_key=True),
+            sa.Column("reading_count", sa.Integer(), nullable=False),
+            sa.Column("total", sa.Float(), nullable=False),
+            sa.Column("minimum", sa.Float(), nullable=False),
+            sa.Column("maximum", sa.Float(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(ROLLUP_TABLES):
+        op.drop_table(table)
+    # Dropping the parent drops its partitions
+    op.drop_table("wearable_chunks")
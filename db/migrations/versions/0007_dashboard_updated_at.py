@@ -0,0 +1,31 @@
+"""updated_at on the tables behind the dashboard, for its ETag probe
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("health_diary", "medications", "appointments", "subscriptions")
+
+
+def upgrade() -> None:
+    # now() is not volatile, so existing rows get it without a table rewrite
+    for table in TABLES:
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True, server_default=sa.func.now()))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,26 @@
+"""phone number on users, for SMS notifications
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("phone", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "phone")
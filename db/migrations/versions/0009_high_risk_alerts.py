@@ -0,0 +1,33 @@
+"""high-risk alerts, one per alerted diary entry
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "high_risk_alerts",
+        sa.Column("diary_entry_id", sa.Integer(), sa.ForeignKey("health_diary.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("alerted_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_high_risk_alerts_user_id", "high_risk_alerts", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_high_risk_alerts_user_id", table_name="high_risk_alerts")
+    op.drop_table("high_risk_alerts")
@@ -0,0 +1,45 @@
+"""transactional outbox for email and SMS notifications
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 17:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("dedup_key", sa.String(), nullable=False, unique=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("channel", sa.String(), nullable=False),
+        sa.Column("recipient", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=True),
+        sa.Column("body", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_notification_outbox_id", "notification_outbox", ["id"])
+    op.create_index("ix_notification_outbox_due", "notification_outbox", ["status", "next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notification_outbox_due", table_name="notification_outbox")
+    op.drop_index("ix_notification_outbox_id", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
@@ -0,0 +1,37 @@
+"""notification read flag, inbox index and per-user unread counter
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 17:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("is_read", sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.create_index("ix_notifications_user_sent_id", "notifications", ["user_id", "sent_at", "id"])
+
+    op.add_column("users", sa.Column("unread_notifications", sa.Integer(), nullable=False, server_default="0"))
+    # Existing notifications predate the read flag; start everyone's counter from them
+    op.execute(
+        "UPDATE users SET unread_notifications = "
+        "(SELECT count(*) FROM notifications WHERE notifications.user_id = users.id AND NOT notifications.is_read)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "unread_notifications")
+
+    op.drop_index("ix_notifications_user_sent_id", table_name="notifications")
+    op.drop_column("notifications", "is_read")
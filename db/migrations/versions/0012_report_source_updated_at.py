@@ -0,0 +1,32 @@
+"""updated_at on medication_logs and chronic_monitoring, for the report input digest
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 19:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# health_diary and medications got theirs in 0007
+TABLES = ("medication_logs", "chronic_monitoring")
+
+
+def upgrade() -> None:
+    # now() is not volatile, so existing rows get it without a table rewrite
+    for table in TABLES:
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True, server_default=sa.func.now()))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, "updated_at")
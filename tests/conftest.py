@@ -0,0 +1,33 @@
+import os
+
+# Settings has no defaults for credentials; unit tests never reach these services
+for name, value in {
+    "SECRET_KEY": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+    "OPENAI_API_KEY": "test",
+    "STRIPE_SECRET_KEY": "test",
+    "STRIPE_WEBHOOK_SECRET": "test",
+    "ELEVENLABS_API_KEY": "test",
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "GOOGLE_OAUTH_REDIRECT_URI": "http://localhost/callback",
+    "FITBIT_CLIENT_ID": "test",
+    "FITBIT_CLIENT_SECRET": "test",
+    "FITBIT_REDIRECT_URI": "http://localhost/callback",
+    "EMAIL_HOST": "localhost",
+    "EMAIL_PORT": "25",
+    "EMAIL_USERNAME": "test",
+    "EMAIL_PASSWORD": "test",
+    "SMS_API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+# app.core.logging_config writes to logs/app.log under the working directory
+os.makedirs("logs", exist_ok=True)
+
+# app.core's imports reach most of the app; load it first, as the app itself does
+import app.core  # noqa: E402,F401
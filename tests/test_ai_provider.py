@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from app.services import ai_provider
+from app.services.ai_provider import AIProvider, OpenAIProvider
+
+
+def test_provider_must_implement_complete_and_stream():
+    class Incomplete(AIProvider):
+        async def complete(self, messages, model, **params):
+            return ""
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_openai_provider_closes_the_client_of_the_current_loop(monkeypatch):
+    provider = OpenAIProvider()
+    monkeypatch.setattr(ai_provider, "_provider", provider)
+
+    async def main():
+        client = provider._state().client
+        await ai_provider.close_provider()
+        assert client.is_closed()
+        assert asyncio.get_running_loop() not in provider._states
+        # Closing again, or on a loop that never made a request, is a no-op
+        await ai_provider.close_provider()
+
+    asyncio.run(main())
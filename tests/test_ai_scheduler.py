@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+from app.services import ai_scheduler
+from app.services.ai_scheduler import LLMScheduler, LocalBudget, RedisBudget, TokenBucket, batch_priority
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ai_scheduler.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_starts_full_and_refills_at_its_rate(clock):
+    bucket = TokenBucket(60)  # one a second
+    assert bucket.wait_time(60) == 0
+
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    assert bucket.wait_time(10) == pytest.approx(10.0)
+
+    clock.now += 4
+    assert bucket.wait_time(4) == 0
+    assert bucket.wait_time(5) == pytest.approx(1.0)
+
+
+def test_bucket_never_holds_more_than_a_minute(clock):
+    bucket = TokenBucket(60)
+    clock.now += 3600
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+
+def test_bucket_lets_an_oversized_request_through_once_full(clock):
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(500) == 0
+
+    bucket.consume(500)  # goes into debt
+    assert bucket.wait_time(1) == pytest.approx(441.0)
+
+
+def test_bucket_reserve_holds_back_headroom(clock):
+    bucket = TokenBucket(60)
+    bucket.consume(40)
+    assert bucket.wait_time(10) == 0
+    # Taking 10 must leave 30 behind: 20 + refill of 20 needed
+    assert bucket.wait_time(10, reserve=30) == pytest.approx(20.0)
+
+
+def test_local_budget_takes_from_both_buckets_or_neither(clock):
+    budget = LocalBudget(rpm=60, tpm=100)
+
+    assert asyncio.run(budget.take(100, 0.0)) == 0
+    assert budget.requests.tokens == pytest.approx(59)
+    assert budget.tokens.tokens == pytest.approx(0)
+
+    wait = asyncio.run(budget.take(50, 0.0))
+    assert wait == pytest.approx(30.0)  # token bucket refills 100 a minute
+    assert budget.requests.tokens == pytest.approx(59)
+
+
+def test_local_budget_adjust_corrects_the_token_estimate(clock):
+    budget = LocalBudget(rpm=60, tpm=100)
+    asyncio.run(budget.take(50, 0.0))
+    asyncio.run(budget.adjust(-30))  # used 20 instead of 50
+    assert budget.tokens.tokens == pytest.approx(80)
+
+
+def test_memory_budget_is_split_across_workers(monkeypatch):
+    monkeypatch.setattr(ai_scheduler.settings, "AI_RATE_LIMIT_BACKEND", "memory")
+    monkeypatch.setattr(ai_scheduler.settings, "AI_RATE_LIMIT_WORKERS", 4)
+    monkeypatch.setattr(ai_scheduler.settings, "AI_RPM_LIMIT", 400)
+    monkeypatch.setattr(ai_scheduler.settings, "AI_TPM_LIMIT", 100000)
+
+    budget = ai_scheduler._create_budget()
+    assert isinstance(budget, LocalBudget)
+    assert budget.requests.capacity == 100
+    assert budget.tokens.capacity == 25000
+
+
+class RecordingBudget(LocalBudget):
+    """LocalBudget that records the estimate of every request it admits, in order."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.admitted = []
+
+    async def take(self, estimated_tokens: int, reserve: float) -> float:
+        wait = await super().take(estimated_tokens, reserve)
+        if wait <= 0:
+            self.admitted.append(estimated_tokens)
+        return wait
+
+
+def test_scheduler_serves_interactive_before_batch():
+    budget = RecordingBudget(1000, 10**6)
+    scheduler = LLMScheduler(budget, batch_share=0.5, max_queued=10)
+
+    async def batch_call():
+        with batch_priority():
+            await scheduler.acquire(11)
+
+    async def main():
+        # Both are queued before the dispatcher gets to run
+        await asyncio.gather(batch_call(), scheduler.acquire(22))
+
+    asyncio.run(main())
+    assert budget.admitted == [22, 11]
+
+
+def test_scheduler_sheds_when_the_queue_is_full():
+    scheduler = LLMScheduler(LocalBudget(rpm=1000, tpm=10**6), batch_share=0.5, max_queued=1)
+
+    async def main():
+        first = asyncio.ensure_future(scheduler.acquire(10))
+        await asyncio.sleep(0)
+        with pytest.raises(ai_scheduler.AIOverloadedError):
+            await scheduler.acquire(10)
+        await first
+
+    asyncio.run(main())
+
+
+def test_redis_budget_is_shared_between_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+
+    def worker():
+        budget = RedisBudget("redis://unused", rpm=60, tpm=1000, fallback=LocalBudget(60, 1000))
+        budget._clients[asyncio.get_running_loop()] = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+        return budget
+
+    async def main():
+        first, second = worker(), worker()
+        assert await first.take(600, 0.0) == 0
+        assert await second.take(300, 0.0) == 0
+        # 100 tokens left between them; 200 more refill in 12 s
+        assert await second.take(300, 0.0) == pytest.approx(12.0, abs=0.1)
+        await first.adjust(-500)
+        assert await second.take(300, 0.0) == 0
+
+    asyncio.run(main())
+
+
+def test_redis_budget_falls_back_to_the_local_share():
+    fallback = LocalBudget(rpm=60, tpm=1000)
+    budget = RedisBudget("redis://127.0.0.1:1/0", rpm=600, tpm=10000, fallback=fallback)
+
+    assert asyncio.run(budget.take(100, 0.0)) == 0
+    assert fallback.tokens.tokens == pytest.approx(900, abs=1)
@@ -0,0 +1,47 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import ai_services
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def diary(monkeypatch):
+    """Ten entries, one a day, returned newest first like get_health_diaries."""
+    start = datetime(2024, 1, 1)
+    entries = [
+        SimpleNamespace(date=start + timedelta(days=day), symptoms=[f"symptom-{day}"])
+        for day in range(10)
+    ][::-1]
+
+    async def get_health_diaries(db, user_id):
+        return entries
+
+    monkeypatch.setattr(ai_services, "SessionLocal", FakeSession)
+    monkeypatch.setattr(ai_services, "get_health_diaries", get_health_diaries)
+    return entries
+
+
+def test_symptom_analysis_uses_the_five_newest_entries_in_order(diary):
+    prompt, _ = asyncio.run(ai_services._symptom_analysis_request(1))
+
+    assert "symptom-5, symptom-6, symptom-7, symptom-8, symptom-9." in prompt
+    for day in range(5):
+        assert f"symptom-{day}," not in prompt
+
+
+def test_health_patterns_log_is_chronological(diary):
+    prompt, _ = asyncio.run(ai_services._health_patterns_request(1))
+
+    positions = [prompt.index(f"symptom-{day}'") for day in range(10)]
+    assert positions == sorted(positions)
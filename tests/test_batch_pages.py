@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import scheduler
+
+
+@pytest.fixture
+def page(monkeypatch):
+    state = {"open": 0, "seen": [], "advanced": []}
+
+    class CountingSession:
+        async def __aenter__(self):
+            state["open"] += 1
+            return self
+
+        async def __aexit__(self, *exc):
+            state["open"] -= 1
+            return False
+
+    async def get_checkpoint(db, name):
+        return SimpleNamespace(last_id=10, completed_at=None)
+
+    async def get_active_user_ids_page(db, after_id, limit):
+        return [11, 12, 13]
+
+    async def advance_checkpoint(db, name, from_id, to_id, completed=False):
+        state["advanced"].append((from_id, to_id, completed, state["open"]))
+        return True
+
+    async def handler(user_id):
+        state["seen"].append((user_id, state["open"]))
+
+    monkeypatch.setattr(scheduler, "SessionLocal", CountingSession)
+    monkeypatch.setattr(scheduler, "get_checkpoint", get_checkpoint)
+    monkeypatch.setattr(scheduler, "get_active_user_ids_page", get_active_user_ids_page)
+    monkeypatch.setattr(scheduler, "advance_checkpoint", advance_checkpoint)
+    monkeypatch.setitem(scheduler.USER_BATCH_HANDLERS, "test_job", handler)
+    monkeypatch.setattr(scheduler.settings, "BATCH_PAGE_SIZE", 3)
+    return state
+
+
+def test_no_session_is_held_while_a_page_is_processed(page):
+    assert asyncio.run(scheduler._process_user_page("test_job"))
+
+    assert page["seen"] == [(11, 0), (12, 0), (13, 0)]
+    assert page["advanced"] == [(10, 13, False, 1)]
+    assert page["open"] == 0
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.services import diary_import
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def collect(records, data: bytes, size: int = 7):
+    async def main():
+        return [record async for record in records(_chunks(data, size))]
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(diary_import.settings, "DIARY_IMPORT_MAX_LINE_LENGTH", 40)
+    monkeypatch.setattr(diary_import.settings, "DIARY_IMPORT_MAX_RECORD_LENGTH", 60)
+
+
+def test_lines_split_across_chunks():
+    data = "\ufeffa,b\r\nccc\n\nlast".encode()
+
+    async def main():
+        return [line async for line in diary_import._lines(_chunks(data, 3))]
+
+    assert asyncio.run(main()) == ["a,b", "ccc", "", "last"]
+
+
+def test_ndjson_rejects_overlong_lines_and_carries_on(limits):
+    data = b'{"mood": 3}\n' + b"x" * 500 + b'\n{"mood": 4}\n' + b"y" * 100
+    assert collect(diary_import._ndjson_records, data) == [
+        (1, {"mood": 3}),
+        (2, "Line too long"),
+        (3, {"mood": 4}),
+        (4, "Line too long"),
+    ]
+
+
+def test_csv_rejects_overlong_records_and_resumes_after_them(limits):
+    data = (
+        'date,mood,notes\n'
+        '2024-01-01,3,"a\n' + "b" * 30 + '\n' + "c" * 30 + '\nend"\n'
+        '2024-01-02,4,"two\nlines"\n'
+    ).encode()
+    records = collect(diary_import._csv_records, data)
+
+    assert records[0] == (2, "Record too long")
+    assert records[1][0] == 6
+    assert records[1][1]["notes"] == "two\nlines"
+    assert len(records) == 2
+
+
+def test_csv_unclosed_quote_is_not_buffered(limits):
+    data = b'date,mood\n2024-01-01,"3\n' + b"z" * 20 + b"\n" * 200
+    assert collect(diary_import._csv_records, data) == [(2, "Record too long")]
+
+
+def test_csv_overlong_header_stops_the_import(limits):
+    data = b"d" * 100 + b"\n2024-01-01,3\n"
+    assert collect(diary_import._csv_records, data) == [(1, "Line too long")]
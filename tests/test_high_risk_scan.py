@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import high_risk_scan
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def scan(monkeypatch):
+    state = {"checkpoint": None, "seeded": None, "scanned": []}
+
+    async def get_max_entry_id(db):
+        return 500
+
+    async def get_checkpoint(db, name):
+        return state["checkpoint"]
+
+    async def start_run(db, name, last_id=0):
+        state["seeded"] = last_id
+
+    async def get_unalerted_high_risk_entries(db, after_id, up_to_id, **kwargs):
+        state["scanned"].append((after_id, up_to_id))
+        return []
+
+    async def advance_checkpoint(db, name, from_id, to_id):
+        return True
+
+    monkeypatch.setattr(high_risk_scan, "SessionLocal", FakeSession)
+    monkeypatch.setattr(high_risk_scan, "get_max_entry_id", get_max_entry_id)
+    monkeypatch.setattr(high_risk_scan, "get_checkpoint", get_checkpoint)
+    monkeypatch.setattr(high_risk_scan, "start_run", start_run)
+    monkeypatch.setattr(high_risk_scan, "get_unalerted_high_risk_entries", get_unalerted_high_risk_entries)
+    monkeypatch.setattr(high_risk_scan, "advance_checkpoint", advance_checkpoint)
+    return state
+
+
+def test_first_scan_seeds_the_watermark_without_alerting_on_history(scan):
+    assert asyncio.run(high_risk_scan.scan_high_risk_entries()) == 0
+    assert scan["seeded"] == 500
+    assert scan["scanned"] == []
+
+
+def test_later_scans_start_below_the_watermark(scan, monkeypatch):
+    monkeypatch.setattr(high_risk_scan.settings, "HIGH_RISK_SCAN_OVERLAP_IDS", 50)
+    scan["checkpoint"] = SimpleNamespace(last_id=400)
+
+    asyncio.run(high_risk_scan.scan_high_risk_entries())
+    assert scan["seeded"] is None
+    assert scan["scanned"] == [(350, 500)]
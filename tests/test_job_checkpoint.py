@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.crud.job_checkpoint import advance_checkpoint, get_checkpoint, start_run
+from app.db.models.job_checkpoint import JobCheckpoint
+
+
+def run_with_session(test):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(JobCheckpoint.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_start_run_resets_the_checkpoint():
+    async def test(db):
+        await start_run(db, "job")
+        assert await advance_checkpoint(db, "job", 0, 50, completed=True)
+
+        checkpoint = await start_run(db, "job")
+        assert checkpoint.last_id == 0
+        assert checkpoint.completed_at is None
+
+    run_with_session(test)
+
+
+def test_advance_moves_the_checkpoint_from_the_expected_id():
+    async def test(db):
+        await start_run(db, "job")
+        assert await advance_checkpoint(db, "job", 0, 10)
+        assert await advance_checkpoint(db, "job", 10, 20, completed=True)
+
+        checkpoint = await get_checkpoint(db, "job")
+        assert checkpoint.last_id == 20
+        assert checkpoint.completed_at is not None
+
+    run_with_session(test)
+
+
+def test_advance_from_a_stale_id_is_rejected():
+    async def test(db):
+        await start_run(db, "job")
+        assert await advance_checkpoint(db, "job", 0, 10)
+        # A duplicate chain still holding the old position must stop
+        assert not await advance_checkpoint(db, "job", 0, 15)
+        assert (await get_checkpoint(db, "job")).last_id == 10
+
+    run_with_session(test)
+
+
+def test_advance_without_a_run_is_rejected():
+    async def test(db):
+        assert not await advance_checkpoint(db, "missing", 0, 10)
+
+    run_with_session(test)
+
+
+def test_start_run_can_seed_the_checkpoint():
+    async def test(db):
+        assert (await start_run(db, "job", last_id=99)).last_id == 99
+        assert await advance_checkpoint(db, "job", 99, 120)
+
+    run_with_session(test)
@@ -0,0 +1,33 @@
+import base64
+from datetime import datetime
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_the_sort_key():
+    moment = datetime(2024, 3, 1, 8, 30, 15)
+    cursor = encode_cursor(moment, 42)
+
+    entry_date, entry_id = decode_cursor(cursor)
+    assert datetime.fromisoformat(entry_date) == moment
+    assert entry_id == 42
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor("a" * 7, 10**12)
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", "%%%", base64.urlsafe_b64encode(b"{bad json").decode()])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_cursor_must_hold_a_list():
+    cursor = base64.urlsafe_b64encode(b'{"id": 1}').decode()
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
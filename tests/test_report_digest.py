@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.models.health_diary import HealthDiary
+from app.db.models.medication import Medication
+from app.services.report_service import REPORT_SOURCES, report_digests
+
+
+def run_with_session(test):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            for model, _ in REPORT_SOURCES:
+                await conn.run_sync(model.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_users_with_nothing_to_report_have_no_digest():
+    async def test(db):
+        assert await report_digests(db, [1]) == {}
+
+    run_with_session(test)
+
+
+def test_digest_changes_when_a_row_is_edited_in_place():
+    async def test(db):
+        entry = HealthDiary(user_id=1, date=datetime(2024, 1, 1), symptoms=["cough"], mood=3)
+        medication = Medication(user_id=1, name="Aspirin", dosage="100mg", frequency="daily")
+        db.add_all([entry, medication, HealthDiary(user_id=2, date=datetime(2024, 1, 1), mood=4)])
+        await db.commit()
+        before = await report_digests(db, [1, 2])
+
+        entry.mood = 1
+        await db.commit()
+        after_diary_edit = await report_digests(db, [1, 2])
+        assert after_diary_edit[1] != before[1]
+        assert after_diary_edit[2] == before[2]
+
+        medication.dosage = "200mg"
+        await db.commit()
+        assert (await report_digests(db, [1]))[1] != after_diary_edit[1]
+
+    run_with_session(test)
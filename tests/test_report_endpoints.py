@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api.endpoints import reports
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def pending_report(monkeypatch):
+    report = SimpleNamespace(id=5, status="pending", error=None)
+
+    async def find_cached_report(db, user_id):
+        return None
+
+    async def create_report_job(db, user_id, kind):
+        return report
+
+    monkeypatch.setattr(reports, "find_cached_report", find_cached_report)
+    monkeypatch.setattr(reports, "create_report_job", create_report_job)
+    return report
+
+
+def generate(db):
+    return asyncio.run(reports.generate_report_endpoint(Response(), SimpleNamespace(id=1), db))
+
+
+def test_render_is_queued_off_the_event_loop(pending_report, monkeypatch):
+    queued = []
+
+    def delay(report_id):
+        queued.append((report_id, threading.current_thread() is threading.main_thread()))
+
+    monkeypatch.setattr(reports, "render_report", SimpleNamespace(delay=delay))
+    assert generate(FakeSession()) is pending_report
+    assert queued == [(5, False)]
+
+
+def test_a_failed_enqueue_marks_the_report_failed(pending_report, monkeypatch):
+    def delay(report_id):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(reports, "render_report", SimpleNamespace(delay=delay))
+    db = FakeSession()
+    with pytest.raises(HTTPException) as error:
+        generate(db)
+
+    assert error.value.status_code == 503
+    assert pending_report.status == "failed"
+    assert db.commits == 1
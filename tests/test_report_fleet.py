@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+
+from app.crud.report import fail_stale_running_reports
+from app.db.models.health_diary import HealthDiary
+from app.db.models.reports import Report
+from app.db.models.user import User
+from app.services import report_service
+
+
+@pytest.fixture
+def database(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    open_sessions = []
+
+    class CountingSession:
+        async def __aenter__(self):
+            self.session = factory()
+            open_sessions.append(self)
+            return await self.session.__aenter__()
+
+        async def __aexit__(self, *exc):
+            open_sessions.remove(self)
+            return await self.session.__aexit__(*exc)
+
+    async def setup():
+        async with engine.begin() as conn:
+            for table in [User.__table__, Report.__table__] + [model.__table__ for model, _ in report_service.REPORT_SOURCES]:
+                await conn.run_sync(table.create)
+
+    asyncio.run(setup())
+    monkeypatch.setattr(report_service, "SessionLocal", CountingSession)
+    yield factory, open_sessions
+    asyncio.run(engine.dispose())
+
+
+def test_stale_running_reports_are_failed(database):
+    factory, _ = database
+
+    async def main():
+        async with factory() as db:
+            now = datetime.utcnow()
+            db.add_all([
+                Report(user_id=1, report_data="health_report", status="running", generated_at=now - timedelta(hours=3)),
+                Report(user_id=1, report_data="health_report", status="running", generated_at=now),
+                Report(user_id=1, report_data="health_report", status="ready", generated_at=now - timedelta(hours=3)),
+            ])
+            await db.commit()
+            assert await fail_stale_running_reports(db, now - timedelta(hours=1)) == 1
+            statuses = (await db.execute(select(Report.status).order_by(Report.id))).scalars().all()
+            assert statuses == ["failed", "running", "ready"]
+
+    asyncio.run(main())
+
+
+def test_chunk_renders_without_holding_a_session(database, monkeypatch, tmp_path):
+    factory, open_sessions = database
+    rendered = []
+
+    def render(path, inputs):
+        rendered.append((inputs.user_id, len(open_sessions)))
+        return path
+
+    async def enqueue_notification(db, user, message, **kwargs):
+        pass
+
+    monkeypatch.setattr(report_service, "get_render_pool", lambda: None)  # default thread pool
+    monkeypatch.setattr(report_service, "render_health_report", render)
+    monkeypatch.setattr(report_service, "enqueue_notification", enqueue_notification)
+    monkeypatch.setattr(report_service.settings, "REPORTS_DIR", str(tmp_path))
+
+    async def main():
+        async with factory() as db:
+            db.add_all([
+                User(id=1, email="a@example.com", full_name="A", password_hash="x"),
+                HealthDiary(user_id=1, date=datetime(2024, 1, 1), mood=3),
+            ])
+            await db.commit()
+
+        counts = await report_service._generate_chunk([1, 2])
+        assert counts == {"rendered": 1, "reused": 0, "skipped": 1, "failed": 0}
+        assert rendered == [(1, 0)]
+        assert not open_sessions
+
+        async with factory() as db:
+            (report,) = (await db.execute(select(Report))).scalars().all()
+            assert report.status == "ready"
+
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services import sms_service
+
+
+def test_one_request_per_message_by_default(monkeypatch):
+    payloads = []
+
+    async def post(payload):
+        payloads.append(payload)
+        return True
+
+    monkeypatch.setattr(sms_service, "_post", post)
+    results = asyncio.run(sms_service.send_sms_many([("+1", "hi"), ("+2", "hi"), ("+3", "bye")]))
+
+    assert results == [True, True, True]
+    assert sorted(payload["phone"] for payload in payloads) == ["+1", "+2", "+3"]
+    assert all("phones" not in payload for payload in payloads)
+
+
+def test_grouping_is_opt_in(monkeypatch):
+    payloads = []
+
+    async def post(payload):
+        payloads.append(payload)
+        return payload.get("message") == "hi"
+
+    monkeypatch.setattr(sms_service, "_post", post)
+    monkeypatch.setattr(sms_service.settings, "SMS_MAX_RECIPIENTS_PER_REQUEST", 2)
+    results = asyncio.run(sms_service.send_sms_many([("+1", "hi"), ("+2", "hi"), ("+3", "hi"), ("+4", "bye")]))
+
+    assert results == [True, True, True, False]
+    assert {"phones": ["+1", "+2"], "message": "hi"} in payloads
+    assert {"phone": "+3", "message": "hi"} in payloads
+
+
+def test_close_releases_the_loop_client():
+    async def main():
+        client = sms_service._client()
+        await sms_service.close_sms_client()
+        assert client.http.is_closed
+        assert asyncio.get_running_loop() not in sms_service._clients
+        await sms_service.close_sms_client()
+
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.services.wearable_analytics import (
+    analyze_wearable_series,
+    anomaly_zscores,
+    by_day,
+    pack_series,
+    rolling_stats,
+    row_percentile,
+    sleep_efficiency,
+)
+
+
+def naive_rolling(values, window):
+    means, stds = [], []
+    for end in range(1, len(values) + 1):
+        part = values[max(end - window, 0):end]
+        part = part[~np.isnan(part)]
+        means.append(part.mean() if part.size else np.nan)
+        stds.append(part.std() if part.size > 1 else np.nan)
+    return np.array(means), np.array(stds)
+
+
+def test_pack_series_pads_short_and_missing_rows():
+    matrix = pack_series([[1, 2, 3], None, [4]])
+    assert matrix.shape == (3, 3)
+    assert matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(matrix[0], [1, 2, 3])
+    assert np.isnan(matrix[1]).all()
+    np.testing.assert_array_equal(matrix[2, :1], [4])
+    assert np.isnan(matrix[2, 1:]).all()
+
+
+def test_rolling_stats_match_a_naive_window():
+    rng = np.random.default_rng(0)
+    matrix = pack_series([list(70 + rng.normal(0, 5, 200)), list(97 + rng.normal(0, 1, 150))])
+    matrix[0, 50:60] = np.nan
+
+    mean, std = rolling_stats(matrix, 15)
+    for row in range(matrix.shape[0]):
+        expected_mean, expected_std = naive_rolling(matrix[row], 15)
+        np.testing.assert_allclose(mean[row], expected_mean, rtol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(std[row], expected_std, rtol=1e-6, atol=1e-9, equal_nan=True)
+
+
+def test_anomaly_zscores_flag_a_spike():
+    values = np.tile([60.0, 62.0], 50)
+    values[80] = 120.0
+    matrix = values[np.newaxis, :]
+
+    z = anomaly_zscores(matrix, *rolling_stats(matrix, 20))
+    assert np.isnan(z[0, 0])
+    assert np.nanargmax(np.abs(z[0])) == 80
+    assert abs(z[0, 80]) > 3
+
+
+def test_row_percentile_matches_nanpercentile():
+    rng = np.random.default_rng(1)
+    rows = rng.normal(size=(4, 30))
+    rows[1, 10:] = np.nan
+    rows[2, :] = np.nan
+
+    for q in (0, 5, 50, 95, 100):
+        result = row_percentile(rows, q)
+        assert np.isnan(result[2])
+        with pytest.warns(RuntimeWarning):
+            expected = np.nanpercentile(rows, q, axis=1)
+        np.testing.assert_allclose(result, expected, equal_nan=True)
+
+
+def test_by_day_aligns_readings_to_midnight():
+    values = np.arange(30, dtype=float)
+    grid = by_day(values, 3600, datetime(2024, 1, 1, 20, 0))
+
+    assert grid.shape == (3, 24)
+    assert np.isnan(grid[0, :20]).all()
+    np.testing.assert_array_equal(grid[0, 20:], [0, 1, 2, 3])
+    np.testing.assert_array_equal(grid[1], np.arange(4, 28))
+    np.testing.assert_array_equal(grid[2, :2], [28, 29])
+    assert np.isnan(grid[2, 2:]).all()
+
+
+def test_sleep_efficiency_excludes_awake_stages():
+    asleep, in_bed, efficiency = sleep_efficiency([
+        {"stage": "light", "duration": 200},
+        {"stage": "Awake", "duration": 50},
+        {"stage": "deep", "duration": 150},
+        "not a stage",
+    ])
+    assert (asleep, in_bed) == (350, 400)
+    assert efficiency == pytest.approx(0.875)
+
+    assert sleep_efficiency(None)[1] == 0
+
+
+def test_analyze_wearable_series_summarises_every_metric():
+    heart_rate = list(np.tile([60.0, 64.0], 60))
+    metrics = analyze_wearable_series(
+        heart_rate=heart_rate,
+        temperature=[36.5, 36.7],
+        steps=[0, 120, 0, 30],
+        sleep_patterns=[{"stage": "rem", "duration": 90}],
+        start_time=datetime(2024, 1, 1, 23, 0),
+    )
+
+    assert set(metrics) == {"heart_rate", "temperature", "steps", "sleep"}
+    hr = metrics["heart_rate"]
+    assert hr["readings"] == 120
+    assert (hr["min"], hr["mean"], hr["max"]) == (60, 62, 64)
+    assert hr["anomalies"] == 0
+    assert len(hr["resting_by_day"]) == 2  # the readings cross midnight
+    assert hr["hrv_proxy"]["rmssd_ms"] > 0
+    assert metrics["temperature"]["readings"] == 2
+    assert metrics["steps"] == {"total": 150, "active_intervals": 2, "max": 120}
+    assert metrics["sleep"]["efficiency"] == 1
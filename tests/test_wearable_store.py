@@ -0,0 +1,145 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.schemas.wearables import WearableDataRequest
+from app.services import wearable_store
+from app.services.wearable_store import METRICS, bucket_aggregates, decode_values, encode_values, split_by_day
+
+
+def test_encoding_round_trips_at_the_metric_resolution():
+    _, scale, encoding = METRICS["temperature"]
+    values = np.array([36.512, np.nan, 37.0, -1.25])
+
+    data = encode_values(values, scale, encoding)
+    assert len(data) == values.size * 2
+    np.testing.assert_allclose(decode_values(data, scale, encoding), [36.51, np.nan, 37.0, -1.25], equal_nan=True)
+
+
+def test_daily_step_counts_fit_their_encoding():
+    _, scale, encoding = METRICS["steps"]
+    values = np.array([50000.0, 0.0, np.nan])
+
+    decoded = decode_values(encode_values(values, scale, encoding), scale, encoding)
+    np.testing.assert_array_equal(decoded, [50000.0, 0.0, np.nan])
+
+
+def test_encoding_clips_instead_of_wrapping():
+    decoded = decode_values(encode_values(np.array([1e9, -1e9]), 1), 1)
+    assert decoded[0] == np.iinfo(np.int16).max
+    # The most negative value is reserved for gaps
+    assert decoded[1] == np.iinfo(np.int16).min + 1
+
+
+def test_bucket_aggregates_fold_readings_per_hour_ignoring_gaps():
+    values = np.array([60.0, np.nan, 80.0, 70.0, np.nan, np.nan])
+    # 20-minute readings from 00:20: 00:20 00:40 | 01:00 01:20 01:40 | 02:00
+    buckets = bucket_aggregates(datetime(2024, 1, 1, 0, 20), 1200, values, 3600)
+
+    assert buckets == [
+        (datetime(2024, 1, 1, 0, 0), 1, 60.0, 60.0, 60.0),
+        (datetime(2024, 1, 1, 1, 0), 2, 150.0, 70.0, 80.0),
+    ]
+
+
+def test_split_by_day_cuts_at_utc_midnight():
+    values = np.arange(5, dtype=float)
+    parts = list(split_by_day(datetime(2024, 1, 1, 22, 0), 3600, values))
+
+    assert [(day, first) for day, first, _ in parts] == [
+        (date(2024, 1, 1), datetime(2024, 1, 1, 22, 0)),
+        (date(2024, 1, 2), datetime(2024, 1, 2, 0, 0)),
+    ]
+    np.testing.assert_array_equal(parts[0][2], [0, 1])
+    np.testing.assert_array_equal(parts[1][2], [2, 3, 4])
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+def test_store_series_rolls_up_only_new_chunks(monkeypatch):
+    rollups = {}
+
+    async def add_chunks(db, rows):
+        # The second day was stored by an earlier upload
+        return {(row["metric"], row["start_at"]) for row in rows if row["day"] == date(2024, 1, 1)}
+
+    async def add_to_rollups(db, model, rows):
+        rollups[model] = rows
+
+    monkeypatch.setattr(wearable_store, "add_chunks", add_chunks)
+    monkeypatch.setattr(wearable_store, "add_to_rollups", add_to_rollups)
+
+    db = FakeSession()
+    stored = asyncio.run(wearable_store.store_series(
+        db, 7, {"heart_rate": [60, 62, 64, 66], "unknown": [1, 2]}, datetime(2024, 1, 1, 22, 0), 1800,
+    ))
+
+    assert db.committed
+    assert stored == 4
+    hourly = rollups[wearable_store.WearableHourlyRollup]
+    assert [(row["bucket_start"], row["reading_count"], row["total"]) for row in hourly] == [
+        (datetime(2024, 1, 1, 22, 0), 2, 122.0),
+        (datetime(2024, 1, 1, 23, 0), 2, 130.0),
+    ]
+    (daily,) = rollups[wearable_store.WearableDailyRollup]
+    assert (daily["reading_count"], daily["minimum"], daily["maximum"]) == (4, 60.0, 66.0)
+
+
+def test_store_wearable_request_keeps_steps(monkeypatch):
+    stored = {}
+
+    async def store_series(db, user_id, series, start_at, interval_seconds):
+        stored.update(series=series, start_at=start_at, interval_seconds=interval_seconds)
+        return 0
+
+    monkeypatch.setattr(wearable_store, "store_series", store_series)
+    request = WearableDataRequest(
+        device_id="watch",
+        heart_rate=[60, 61, 62],
+        activity_levels=[{"steps": 10}, {"steps": None}, {"calories": 5}, {"steps": 40}],
+        sample_interval_seconds=300,
+        start_time=datetime(2024, 1, 1, 9, 0, tzinfo=timezone(timedelta(hours=2))),
+    )
+
+    asyncio.run(wearable_store.store_wearable_request(None, 1, request))
+
+    assert stored["series"]["steps"] == [10, 0, 0, 40]
+    assert stored["start_at"] == datetime(2024, 1, 1, 7, 0)
+    assert stored["interval_seconds"] == 300
+
+
+def test_store_wearable_request_without_readings_stores_nothing(monkeypatch):
+    async def store_series(*args):
+        pytest.fail("nothing to store")
+
+    monkeypatch.setattr(wearable_store, "store_series", store_series)
+    request = WearableDataRequest(device_id="watch", sleep_patterns=[{"stage": "deep", "duration": 60}])
+    assert asyncio.run(wearable_store.store_wearable_request(None, 1, request)) == 0
+
+
+def test_create_all_creates_the_chunk_partitions():
+    from sqlalchemy import create_mock_engine
+    from app.db.models.wearable_series import CHUNK_PARTITIONS, WearableChunk
+
+    statements = []
+
+    def record(sql, *args, **kwargs):
+        statements.append(str(sql.compile(dialect=engine.dialect)))
+
+    engine = create_mock_engine("postgresql+asyncpg://", record)
+    WearableChunk.__table__.create(engine)
+
+    partitions = [sql for sql in statements if "PARTITION OF wearable_chunks" in sql]
+    assert len(partitions) == CHUNK_PARTITIONS
+    assert "PARTITION BY HASH" in statements[0]